@@ -0,0 +1,101 @@
+import random
+from typing import Iterator, Tuple
+from model.contact import Contact
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# (мужская форма, женская форма)
+_FIRST_NAMES = [
+    ("Александр", "Александра"), ("Алексей", "Анна"), ("Андрей", "Анастасия"), ("Артём", "Алёна"),
+    ("Борис", "Валентина"), ("Вадим", "Вера"), ("Виктор", "Виктория"), ("Владимир", "Галина"),
+    ("Геннадий", "Дарья"), ("Григорий", "Евгения"), ("Дмитрий", "Екатерина"), ("Евгений", "Елена"),
+    ("Егор", "Елизавета"), ("Иван", "Ирина"), ("Игорь", "Людмила"), ("Илья", "Марина"),
+    ("Кирилл", "Мария"), ("Константин", "Наталья"), ("Максим", "Надежда"), ("Михаил", "Нина"),
+    ("Никита", "Ольга"), ("Николай", "Полина"), ("Олег", "Светлана"), ("Павел", "Софья"),
+    ("Пётр", "Татьяна"), ("Роман", "Ульяна"), ("Сергей", "Юлия"), ("Семён", "Яна"),
+    ("Фёдор", "Ксения"), ("Юрий", "Оксана"),
+]
+# Мужские формы; женская форма образуется добавлением "а"
+_SURNAMES = [
+    "Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Васильев", "Соколов", "Михайлов",
+    "Новиков", "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семёнов", "Егоров", "Павлов",
+    "Козлов", "Степанов", "Николаев", "Орлов", "Андреев", "Макаров", "Никитин", "Захаров", "Зайцев",
+    "Соловьёв", "Борисов", "Яковлев", "Григорьев", "Романов", "Воробьёв", "Сергеев", "Кузьмин", "Фролов",
+    "Александров", "Дмитриев", "Королёв", "Гусев", "Киселёв", "Ильин", "Максимов", "Поляков", "Белов",
+]
+# Не меняются по роду
+_SURNAMES_INVARIANT = ["Косивченко", "Шевченко", "Бондаренко", "Ткаченко", "Кравченко", "Коваленко", "Бойко", "Ковальчук"]
+_PATRONYMICS = [("Александрович", "Александровна"), ("Иванович", "Ивановна"), ("Сергеевич", "Сергеевна"),
+                ("Петрович", "Петровна"), ("Дмитриевич", "Дмитриевна"), ("Николаевич", "Николаевна"),
+                ("Андреевич", "Андреевна"), ("Михайлович", "Михайловна"), ("Юрьевич", "Юрьевна")]
+_COMMENTS = ["", "", "", "Коллега", "Друг", "Подруга", "Сосед", "Родственник", "Мама", "Папа",
+             "Одноклассник", "Врач", "Сантехник", "Отус Студент", "Клиент", "Поставщик", "Бухгалтерия",
+             "Не звонить после 21:00", "Рабочий", "Дача"]
+_PHONE_FORMATS = [
+    "+7{code}{a}{b}{c}", "8{code}{a}{b}{c}", "+7 ({code}) {a}-{b}-{c}", "8 ({code}) {a}-{b}-{c}",
+    "8-{code}-{a}-{b}-{c}", "{code}{a}{b}{c}",
+]
+_MOBILE_CODES = [str(code) for code in range(900, 1000)] + ["495", "499", "812"]
+
+
+def _surname(rng: random.Random, female: bool) -> str:
+    """Фамилия, согласованная с полом"""
+    if rng.random() < 0.1:
+        return rng.choice(_SURNAMES_INVARIANT)
+    surname = rng.choice(_SURNAMES)
+    return surname + 'а' if female else surname
+
+
+def generate_contact(rng: random.Random) -> Contact:
+    """Случайный контакт с правдоподобными именем, номером и комментарием"""
+    female = rng.random() < 0.5
+    first = rng.choice(_FIRST_NAMES)[female]
+    surname = _surname(rng, female)
+    layout = rng.random()
+    if layout < 0.5:
+        name = f"{surname} {first}"
+    elif layout < 0.8:
+        name = f"{first} {surname}"
+    else:
+        name = f"{surname} {first} {rng.choice(_PATRONYMICS)[female]}"
+
+    number = f"{rng.randrange(10_000_000):07d}"
+    phone = rng.choice(_PHONE_FORMATS).format(code=rng.choice(_MOBILE_CODES), a=number[:3], b=number[3:5],
+                                              c=number[5:])
+    return Contact(name, phone, rng.choice(_COMMENTS))
+
+
+def generate_contacts(count: int, seed: int = 13) -> Iterator[Contact]:
+    """Поток из count контактов; одинаковый seed дает одинаковые данные"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_contact(rng)
+
+
+def write_book(file_path: str, count: int, seed: int = 13) -> None:
+    """Запись синтетической телефонной книги в текстовом формате"""
+    with open(file_path, 'w', encoding='utf-8') as file:
+        batch = []
+        for contact in generate_contacts(count, seed):
+            batch.append(contact.to_string())
+            if len(batch) == 10_000:
+                file.write('\n'.join(batch) + '\n')
+                batch.clear()
+        if batch:
+            file.write('\n'.join(batch) + '\n')
+
+
+def search_terms(count: int, seed: int = 7) -> Tuple[str, ...]:
+    """Строки поиска: части имен, номеров и комментариев"""
+    rng = random.Random(seed)
+    terms = []
+    for contact in generate_contacts(count, seed):
+        kind = rng.random()
+        if kind < 0.5:
+            word = rng.choice(contact.name.split())
+            terms.append(word[:rng.randint(3, len(word))].lower())
+        elif kind < 0.8:
+            terms.append(contact.phone[-rng.randint(4, 7):])
+        else:
+            terms.append(contact.comment or "нет такого")
+    return tuple(terms)
@@ -0,0 +1,280 @@
+import argparse
+import gc
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Запуск и как python -m benchmarks.run, и как python benchmarks/run.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.data import SCALES, generate_contacts, search_terms, write_book
+from model.file_handler import FileHandler
+from model.phonebook import PhoneBook
+from view.console_view import ConsoleView
+
+# Базовая линия зависит от машины, поэтому записывается локально и не хранится в репозитории
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 5
+# Короткие замеры повторяются, пока суммарное время не достигнет этого порога
+MIN_MEASURE_SECONDS = 0.5
+MAX_LATENCY_OPS = 100_000  # Больше операций для перцентилей задержки не нужно
+# Быстрые операции замеряются пакетами: время одной операции меньше шага таймера
+LATENCY_BATCH = 100
+MAX_SHOWN_ROWS = 100_000   # Таблица на 10 млн строк не поместится в память, выводится срез
+
+# Метрики, которые не должны расти (для throughput - не должна падать)
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms', 'peak_mb')
+HIGHER_IS_BETTER = ('throughput',)
+# Наименьшее абсолютное ухудшение, считающееся регрессией: меньшие
+# разницы - шум таймера и распределителя памяти, а не изменение кода
+MIN_DELTA = {'p50_ms': 0.05, 'p95_ms': 0.05, 'p99_ms': 0.05, 'peak_mb': 0.5}
+
+
+class BenchmarkEnv:
+    """Подготовленные данные для замеров: файл книги, записи и открытая книга"""
+
+    def __init__(self, count: int, work_dir: str):
+        self.count = count
+        self.book_path = os.path.join(work_dir, 'book.txt')
+        self.save_path = os.path.join(work_dir, 'saved.txt')
+        write_book(self.book_path, count)
+        self.records = FileHandler().load(self.book_path)
+        self.phonebook = PhoneBook()
+        self.phonebook.open(self.book_path)
+        self.terms = search_terms(max(5, min(200, 2_000_000 // count)))
+        self.new_contacts = list(generate_contacts(min(count, MAX_LATENCY_OPS), seed=29))
+
+
+# Замер получает окружение и возвращает число операций и, если есть, задержки отдельных операций
+Benchmark = Callable[[BenchmarkEnv], Tuple[int, Optional[List[float]]]]
+# Прогон замера: время, число операций и задержки отдельных операций
+Sample = Tuple[float, int, Optional[List[float]]]
+
+
+def bench_load(env: BenchmarkEnv) -> Tuple[int, None]:
+    """FileHandler.load всего файла"""
+    return len(FileHandler().load(env.book_path)), None
+
+
+def bench_open(env: BenchmarkEnv) -> Tuple[int, None]:
+    """PhoneBook.open всего файла"""
+    phonebook = PhoneBook()
+    phonebook.open(env.book_path)
+    return len(phonebook), None
+
+
+def bench_save(env: BenchmarkEnv) -> Tuple[int, None]:
+    """FileHandler.save всех записей"""
+    FileHandler().save(env.save_path, env.records)
+    return len(env.records), None
+
+
+def bench_add_contact(env: BenchmarkEnv) -> Tuple[int, List[float]]:
+    """PhoneBook.add_contact в пустую книгу; задержка - среднее по пакету из LATENCY_BATCH операций"""
+    phonebook = PhoneBook()
+    latencies = []
+    clock = time.perf_counter
+    contacts = env.new_contacts
+    for offset in range(0, len(contacts), LATENCY_BATCH):
+        batch = contacts[offset:offset + LATENCY_BATCH]
+        start = clock()
+        for contact in batch:
+            phonebook.add_contact(contact)
+        latencies.append((clock() - start) / len(batch))
+    return len(contacts), latencies
+
+
+def bench_find_contacts(env: BenchmarkEnv) -> Tuple[int, List[float]]:
+    """PhoneBook.find_contacts по всей книге"""
+    latencies = []
+    clock = time.perf_counter
+    for term in env.terms:
+        start = clock()
+        env.phonebook.find_contacts(term)
+        latencies.append(clock() - start)
+    return len(latencies), latencies
+
+
+def bench_show_contacts(env: BenchmarkEnv) -> Tuple[int, None]:
+    """ConsoleView.show_contacts (вывод в память, не больше MAX_SHOWN_ROWS строк)"""
+    contacts = dict(env.phonebook.get_page(size=MAX_SHOWN_ROWS))
+    with redirect_stdout(io.StringIO()):
+        shown = ConsoleView.show_contacts(contacts)
+    return shown, None
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'load': bench_load,
+    'open': bench_open,
+    'save': bench_save,
+    'add_contact': bench_add_contact,
+    'find_contacts': bench_find_contacts,
+    'show_contacts': bench_show_contacts,
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Перцентиль отсортированной выборки (ближайший ранг)"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(benchmark: Benchmark, env: BenchmarkEnv, memory: bool = True,
+            repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """Метрики одного замера: время, пропускная способность, перцентили и пик памяти"""
+    samples: List[Sample] = []
+    for _ in range(repeat):
+        collect_samples(benchmark, env, samples, repeat)
+    return summarize(benchmark, env, samples, memory)
+
+
+def collect_samples(benchmark: Benchmark, env: BenchmarkEnv, samples: List[Sample], repeat: int) -> None:
+    """Один круг прогонов замера
+
+    Короткий замер повторяется в круге, пока время круга не достигнет
+    MIN_MEASURE_SECONDS / repeat, так что за repeat кругов он выполняется
+    не меньше MIN_MEASURE_SECONDS. Перед каждым прогоном собирается мусор
+    предыдущих.
+    """
+    deadline = time.perf_counter() + (MIN_MEASURE_SECONDS / repeat if repeat > 1 else 0)
+    while True:
+        gc.collect()
+        start = time.perf_counter()
+        ops, latencies = benchmark(env)
+        samples.append((time.perf_counter() - start, ops, latencies))
+        if time.perf_counter() >= deadline:
+            return
+
+
+def summarize(benchmark: Benchmark, env: BenchmarkEnv, samples: List[Sample], memory: bool) -> Dict[str, float]:
+    """Метрики по прогонам замера
+
+    Берется самый быстрый прогон: так меньше шум от других процессов и
+    первые прогоны с холодными кэшами. Прогоны выполняют одни и те же
+    операции, поэтому задержка каждой операции - наименьшая по всем
+    прогонам. Пик памяти снимается отдельным прогоном под tracemalloc,
+    чтобы трассировка не искажала время.
+    """
+    seconds, ops, _ = min(samples, key=lambda sample: sample[0])
+    result = {'ops': ops, 'seconds': round(seconds, 4), 'throughput': round(ops / seconds, 1) if seconds else 0.0}
+    latencies = sorted(min(values) for values in zip(*(sample[2] for sample in samples if sample[2])))
+    if latencies:
+        result['p50_ms'] = round(statistics.median(latencies) * 1000, 4)
+        result['p95_ms'] = round(percentile(latencies, 0.95) * 1000, 4)
+        result['p99_ms'] = round(percentile(latencies, 0.99) * 1000, 4)
+    if memory:
+        tracemalloc.start()
+        try:
+            benchmark(env)
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(scale: str, names: Optional[List[str]] = None, memory: bool = True,
+        repeat: int = DEFAULT_REPEAT) -> Dict[str, Dict[str, float]]:
+    """Выполнение замеров для масштаба из SCALES
+
+    Круги прогонов разных замеров чередуются: если машина временно
+    замедлилась, это задевает лишь часть прогонов каждого замера, а не
+    все прогоны одного.
+    """
+    names = names or list(BENCHMARKS)
+    samples: Dict[str, List[Sample]] = {name: [] for name in names}
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = BenchmarkEnv(SCALES[scale], work_dir)
+        for _ in range(repeat):
+            for name in names:
+                collect_samples(BENCHMARKS[name], env, samples[name], repeat)
+        for name in names:
+            results[name] = summarize(BENCHMARKS[name], env, samples[name], memory)
+            print(f"{name:<15} {format_metrics(results[name])}", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Описания регрессий относительно базовой линии (пустой список - регрессий нет)
+
+    Метрика из LOWER_IS_BETTER считается ухудшившейся, только если она
+    выросла больше допуска и больше чем на MIN_DELTA в абсолютных единицах.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name, {})
+        for metric in HIGHER_IS_BETTER:
+            if metric in metrics and expected.get(metric) and metrics[metric] < expected[metric] * (1 - tolerance):
+                regressions.append(f"{name}.{metric}: {metrics[metric]} < {expected[metric]}")
+        for metric in LOWER_IS_BETTER:
+            if metric not in metrics or not expected.get(metric):
+                continue
+            limit = max(expected[metric] * (1 + tolerance), expected[metric] + MIN_DELTA[metric])
+            if metrics[metric] > limit:
+                regressions.append(f"{name}.{metric}: {metrics[metric]} > {expected[metric]}")
+    return regressions
+
+
+def format_metrics(metrics: Dict[str, float]) -> str:
+    """Метрики замера одной строкой"""
+    return '  '.join(f"{key}={value}" for key, value in metrics.items())
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Базовые линии по масштабам; пустой словарь, если файла нет"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Запуск замеров из командной строки, возвращает код выхода (1 - есть регрессии)"""
+    parser = argparse.ArgumentParser(description="Замеры производительности телефонной книги")
+    parser.add_argument('--scale', choices=list(SCALES), default='10k', help="размер синтетической книги")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="выполнить только эти замеры")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="файл базовой линии (JSON)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="допустимое ухудшение метрики в долях (по умолчанию 0.25)")
+    parser.add_argument('--update-baseline', action='store_true', help="записать результаты как базовую линию")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="число повторов каждого замера")
+    parser.add_argument('--no-memory', action='store_true', help="не измерять пик памяти")
+    parser.add_argument('--output', help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.only, memory=not args.no_memory, repeat=max(1, args.repeat))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({args.scale: results}, file, ensure_ascii=False, indent=2)
+
+    baselines = load_baseline(args.baseline)
+    if args.update_baseline:
+        baselines.setdefault(args.scale, {}).update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baselines, file, ensure_ascii=False, indent=2)
+            file.write('\n')
+        print(f"Базовая линия для {args.scale} обновлена: {args.baseline}")
+        return 0
+
+    if args.scale not in baselines:
+        print(f"Нет базовой линии для {args.scale}, сравнение пропущено")
+        return 0
+    regressions = compare(results, baselines[args.scale], args.tolerance)
+    for regression in regressions:
+        print(f"Регрессия: {regression}")
+    if not regressions:
+        print("Регрессий нет")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
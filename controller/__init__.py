@@ -1,4 +1,13 @@
 
-from .phonebook_controller import PhoneBookController
+__all__ = ['PhoneBookController', 'BatchController']
 
-__all__ = ['PhoneBookController']
\ No newline at end of file
+
+def __getattr__(name):
+    # Контроллеры загружаются при обращении: пакетному режиму не нужен консольный вид
+    if name == 'PhoneBookController':
+        from .phonebook_controller import PhoneBookController
+        return PhoneBookController
+    if name == 'BatchController':
+        from .batch_controller import BatchController
+        return BatchController
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+from model.contact import Contact
+from model.phone_index import normalize_phone
+from model.phonebook import MERGE_STRATEGIES, PhoneBook
+from exceptions import PhoneBookError
+
+BATCH_SIZE = 1000  # Строк входа, обрабатываемых за один проход по книге
+OUTPUT_FORMATS = ('tsv', 'json')
+EXPORT_FORMATS = ('text', 'tsv', 'json')
+
+
+class BatchController:
+    """Неинтерактивный режим: команды над одной загруженной книгой с потоковым вводом и выводом
+
+    Строки результата пишутся в output по мере обработки пакетов, поэтому
+    команды можно соединять конвейером и прерывать (например, через head).
+    """
+
+    def __init__(self, phone_book: PhoneBook, output: TextIO = sys.stdout, errors: TextIO = sys.stderr,
+                 batch_size: int = BATCH_SIZE):
+        self.phone_book = phone_book
+        self.output = output
+        self.errors = errors
+        self.batch_size = batch_size
+
+    def find(self, queries: Iterable[str], format: str = 'tsv') -> int:
+        """Поиск по строкам запросов, возвращает число найденных строк
+
+        Запросы обрабатываются пакетами: каждый пакет ищется за один проход
+        по книге (find_contacts_many). Строка результата в формате tsv:
+        запрос, ID, имя, телефон, комментарий.
+        """
+        total = 0
+        for batch in self._batches(query for query in queries if query):
+            results = self.phone_book.find_contacts_many(batch)
+            lines = []
+            for query in batch:
+                for contact_id, contact in results[query].items():
+                    lines.append(self._format_found(query, contact_id, contact, format))
+            self._write(lines)
+            total += len(lines)
+        return total
+
+    def import_records(self, records: Iterable[str], separator: str = ';') -> int:
+        """Добавление контактов из строк "имя;телефон;комментарий", выводит назначенные ID
+
+        Пустые строки пропускаются, некорректные - с сообщением в errors;
+        возвращает число некорректных. Книга сохраняется после добавления
+        всех пакетов с прежними ID, поэтому выведенные ID остаются верными.
+        """
+        invalid = 0
+        numbered = enumerate(records, 1)
+        for batch in self._batches(numbered):
+            contacts = []
+            for line_num, line in batch:
+                if not line.strip():
+                    continue
+                fields = line.split(separator)
+                if len(fields) != 3 or not fields[0].strip():
+                    invalid += 1
+                    self.errors.write(f"Строка {line_num} пропущена: {line}\n")
+                    continue
+                contacts.append(Contact(*fields))
+            self._write(str(contact_id) for contact_id in self.phone_book.add_contacts(contacts))
+        self.phone_book.save(keep_ids=True)
+        return invalid
+
+    def export(self, format: str = 'text', separator: str = ';') -> int:
+        """Вывод всех контактов по возрастанию ID, возвращает их число
+
+        Формат text совпадает с файлом книги, поэтому вывод можно передать в import.
+        """
+        count = 0
+        for batch in self._pages():
+            if format == 'text':
+                lines = [separator.join(contact.to_list()) for _, contact in batch]
+            else:
+                lines = [self._format_contact(contact_id, contact, format) for contact_id, contact in batch]
+            self._write(lines)
+            count += len(lines)
+        return count
+
+    def dedupe(self, threshold: float = 0.7, merge: Optional[str] = None) -> int:
+        """Вывод групп дубликатов (ID через табуляцию) или их слияние, возвращает число групп
+
+        При merge каждая строка - оставленный ID и удаленные ID, книга сохраняется.
+        """
+        if merge is None:
+            groups = self.phone_book.find_duplicates(threshold)
+            self._write('\t'.join(map(str, ids)) for ids in groups)
+            return len(groups)
+        report = self.phone_book.merge_duplicates(merge, threshold)
+        self._write('\t'.join(map(str, (keep, *removed))) for keep, removed in report.items())
+        self.phone_book.save()
+        return len(report)
+
+    def stats(self, open_seconds: Optional[float] = None) -> Dict[str, object]:
+        """Сводка по книге: число контактов, заполненность полей, уникальные номера"""
+        with_phone = with_comment = 0
+        phones = set()
+        for contact in self.phone_book:
+            if contact.phone:
+                with_phone += 1
+                phones.add(normalize_phone(contact.phone))
+            if contact.comment:
+                with_comment += 1
+        summary = {'contacts': len(self.phone_book), 'with_phone': with_phone, 'with_comment': with_comment,
+                   'unique_phones': len(phones - {''})}
+        if open_seconds is not None:
+            summary['open_ms'] = round(open_seconds * 1000, 3)
+        self._write(f"{key}\t{value}" for key, value in summary.items())
+        return summary
+
+    def _pages(self) -> Iterator[List]:
+        """Контакты страницами по batch_size, без копии всей книги"""
+        start_id = None
+        while True:
+            page = self.phone_book.get_page(start_id, self.batch_size)
+            if not page:
+                return
+            yield page
+            start_id = page[-1][0] + 1
+
+    def _batches(self, items: Iterable) -> Iterator[List]:
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _write(self, lines: Iterable[str]) -> None:
+        """Запись строк результата; после каждого пакета вывод сбрасывается"""
+        for line in lines:
+            self.output.write(line + '\n')
+        self.output.flush()
+
+    @staticmethod
+    def _format_contact(contact_id: int, contact: Contact, format: str) -> str:
+        if format == 'json':
+            return json.dumps({'id': contact_id, 'name': contact.name, 'phone': contact.phone,
+                               'comment': contact.comment}, ensure_ascii=False)
+        return '\t'.join((str(contact_id), contact.name, contact.phone, contact.comment))
+
+    @classmethod
+    def _format_found(cls, query: str, contact_id: int, contact: Contact, format: str) -> str:
+        if format == 'json':
+            return json.dumps({'query': query, 'id': contact_id, 'name': contact.name, 'phone': contact.phone,
+                               'comment': contact.comment}, ensure_ascii=False)
+        return query + '\t' + cls._format_contact(contact_id, contact, format)
+
+
+def _read_lines(path: Optional[str], stdin: TextIO) -> Iterator[str]:
+    """Строки файла или stdin ('-' или None) без перевода строки"""
+    if path in (None, '-'):
+        return (line.rstrip('\r\n') for line in stdin)
+    return _read_file_lines(path)
+
+
+def _read_file_lines(path: str) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Разбор аргументов командного режима"""
+    parser = argparse.ArgumentParser(prog='main.py', description="Пакетная работа с телефонной книгой")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--file', '-f', required=True, help="файл телефонной книги (текст, снимок или база SQLite)")
+    common.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="строк входа в одном пакете")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    find = commands.add_parser('find', parents=[common], help="поиск контактов")
+    find.add_argument('terms', nargs='*', help="строки поиска; без них запросы читаются построчно из --input")
+    find.add_argument('--input', '-i', help="файл запросов (по умолчанию stdin)")
+    find.add_argument('--format', choices=OUTPUT_FORMATS, default='tsv', help="формат вывода")
+
+    import_ = commands.add_parser('import', parents=[common], help="добавление контактов и сохранение книги")
+    import_.add_argument('--input', '-i', help="файл записей имя;телефон;комментарий (по умолчанию stdin)")
+
+    export = commands.add_parser('export', parents=[common], help="вывод всех контактов")
+    export.add_argument('--format', choices=EXPORT_FORMATS, default='text', help="формат вывода")
+
+    dedupe = commands.add_parser('dedupe', parents=[common], help="поиск или слияние дубликатов")
+    dedupe.add_argument('--threshold', type=float, default=0.7, help="порог похожести имен")
+    dedupe.add_argument('--merge', choices=MERGE_STRATEGIES, help="слить дубликаты по стратегии и сохранить книгу")
+
+    commands.add_parser('stats', parents=[common], help="сводка по книге")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None,
+         stderr: Optional[TextIO] = None) -> int:
+    """Запуск команды, возвращает код выхода: 0 - успех, 1 - ошибка или пропущенные строки"""
+    stdin, stdout, stderr = stdin or sys.stdin, stdout or sys.stdout, stderr or sys.stderr
+    for stream in (stdin, stdout, stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(encoding='utf-8')
+    args = build_parser().parse_args(argv)
+
+    phone_book = PhoneBook()
+    controller = BatchController(phone_book, stdout, stderr, max(1, args.batch_size))
+    try:
+        if args.command == 'import' and not os.path.exists(args.file):
+            # Импорт в новую книгу: создаем пустой файл
+            open(args.file, 'w', encoding='utf-8').close()
+        start = time.perf_counter()
+        phone_book.open(args.file)
+        open_seconds = time.perf_counter() - start
+
+        if args.command == 'find':
+            controller.find(args.terms or _read_lines(args.input, stdin), args.format)
+        elif args.command == 'import':
+            if controller.import_records(_read_lines(args.input, stdin)):
+                return 1
+        elif args.command == 'export':
+            controller.export(args.format)
+        elif args.command == 'dedupe':
+            controller.dedupe(args.threshold, args.merge)
+        else:
+            controller.stats(open_seconds)
+        return 0
+    except BrokenPipeError:
+        # Получатель вывода закрылся (например, head): это не ошибка.
+        # Остаток буфера stdout сбрасываем в никуда, иначе ошибка повторится при выходе
+        try:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), stdout.fileno())
+        except (AttributeError, OSError, ValueError):
+            pass
+        return 0
+    except (PhoneBookError, ValueError, OSError) as e:
+        stderr.write(f"Ошибка: {e}\n")
+        return 1
+    finally:
+        phone_book.close()
@@ -1,5 +1,6 @@
 
 from typing import Optional
+import metrics
 from model.phonebook import PhoneBook
 from model.contact import Contact
 from view.console_view import ConsoleView
@@ -14,6 +15,9 @@ class PhoneBookController:
         self.phone_book = PhoneBook()
         self.view = ConsoleView()
         self._current_file_path: Optional[str] = None  # Храним путь к текущему файлу
+        # Время операций книги для пункта "Статистика". Приемник подключается при
+        # первом выборе пункта: до этого инструментирование книги ничего не стоит
+        self._stats: Optional[metrics.HistogramSink] = None
 
     def run(self) -> None:
         """Запуск основного цикла приложения"""
@@ -39,7 +43,8 @@ class PhoneBookController:
             5: self._find_contacts,
             6: self._edit_contact,
             7: self._delete_contact,
-            8: self._exit_program
+            8: self._show_stats,
+            9: self._exit_program
         }
 
         handler = handlers.get(choice)
@@ -84,13 +89,45 @@ class PhoneBookController:
             self.view.show_message(f"Ошибка при сохранении: {str(e)}")
 
     def _show_all_contacts(self) -> None:
-        """Показ всех контактов"""
+        """Постраничный показ всех контактов"""
         if not self.phone_book.is_open and len(self.phone_book) == 0:
             self.view.show_message(text.phone_book_file_try_open)
             return
 
-        contacts = self.phone_book.get_all_contacts()
-        self.view.show_contacts(contacts, text.phone_book_empty_error)
+        if len(self.phone_book) == 0:
+            self.view.show_message(text.phone_book_empty_error)
+            return
+
+        # Запрошенный ID начала страницы: по нему листаем и с пустой страницы
+        # (после перехода к ID за последним контактом)
+        start_id = None
+        page = self.phone_book.get_page(start_id, text.page_size)
+        while True:
+            self.view.show_contacts_page(page, len(self.phone_book))
+            command = self.view.get_input(text.page_navigation).lower()
+
+            if command in ('', 'n'):
+                next_id = page[-1][0] + 1 if page else start_id
+                next_page = self.phone_book.get_page(next_id, text.page_size)
+                if not next_page:
+                    self.view.show_message(text.page_last)
+                    return
+                page, start_id = next_page, next_id
+            elif command == 'p':
+                if page:
+                    end_id = page[0][0] - 1
+                else:
+                    end_id = start_id - 1 if start_id is not None else None
+                prev_page = self.phone_book.get_page(end_id, text.page_size, reverse=True)
+                if not prev_page:
+                    self.view.show_message(text.page_first)
+                    continue
+                page, start_id = prev_page, prev_page[0][0]
+            elif command.isdigit():
+                start_id = int(command)
+                page = self.phone_book.get_page(start_id, text.page_size)
+            else:
+                return
 
     def _add_contact(self) -> None:
         """Добавление нового контакта"""
@@ -112,13 +149,12 @@ class PhoneBookController:
 
         try:
             search_term = self.view.get_input(text.input_word_to_find)
-            found_contacts = self.phone_book.find_contacts(search_term)
+            found_contacts = self.phone_book.find_contacts(search_term, lazy=True)
 
-            if found_contacts:
-                self.view.show_contacts(found_contacts)
-                self.view.show_message(f"Найдено контактов: {len(found_contacts)}")
-            else:
-                self.view.show_message(text.no_result_to_find.format(word=search_term))
+            found_count = self.view.show_contacts(found_contacts,
+                                                  text.no_result_to_find.format(word=search_term))
+            if found_count:
+                self.view.show_message(f"Найдено контактов: {found_count}")
         except Exception as e:
             self.view.show_message(f"Ошибка при поиске: {str(e)}")
 
@@ -201,6 +237,14 @@ class PhoneBookController:
         except Exception as e:
             self.view.show_message(f"Ошибка при удалении: {str(e)}")
 
+    def _show_stats(self) -> None:
+        """Отображение статистики времени операций; первый вызов включает сбор"""
+        if self._stats is None:
+            self._stats = metrics.histogram()
+            self.view.show_message(text.stats_started)
+            return
+        self.view.show_stats(self._stats.summary(), self._stats.counters())
+
     def _exit_program(self) -> None:
         """Выход из программы"""
         if len(self.phone_book) > 0:
@@ -6,9 +6,14 @@ class PhoneBookError(Exception):
 class FileOperationError(PhoneBookError):
     """Ошибка при работе с файлом"""
     def __init__(self, message="Ошибка при работе с файлом", filename=None):
+        self.message = message
         self.filename = filename
         super().__init__(f"{message}: {filename}" if filename else message)
 
+    def __reduce__(self):
+        # Исключения передаются из процессов-шардов, аргументы конструктора нужно сохранить
+        return type(self), (self.message, self.filename)
+
 
 class ContactNotFoundError(PhoneBookError):
     """Контакт не найден"""
@@ -22,6 +27,9 @@ class ContactNotFoundError(PhoneBookError):
             message += f" с именем: {name}"
         super().__init__(message)
 
+    def __reduce__(self):
+        return type(self), (self.contact_id, self.name)
+
 
 class InvalidInputError(PhoneBookError):
     """Неверный ввод данных"""
@@ -31,4 +39,15 @@ class InvalidInputError(PhoneBookError):
 class PhoneBookNotOpenError(PhoneBookError):
     """Телефонная книга не открыта"""
     def __init__(self):
-        super().__init__("Телефонная книга не открыта. Сначала откройте файл.")
\ No newline at end of file
+        super().__init__("Телефонная книга не открыта. Сначала откройте файл.")
+
+    def __reduce__(self):
+        return type(self), ()
+
+class ReadOnlyError(PhoneBookError):
+    """Телефонная книга открыта только для чтения"""
+    def __init__(self):
+        super().__init__("Телефонная книга открыта только для чтения")
+
+    def __reduce__(self):
+        return type(self), ()
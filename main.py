@@ -1,8 +1,18 @@
 
-from controller.phonebook_controller import PhoneBookController
+import sys
+
 
 def main():
-    """Основная функция запуска приложения"""
+    """Основная функция запуска приложения
+
+    С аргументами командной строки (python main.py find ТЕКСТ --file книга.txt)
+    выполняется команда без меню, иначе запускается интерактивный режим.
+    """
+    # Импорт внутри функции: сам модуль main должен загружаться мгновенно
+    if len(sys.argv) > 1:
+        from controller.batch_controller import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+    from controller.phonebook_controller import PhoneBookController
     controller = PhoneBookController()
     controller.run()
 
@@ -0,0 +1,312 @@
+import inspect
+import math
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    import logging
+
+# Границы корзин гистограммы времени, секунды (как в клиентах Prometheus)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+           math.inf)
+
+F = TypeVar('F', bound=Callable)
+
+
+class MetricsSink(ABC):
+    """Базовый класс приемника метрик"""
+
+    @abstractmethod
+    def observe(self, name: str, seconds: float) -> None:
+        """Учет длительности операции"""
+
+    @abstractmethod
+    def increment(self, name: str, value: int = 1) -> None:
+        """Увеличение счетчика"""
+
+
+# Подключенные приемники. Кортеж, а не список: проверка "есть ли приемники" на
+# горячем пути - одно обращение к глобальной переменной, и его можно безопасно
+# перебирать, пока другой поток подключает приемник
+_sinks: Tuple[MetricsSink, ...] = ()
+_default_histogram: Optional['HistogramSink'] = None
+
+
+def add_sink(sink: MetricsSink) -> None:
+    """Подключение приемника метрик"""
+    global _sinks
+    if sink not in _sinks:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink: MetricsSink) -> None:
+    """Отключение приемника метрик"""
+    global _sinks
+    _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def clear_sinks() -> None:
+    """Отключение всех приемников: инструментирование снова ничего не стоит"""
+    global _sinks, _default_histogram
+    _sinks = ()
+    _default_histogram = None
+
+
+def is_enabled() -> bool:
+    """Подключен ли хотя бы один приемник"""
+    return bool(_sinks)
+
+
+def histogram() -> 'HistogramSink':
+    """Общая гистограмма в памяти; подключается при первом вызове"""
+    global _default_histogram
+    if _default_histogram is None:
+        _default_histogram = HistogramSink()
+    add_sink(_default_histogram)
+    return _default_histogram
+
+
+def observe(name: str, seconds: float) -> None:
+    """Передача длительности операции всем приемникам"""
+    for sink in _sinks:
+        sink.observe(name, seconds)
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Передача приращения счетчика всем приемникам"""
+    for sink in _sinks:
+        sink.increment(name, value)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Декоратор: длительность вызова функции (или корутины) учитывается как name
+
+    Без подключенных приемников обертка только проверяет кортеж приемников
+    и вызывает функцию.
+    """
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _sinks:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(name, time.perf_counter() - start)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Контекстный менеджер: длительность блока учитывается как name"""
+    if not _sinks:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+class _Histogram:
+    """Распределение длительностей одной операции по корзинам BUCKETS"""
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, fraction: float) -> float:
+        """Оценка квантиля: верхняя граница корзины, но не больше максимума"""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class HistogramSink(MetricsSink):
+    """Приемник, накапливающий гистограммы длительностей и счетчики в памяти"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, _Histogram] = {}
+        self._counters: Dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.add(seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Сводка по операциям: число вызовов, время в мс (всего, среднее, p50, p95, максимум)"""
+        with self._lock:
+            return {name: {'count': h.count,
+                           'total_ms': h.total * 1000,
+                           'avg_ms': h.total / h.count * 1000,
+                           'p50_ms': h.quantile(0.5) * 1000,
+                           'p95_ms': h.quantile(0.95) * 1000,
+                           'max_ms': h.max * 1000}
+                    for name, h in sorted(self._histograms.items())}
+
+    def counters(self) -> Dict[str, int]:
+        """Текущие значения счетчиков"""
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self) -> None:
+        """Сброс накопленных значений"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class LoggingSink(MetricsSink):
+    """Приемник, записывающий каждое измерение в журнал logging"""
+
+    def __init__(self, logger: Optional['logging.Logger'] = None, level: Optional[int] = None):
+        import logging  # Не нужен, пока приемник не создан
+        self.logger = logger or logging.getLogger('phonebook.metrics')
+        self.level = logging.DEBUG if level is None else level
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.logger.log(self.level, "%s: %.3f мс", name, seconds * 1000)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.logger.log(self.level, "%s: +%d", name, value)
+
+
+_METRIC_NAME = re.compile(r'[^a-zA-Z0-9_]')
+
+
+class PrometheusFileSink(HistogramSink):
+    """Приемник, записывающий метрики в файл в текстовом формате Prometheus
+
+    Файл перезаписывается атомарно фоновым потоком после изменений, но не
+    чаще одного раза в interval секунд, а также при вызове write() и
+    close(); измерения на горячем пути только отмечают изменение. Файл
+    можно отдавать, например, через textfile collector node_exporter.
+    Имена метрик получают префикс prefix, если уже не начинаются с него.
+    """
+
+    def __init__(self, file_path: str, interval: float = 10.0, prefix: str = 'phonebook'):
+        super().__init__()
+        self.file_path = file_path
+        self.interval = interval
+        self.prefix = prefix
+        self._written_at = -math.inf
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self._writer = threading.Thread(target=self._run, name='metrics-writer', daemon=True)
+        self._writer.start()
+
+    def observe(self, name: str, seconds: float) -> None:
+        super().observe(name, seconds)
+        if not self._changed.is_set():
+            self._changed.set()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        super().increment(name, value)
+        if not self._changed.is_set():
+            self._changed.set()
+
+    def close(self) -> None:
+        """Остановка фоновой записи и запись последних значений"""
+        self._closed.set()
+        self._changed.set()
+        self._writer.join()
+        self.write()
+
+    def _run(self) -> None:
+        """Цикл фонового потока: запись после изменений не чаще interval"""
+        while True:
+            self._changed.wait()
+            # Изменения, пришедшие во время ожидания, попадут в эту же запись
+            if self._closed.wait(max(0.0, self._written_at + self.interval - time.monotonic())):
+                return
+            self._changed.clear()
+            try:
+                self.write()
+            except OSError:
+                # Недоступный файл метрик не должен останавливать поток: повтор при следующем изменении
+                pass
+
+    def _metric_name(self, name: str) -> str:
+        if self.prefix and not name.startswith(self.prefix + '.'):
+            name = f"{self.prefix}_{name}"
+        return _METRIC_NAME.sub('_', name)
+
+    def render(self) -> str:
+        """Текущие метрики в текстовом формате Prometheus"""
+        lines = []
+        with self._lock:
+            for name, histogram in sorted(self._histograms.items()):
+                metric = self._metric_name(name) + '_seconds'
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    cumulative += count
+                    label = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f'{metric}_bucket{{le="{label}"}} {cumulative}')
+                lines.append(f"{metric}_sum {histogram.total!r}")
+                lines.append(f"{metric}_count {histogram.count}")
+            for name, value in sorted(self._counters.items()):
+                metric = self._metric_name(name) + '_total'
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        """Атомарная запись метрик в файл"""
+        # Экспортер метрик обычно работает под другим пользователем: файл
+        # получает права обычного нового файла, а не 0o600 от mkstemp
+        from model.file_handler import create_temp_file
+        self._written_at = time.monotonic()
+        content = self.render()
+        fd, temp_path = create_temp_file(self.file_path)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(content)
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,69 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """Автомат Ахо-Корасик для поиска многих подстрок за один проход
+
+    Строится один раз по набору образцов; find_all проходит текст
+    посимвольно и возвращает номера всех образцов, встретившихся в нем,
+    за время, не зависящее от количества образцов.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for pattern in patterns:
+            self._insert(pattern)
+        self._build_links()
+
+    def _insert(self, pattern: str) -> None:
+        """Добавление образца в бор"""
+        goto, out = self._goto, self._out
+        state = 0
+        for char in pattern:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                self._fail.append(0)
+                out.append(())
+            state = next_state
+        out[state] += (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build_links(self) -> None:
+        """Суффиксные ссылки обходом в ширину; выходы наследуются по ним"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                link = goto[link].get(char, 0)
+                fail[child] = link if link != child else 0
+                if out[fail[child]]:
+                    out[child] += out[fail[child]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Номера образцов, которые встречаются в тексте"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def __len__(self) -> int:
+        return len(self.patterns)
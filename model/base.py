@@ -1,6 +1,10 @@
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .contact import Contact
+    from .search_key import SearchKey
 
 
 class BaseModel(ABC):
@@ -12,4 +16,89 @@ class BaseModel(ABC):
 
     @abstractmethod
     def load(self):
-        pass
\ No newline at end of file
+        pass
+
+
+class BaseIndex(ABC):
+    """Базовый класс для индексов телефонной книги
+
+    Индекс поддерживается книгой при каждом изменении контактов:
+    remove вызывается со старыми значениями полей, add - с новыми.
+    """
+
+    @abstractmethod
+    def add(self, contact_id: int, contact: 'Contact') -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, contact_id: int, contact: 'Contact') -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class BaseContactStore(ABC):
+    """Базовый класс хранилища контактов телефонной книги
+
+    Хранилище - отображение ID -> Contact, через которое книга выполняет
+    перебор, поиск и сортировку, не зная его устройства. Хранилища в памяти
+    выполняют эти операции перебором строк (ScanContactStore), база SQLite -
+    запросами к своим индексам. Индексы книги в памяти, если они включены,
+    используются вместо операций хранилища.
+    """
+
+    # iter_rows() без ids выдает строки по возрастанию ID, без сортировки
+    ordered = False
+    # Изменения сразу пишутся в файл хранилища: книге достаточно вызвать save()
+    persistent = False
+
+    @abstractmethod
+    def iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Sequence[str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) всех контактов или только ids (в их порядке)"""
+
+    @abstractmethod
+    def iter_ids(self, start: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID по возрастанию (при reverse - по убыванию) начиная с start включительно
+
+        Время получения первых ID не должно зависеть от пропусков в нумерации.
+        """
+
+    @abstractmethod
+    def frozen_rows(self) -> Iterable[Tuple[int, Sequence[str]]]:
+        """Строки по возрастанию ID, не зависящие от последующих изменений (для фонового сохранения)"""
+
+    @abstractmethod
+    def search(self, folded_term: str, ids: Optional[Iterable[int]] = None,
+               keys: Optional[Dict[int, 'SearchKey']] = None) -> Iterator[Tuple[int, 'Contact']]:
+        """Пары (ID, контакт), поисковый ключ которых содержит приведенную строку
+
+        ids - кандидаты (например, из индекса n-грамм), keys - кэш поисковых
+        ключей книги; хранилище с собственным индексом может их не использовать.
+        """
+
+    @abstractmethod
+    def search_many(self, folded_terms: Iterable[str],
+                    keys: Optional[Dict[int, 'SearchKey']] = None) -> Dict[str, Dict[int, 'Contact']]:
+        """Результаты search для каждой приведенной строки (пустая строка - все контакты)"""
+
+    @abstractmethod
+    def find_phone(self, digits: str, prefix: bool = False) -> Iterator[Tuple[int, 'Contact']]:
+        """Контакты с нормализованным номером digits (или начинающимся с него)"""
+
+    @abstractmethod
+    def sorted_ids(self, field: str, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[int]:
+        """ID по возрастанию значения поля без учета регистра, с семантикой границ SortedIndex"""
+
+    @abstractmethod
+    def max_id(self) -> int:
+        """Наибольший ID (0 для пустого хранилища)"""
+
+    @abstractmethod
+    def save(self) -> None:
+        """Фиксация изменений в файле хранилища"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Освобождение файла и соединений хранилища"""
@@ -0,0 +1,130 @@
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .contact import Contact
+from .memory_store import ScanContactStore
+
+
+class ColumnarContactStore(MutableMapping, ScanContactStore):
+    """Колоночное хранилище контактов
+
+    Имена, телефоны и комментарии хранятся в параллельных списках,
+    индексированных ID (ID совпадают с номерами строк файла, поэтому
+    списки почти не содержат пропусков). Отдельные объекты Contact
+    создаются только при обращении к контакту; изменения такого объекта
+    сохраняются повторным присваиванием store[contact_id] = contact.
+    """
+
+    ordered = True
+
+    def __init__(self):
+        # Элемент 0 не используется: ID начинаются с 1
+        self._names: List[Optional[str]] = [None]
+        self._phones: List[Optional[str]] = [None]
+        self._comments: List[Optional[str]] = [None]
+        self._count = 0
+
+    @classmethod
+    def from_columns(cls, ids: Sequence[int], names: List[str], phones: List[str],
+                     comments: List[str]) -> 'ColumnarContactStore':
+        """Создание хранилища из готовых столбцов, упорядоченных по ID"""
+        store = cls()
+        count = len(ids)
+        if count and ids[0] == 1 and ids[-1] == count and list(ids) == list(range(1, count + 1)):
+            # ID идут подряд с 1: столбцы используются без поэлементного копирования
+            store._names.extend(names)
+            store._phones.extend(phones)
+            store._comments.extend(comments)
+            store._count = count
+        else:
+            for row in zip(ids, names, phones, comments):
+                store.put_fields(row[0], row[1:])
+        return store
+
+    def put_fields(self, contact_id: int, fields: Sequence[str]) -> None:
+        """Запись полей контакта без создания объекта Contact"""
+        if len(fields) != 3:
+            raise ValueError("Список должен содержать 3 элемента: имя, телефон, комментарий")
+        names = self._names
+        if contact_id >= len(names):
+            grow = contact_id + 1 - len(names)
+            names.extend([None] * grow)
+            self._phones.extend([None] * grow)
+            self._comments.extend([None] * grow)
+        if names[contact_id] is None:
+            self._count += 1
+        names[contact_id] = fields[0]
+        self._phones[contact_id] = fields[1]
+        self._comments[contact_id] = fields[2]
+
+    def iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) в порядке возрастания ID
+
+        Если передан ids, выдаются только строки с этими ID (в их порядке).
+        """
+        names, phones, comments = self._names, self._phones, self._comments
+        if ids is not None:
+            return ((contact_id, (names[contact_id], phones[contact_id], comments[contact_id]))
+                    for contact_id in ids)
+        return ((contact_id, row)
+                for contact_id, row in enumerate(zip(names, phones, comments))
+                if row[0] is not None)
+
+    def iter_ids(self, start: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID по возрастанию (при reverse - по убыванию) начиная с start включительно"""
+        names = self._names
+        if reverse:
+            top = len(names) - 1 if start is None else min(start, len(names) - 1)
+            positions = range(top, 0, -1)
+        else:
+            positions = range(max(start or 1, 1), len(names))
+        return (contact_id for contact_id in positions if names[contact_id] is not None)
+
+    def frozen_rows(self) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """Строки по копиям столбцов: не зависят от последующих изменений"""
+        names, phones, comments = self._names[:], self._phones[:], self._comments[:]
+        return ((contact_id, row)
+                for contact_id, row in enumerate(zip(names, phones, comments))
+                if row[0] is not None)
+
+    def max_id(self) -> int:
+        # Освободившийся хвост списков отрезается при удалении
+        return len(self._names) - 1
+
+    def __getitem__(self, contact_id: int) -> Contact:
+        if not isinstance(contact_id, int) or not 0 < contact_id < len(self._names):
+            raise KeyError(contact_id)
+        name = self._names[contact_id]
+        if name is None:
+            raise KeyError(contact_id)
+        return Contact(name, self._phones[contact_id], self._comments[contact_id], contact_id)
+
+    def __setitem__(self, contact_id: int, contact: Contact) -> None:
+        self.put_fields(contact_id, (contact.name, contact.phone, contact.comment))
+
+    def __delitem__(self, contact_id: int) -> None:
+        if contact_id not in self:
+            raise KeyError(contact_id)
+        self._names[contact_id] = self._phones[contact_id] = self._comments[contact_id] = None
+        self._count -= 1
+        # Отрезаем освободившийся хвост списков
+        names = self._names
+        size = len(names)
+        while size > 1 and names[size - 1] is None:
+            size -= 1
+        if size < len(names):
+            del names[size:], self._phones[size:], self._comments[size:]
+
+    def __contains__(self, contact_id: object) -> bool:
+        return (isinstance(contact_id, int) and 0 < contact_id < len(self._names)
+                and self._names[contact_id] is not None)
+
+    def __iter__(self) -> Iterator[int]:
+        return (contact_id for contact_id, name in enumerate(self._names) if name is not None)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def copy(self) -> Dict[int, Contact]:
+        """Копия контактов в виде словаря"""
+        return {contact_id: Contact(*row, contact_id) for contact_id, row in self.iter_rows()}
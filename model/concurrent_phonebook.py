@@ -0,0 +1,244 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import wraps
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional, Tuple, TypeVar, Union
+from .contact import Contact
+from .phonebook import PhoneBook, _BookState
+
+F = TypeVar('F', bound=Callable)
+
+
+class RWLock:
+    """Блокировка "читатели-писатель" с приоритетом писателей
+
+    Читатели работают одновременно, писатель - один и без читателей. Пока
+    писатель ждет, новые читатели не допускаются, поэтому поток изменений
+    не голодает. Обе блокировки повторно входимы в пределах потока, а
+    писатель может читать; получить запись, удерживая чтение, нельзя
+    (два таких потока заблокировали бы друг друга).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()  # depth - вложенность чтения, counted - учтен ли поток в _readers
+
+    def acquire_read(self) -> None:
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth:
+            local.depth = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            local.depth, local.counted = 1, False
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local.depth, local.counted = 1, True
+
+    def release_read(self) -> None:
+        local = self._local
+        local.depth -= 1
+        if local.depth or not local.counted:
+            return
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'depth', 0):
+                raise RuntimeError("Нельзя получить блокировку записи, удерживая блокировку чтения")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _read_locked(method: F) -> F:
+    """Вызов метода под блокировкой чтения"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _write_locked(method: F) -> F:
+    """Вызов метода под блокировкой записи"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ConcurrentPhoneBook(PhoneBook):
+    """Телефонная книга для работы из нескольких потоков
+
+    Поиск и чтение идут под общей блокировкой чтения и не мешают друг
+    другу; изменения, выделение ID и открытие сериализуются блокировкой
+    записи. Сохранение и сжатие журнала снимают копию строк под
+    блокировкой чтения и пишут файл без нее, а между собой выполняются
+    по очереди. Методы, которые в PhoneBook отдают ленивые
+    итераторы или живые представления, здесь возвращают копии, снятые под
+    блокировкой, поэтому их можно перебирать во время изменений книги.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lock = RWLock()
+        # Очередь сохранений; берется раньше self._lock, чтобы порядок захвата был один
+        self._save_lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    # Чтение
+    get_contact = _read_locked(PhoneBook.get_contact)
+    get_all_contacts = _read_locked(PhoneBook.get_all_contacts)
+    get_page = _read_locked(PhoneBook.get_page)
+    list_sorted = _read_locked(PhoneBook.list_sorted)
+    find_contacts_many = _read_locked(PhoneBook.find_contacts_many)
+    fuzzy_find = _read_locked(PhoneBook.fuzzy_find)
+    find_by_phone = _read_locked(PhoneBook.find_by_phone)
+    find_by_phone_prefix = _read_locked(PhoneBook.find_by_phone_prefix)
+    find_duplicates = _read_locked(PhoneBook.find_duplicates)
+    __len__ = _read_locked(PhoneBook.__len__)
+
+    # Изменение
+    add_contact = _write_locked(PhoneBook.add_contact)
+    add_contacts = _write_locked(PhoneBook.add_contacts)
+    update_contact = _write_locked(PhoneBook.update_contact)
+    delete_contact = _write_locked(PhoneBook.delete_contact)
+    merge_duplicates = _write_locked(PhoneBook.merge_duplicates)
+
+    def save(self, file_path: Optional[str] = None, format: Optional[str] = None, keep_ids: bool = False) -> None:
+        """Сохранение: копия строк снимается под блокировкой чтения, файл пишется без блокировки
+
+        Как и в PhoneBook.asave, индекс n-грамм в снимок не пишется. Книга
+        в базе SQLite и книга с журналом при сохранении в свой файл файл
+        книги не переписывают: фиксация пакета и сброс журнала идут под
+        блокировкой записи, смена формата книги с журналом - через compact.
+        """
+        with self._save_lock:
+            with self._lock.read_locked():
+                save_path, format = self._resolve_save_target(file_path, format)
+                own_file = save_path == self._file_path
+                in_place = own_file and (self._contacts.persistent or self._journal is not None)
+                rows = None if in_place else self._capture_rows()
+
+            if rows is not None:
+                self._write_rows(save_path, format, rows, keep_ids)
+                if own_file:
+                    with self._lock.write_locked():
+                        self._file_format = format
+            elif self._journal is not None and format != self._file_format:
+                with self._lock.write_locked():
+                    self._file_format = format
+                self.compact()
+            else:
+                with self._lock.write_locked():
+                    super().save(save_path, format, keep_ids)
+
+    def compact(self) -> None:
+        """Сжатие журнала без блокировки на время записи файла
+
+        Копия строк и длина журнала снимаются под блокировкой чтения, файл
+        пишется без блокировки, а затем из журнала удаляются только
+        операции, вошедшие в копию: изменения, сделанные во время записи
+        файла, остаются в журнале.
+        """
+        with self._save_lock:
+            with self._lock.read_locked():
+                if self._journal is None:
+                    raise ValueError("Журнал не используется")
+                self._check_writable()
+                journal = self._journal
+                rows = self._capture_rows()
+                written = journal.written_size()
+                file_path, file_format = self._file_path, self._file_format
+
+            self._write_rows(file_path, file_format, rows, keep_ids=True)
+            with self._lock.write_locked():
+                journal.discard_head(written)
+
+    def close(self) -> None:
+        """Закрытие книги после завершения начатого сохранения"""
+        with self._save_lock, self._lock.write_locked():
+            super().close()
+
+    def _apply_state(self, state: _BookState) -> None:
+        """open и aopen читают файл без блокировки, а подменяют содержимое книги под ней"""
+        with self._save_lock, self._lock.write_locked():
+            super()._apply_state(state)
+
+    def find_contacts(self, search_term: str,
+                      lazy: bool = False) -> Union[Dict[int, Contact], Iterator[Tuple[int, Contact]]]:
+        """Поиск контактов по всем полям; при lazy=True - итератор по готовому результату"""
+        with self._lock.read_locked():
+            found = super().find_contacts(search_term)
+        return iter(found.items()) if lazy else found
+
+    def view(self) -> Mapping[int, Contact]:
+        """Представление копии контактов только для чтения
+
+        В отличие от PhoneBook.view, не отражает последующие изменения книги.
+        """
+        with self._lock.read_locked():
+            return MappingProxyType(self._contacts.copy())
+
+    def iter_ids(self, start_id: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID контактов, снятые под блокировкой (см. PhoneBook.iter_ids)"""
+        with self._lock.read_locked():
+            return iter(list(super().iter_ids(start_id, reverse)))
+
+    def __iter__(self) -> Iterator[Contact]:
+        with self._lock.read_locked():
+            return iter(list(self._contacts.values()))
+
+    async def asave(self, file_path: Optional[str] = None, format: Optional[str] = None,
+                    executor: Optional[Executor] = None) -> None:
+        """Асинхронное сохранение: save выполняется в executor
+
+        Блокировки потоковые, поэтому их нельзя удерживать через await в цикле событий.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, self.save, file_path, format)
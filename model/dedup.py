@@ -0,0 +1,177 @@
+import random
+import zlib
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+from .fuzzy_index import name_tokens
+from .phone_index import normalize_phone
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 32
+LSH_BANDS = 8  # 8 полос по 4 значения: пары с похожестью от ~0.6 почти всегда попадают в кандидаты
+MAX_BUCKET = 64  # В больших корзинах сравниваются только соседние ключи
+_PRIME = (1 << 61) - 1
+
+
+def name_key(name: str) -> str:
+    """Имя без учета регистра, ё/е, знаков и порядка слов"""
+    return ' '.join(sorted(name_tokens(name)))
+
+
+def shingles(key: str) -> Set[str]:
+    """Множество символьных n-грамм ключа имени (с границами слов)"""
+    padded = f' {key} '
+    return {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Коэффициент Жаккара двух множеств"""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHashLSH:
+    """MinHash-сигнатуры и LSH-корзины для поиска похожих множеств
+
+    Сигнатура - минимумы NUM_PERMUTATIONS хеш-функций по элементам множества;
+    вероятность совпадения значения равна коэффициенту Жаккара. Сигнатура
+    режется на полосы, и ключи с совпавшей полосой становятся кандидатами,
+    поэтому похожие пары находятся без сравнения всех пар.
+    """
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, bands: int = LSH_BANDS, seed: int = 1):
+        if num_permutations % bands:
+            raise ValueError("Число хеш-функций должно делиться на число полос")
+        rng = random.Random(seed)
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_permutations)]
+        self._rows = num_permutations // bands
+        self._bands = bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        # Значения всех хеш-функций для каждого элемента: набор n-грамм имен невелик,
+        # и сигнатура сводится к поэлементному минимуму готовых векторов
+        self._vectors: Dict[str, Tuple[int, ...]] = {}
+
+    def _vector(self, item: str) -> Tuple[int, ...]:
+        """Значения хеш-функций для элемента"""
+        vector = self._vectors.get(item)
+        if vector is None:
+            value = zlib.crc32(item.encode('utf-8'))
+            vector = self._vectors[item] = tuple((a * value + b) % _PRIME for a, b in self._params)
+        return vector
+
+    def signature(self, items: Iterable[str]) -> List[int]:
+        """MinHash-сигнатура множества строк"""
+        return list(map(min, zip(*map(self._vector, items))))
+
+    def add(self, key: str, items: Iterable[str]) -> None:
+        """Добавление ключа в LSH-корзины"""
+        signature = self.signature(items)
+        rows = self._rows
+        for band in range(self._bands):
+            bucket = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def candidate_pairs(self) -> Iterator[Tuple[str, str]]:
+        """Пары ключей, совпавших хотя бы в одной полосе (пара может повторяться)
+
+        В корзине больше MAX_BUCKET ключей перебор всех пар квадратичен, поэтому
+        там сравниваются только соседние в порядке сортировки ключи.
+        """
+        for keys in self._buckets.values():
+            if len(keys) > MAX_BUCKET:
+                keys = sorted(keys)
+                yield from zip(keys, keys[1:])
+            elif len(keys) > 1:
+                yield from combinations(sorted(keys), 2)
+
+
+class _PhoneUnion:
+    """Система непересекающихся множеств ID, где в группе не больше одного номера
+
+    Контакты с разными непустыми номерами не объединяются даже при похожих
+    именах; контакт без номера может присоединиться к группе с номером.
+    """
+
+    def __init__(self):
+        self._parent: Dict[int, int] = {}
+        self._phone: Dict[int, str] = {}
+
+    def add(self, contact_id: int, phone: str) -> None:
+        self._parent[contact_id] = contact_id
+        self._phone[contact_id] = phone
+
+    def find(self, contact_id: int) -> int:
+        parent = self._parent
+        root = contact_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[contact_id] != root:
+            parent[contact_id], contact_id = root, parent[contact_id]
+        return root
+
+    def phone_of(self, contact_id: int) -> str:
+        """Номер группы контакта (пустой, если в группе нет номеров)"""
+        return self._phone[self.find(contact_id)]
+
+    def union(self, a: int, b: int) -> bool:
+        """Объединение групп; False, если группы уже общие или номера конфликтуют"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        phone_a, phone_b = self._phone[root_a], self._phone[root_b]
+        if phone_a and phone_b and phone_a != phone_b:
+            return False
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._phone[root_a] = phone_a or phone_b
+        return True
+
+    def groups(self) -> List[List[int]]:
+        """Группы из нескольких ID, упорядоченные по наименьшему ID"""
+        members: Dict[int, List[int]] = {}
+        for contact_id in self._parent:
+            members.setdefault(self.find(contact_id), []).append(contact_id)
+        return sorted((sorted(ids) for ids in members.values() if len(ids) > 1), key=lambda ids: ids[0])
+
+
+def find_duplicate_groups(rows: Iterable[Tuple[int, Sequence[str]]], threshold: float = 0.7) -> List[List[int]]:
+    """Группы ID дубликатов среди пар (ID, поля)
+
+    Дубликаты - контакты с совпадающим ключом имени (name_key) или похожими
+    именами (коэффициент Жаккара n-грамм не ниже threshold), у которых
+    нормализованные номера совпадают или отсутствуют. Совпадающие ключи
+    группируются словарем за O(n), похожие находятся через MinHash/LSH.
+    """
+    union = _PhoneUnion()
+    by_key: Dict[str, List[int]] = {}
+    for contact_id, (name, phone, _) in rows:
+        key = name_key(name)
+        if key:
+            union.add(contact_id, normalize_phone(phone))
+            by_key.setdefault(key, []).append(contact_id)
+
+    for ids in by_key.values():
+        _link(union, ids, ids)
+
+    if threshold < 1:
+        lsh = MinHashLSH()
+        key_shingles = {key: shingles(key) for key in by_key}
+        for key, items in key_shingles.items():
+            lsh.add(key, items)
+        for key_a, key_b in lsh.candidate_pairs():
+            if jaccard(key_shingles[key_a], key_shingles[key_b]) >= threshold:
+                _link(union, by_key[key_a], by_key[key_b])
+
+    return union.groups()
+
+
+def _link(union: _PhoneUnion, ids_a: List[int], ids_b: List[int]) -> None:
+    """Присоединение контактов из ids_b к группам из ids_a с тем же номером (или к группе без номера)"""
+    groups: Dict[str, int] = {}
+    for a in ids_a:
+        groups.setdefault(union.phone_of(a), a)
+    fallback = groups.get('', ids_a[0])
+    for b in ids_b:
+        phone = union.phone_of(b)
+        target = groups.get(phone, fallback) if phone else ids_a[0]
+        if target != b:
+            union.union(target, b)
@@ -1,6 +1,52 @@
 import os
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 from exceptions import FileOperationError
+import metrics
+from . import snapshot, sqlite_store
+
+FORMAT_TEXT = 'text'
+FORMAT_SNAPSHOT = 'snapshot'
+FORMAT_SQLITE = 'sqlite'
+
+# Размер порции (в байтах), которую читаем за одно обращение к файлу
+CHUNK_SIZE = 1 << 20
+
+
+def create_temp_file(file_path: str) -> Tuple[int, str]:
+    """Временный файл в каталоге file_path для атомарной замены, возвращает (дескриптор, путь)
+
+    Файл создается с правами 0o666, из которых ядро само вычитает umask,
+    как у обычного нового файла (mkstemp дал бы 0o600, а чтение umask
+    через os.umask на время меняет его для всех потоков процесса).
+    Если file_path уже существует, временный файл получает его права.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    prefix = os.path.join(directory, '.' + os.path.basename(file_path))
+    flags = os.O_CREAT | os.O_EXCL | os.O_RDWR | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp_path = f"{prefix}.{os.urandom(6).hex()}.tmp"
+        try:
+            fd = os.open(temp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(fd)
+        os.unlink(temp_path)
+        raise
+    return fd, temp_path
+
+
+def same_file(file_path: str, other_path: str) -> bool:
+    """Указывают ли пути на один файл; несуществующие сравниваются по абсолютному пути"""
+    try:
+        return os.path.samefile(file_path, other_path)
+    except OSError:
+        return os.path.normcase(os.path.abspath(file_path)) == os.path.normcase(os.path.abspath(other_path))
 
 
 class FileHandler:
@@ -9,19 +55,103 @@ class FileHandler:
     def __init__(self, separator: str = ';'):
         self.separator = separator
 
+    @metrics.timed('file.load')
     def load(self, file_path: str) -> Dict[int, List[str]]:
-        """Загрузка данных из файла"""
+        """Загрузка данных из файла (текстового, снимка или базы SQLite)"""
+        file_format = self.detect_format(file_path)
+        if file_format == FORMAT_SNAPSHOT:
+            data = snapshot.read_snapshot(file_path)
+            return {contact_id: list(fields)
+                    for contact_id, *fields in zip(data.ids, data.names, data.phones, data.comments)}
+        if file_format == FORMAT_SQLITE:
+            store = sqlite_store.SQLiteContactStore(file_path)
+            try:
+                return {contact_id: list(fields) for contact_id, fields in store.iter_rows()}
+            finally:
+                store.close()
+        return dict(self.iter_records(file_path))
+
+    def load_parallel(self, file_path: str, workers: Optional[int] = None) -> Dict[int, List[str]]:
+        """Загрузка текстового файла с разбором в нескольких процессах"""
+        return dict(self.iter_records_parallel(file_path, workers))
+
+    def iter_records_parallel(self, file_path: str,
+                              workers: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+        """Пары (номер строки, поля), как iter_records, но с разбором в пуле процессов
+
+        Файл делится на диапазоны байт по границам строк; небольшие файлы
+        читаются обычным iter_records.
+        """
+        # Модуль тянет за собой multiprocessing, поэтому загружается только здесь
+        from . import parallel_loader
+        try:
+            if workers == 1 or os.path.getsize(file_path) < parallel_loader.MIN_PARALLEL_SIZE:
+                yield from self.iter_records(file_path)
+                return
+            yield from parallel_loader.iter_records_parallel(file_path, self.separator, workers)
+
+        except FileOperationError:
+            raise
+        except FileNotFoundError as e:
+            raise FileOperationError(f"Файл не найден", file_path) from e
+        except PermissionError as e:
+            raise FileOperationError(f"Нет доступа к файлу", file_path) from e
+        except UnicodeDecodeError as e:
+            raise FileOperationError(f"Ошибка кодировки файла. Используйте UTF-8.", file_path) from e
+        except Exception as e:
+            raise FileOperationError(f"Ошибка при чтении файла", file_path) from e
+
+    @staticmethod
+    def detect_format(file_path: str) -> str:
+        """Определение формата файла по заголовку"""
+        if snapshot.is_snapshot(file_path):
+            return FORMAT_SNAPSHOT
+        if sqlite_store.is_sqlite(file_path):
+            return FORMAT_SQLITE
+        return FORMAT_TEXT
+
+    @metrics.timed('file.save_snapshot')
+    def save_snapshot(self, file_path: str, rows: Iterable[Tuple[int, Sequence[str]]],
+                      ngram_n: Optional[int] = None,
+                      ngram_postings: Optional[Dict[str, Set[int]]] = None) -> None:
+        """Сохранение пар (ID, поля) в бинарный снимок, при необходимости вместе с индексом n-грамм"""
+        try:
+            self.write_atomic(file_path, snapshot.encode_snapshot(rows, ngram_n, ngram_postings), binary=True)
+
+        except PermissionError as e:
+            raise FileOperationError(f"Нет доступа для записи в файл", file_path) from e
+        except Exception as e:
+            raise FileOperationError(f"Ошибка при сохранении снимка", file_path) from e
+
+    def convert(self, source_path: str, target_path: str) -> str:
+        """Преобразование текстового файла в снимок и обратно, возвращает формат результата"""
+        if self.detect_format(source_path) == FORMAT_SNAPSHOT:
+            data = snapshot.read_snapshot(source_path)
+            rows = zip(data.ids, zip(data.names, data.phones, data.comments))
+            self.save_rows(target_path, rows, keep_ids=True)
+            return FORMAT_TEXT
+        self.save_snapshot(target_path, self.iter_records(source_path))
+        return FORMAT_SNAPSHOT
+
+    def iter_records(self, file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, List[str]]]:
+        """Потоковое чтение файла: выдает пары (номер строки, поля) порциями по chunk_size байт"""
         try:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Файл не найден: {file_path}")
 
-            with open(file_path, 'r', encoding='UTF-8') as file:
-                contacts = {}
-                for line_num, line in enumerate(file, 1):
-                    line = line.strip()
-                    if line:
-                        contacts[line_num] = line.split(self.separator)
-                return contacts
+            with open(file_path, 'r', encoding='UTF-8', buffering=chunk_size) as file:
+                line_num = 0
+                while True:
+                    # readlines с подсказкой размера читает целые строки блоком,
+                    # не разбирая файл построчно через интерпретатор
+                    lines = file.readlines(chunk_size)
+                    if not lines:
+                        break
+                    for line in lines:
+                        line_num += 1
+                        line = line.strip()
+                        if line:
+                            yield line_num, line.split(self.separator)
 
         except FileNotFoundError as e:
             raise FileOperationError(f"Файл не найден", file_path) from e
@@ -32,22 +162,63 @@ class FileHandler:
         except Exception as e:
             raise FileOperationError(f"Ошибка при чтении файла", file_path) from e
 
-    def save(self, file_path: str, contacts: Dict[int, List[str]]) -> None:
-        """Сохранение данных в файл"""
+    def save(self, file_path: str, contacts: Dict[int, List[str]], keep_ids: bool = False) -> None:
+        """Сохранение данных в файл
+
+        Данные пишутся во временный файл рядом с исходным, который затем
+        атомарно подменяет исходный: сбой во время записи не портит книгу.
+        При keep_ids=True на месте отсутствующих ID остаются пустые строки,
+        чтобы при следующей загрузке номера строк совпали с ID.
+        """
+        rows = ((contact_id, contacts[contact_id]) for contact_id in sorted(contacts.keys()))
+        self.save_rows(file_path, rows, keep_ids)
+
+    @metrics.timed('file.save')
+    def save_rows(self, file_path: str, rows: Iterable[Tuple[int, Sequence[str]]], keep_ids: bool = False) -> None:
+        """Потоковое сохранение пар (ID, поля), упорядоченных по ID"""
         try:
-            with open(file_path, 'w', encoding='UTF-8') as file:
-                lines = []
-                for contact_id in sorted(contacts.keys()):
-                    contact_data = contacts[contact_id]
-                    line = self.separator.join(contact_data)
-                    lines.append(line)
-                file.write('\n'.join(lines))
+            self.write_atomic(file_path, self._iter_lines(rows, keep_ids))
 
         except PermissionError as e:
             raise FileOperationError(f"Нет доступа для записи в файл", file_path) from e
         except Exception as e:
             raise FileOperationError(f"Ошибка при сохранении файла", file_path) from e
 
+    def _iter_lines(self, rows: Iterable[Tuple[int, Sequence[str]]], keep_ids: bool) -> Iterator[str]:
+        """Строки файла, разделенные переводом строки (без завершающего)"""
+        separator = self.separator
+        last_id = 0
+        first = True
+        for contact_id, contact_data in rows:
+            if keep_ids and contact_id - last_id > 1:
+                # Пустые строки на месте отсутствующих ID
+                gap = contact_id - last_id - 1
+                yield '\n' * (gap - 1 if first else gap)
+                first = False
+            line = separator.join(contact_data)
+            yield line if first else '\n' + line
+            first = False
+            last_id = contact_id
+
+    @staticmethod
+    def write_atomic(file_path: str, chunks: Iterable, binary: bool = False) -> None:
+        """Атомарная запись: временный файл, fsync и переименование"""
+        fd, temp_path = create_temp_file(file_path)
+        try:
+            if binary:
+                file = os.fdopen(fd, 'wb', buffering=CHUNK_SIZE)
+            else:
+                file = os.fdopen(fd, 'w', encoding='UTF-8', buffering=CHUNK_SIZE)
+            with file:
+                file.writelines(chunks)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
     def file_exists(self, file_path: str) -> bool:
         """Проверка существования файла"""
         return os.path.exists(file_path)
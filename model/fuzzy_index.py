@@ -0,0 +1,160 @@
+import re
+from typing import Dict, List, Optional, Set, Union
+from .base import BaseIndex
+from .contact import Contact
+from .search_key import fold
+
+_TOKEN = re.compile(r'\w+')
+
+
+def name_tokens(text: str) -> List[str]:
+    """Слова строки в виде для поиска (см. fold)"""
+    return _TOKEN.findall(fold(text))
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Расстояние Левенштейна между строками
+
+    С max_distance вычисление прекращается, как только расстояние заведомо
+    больше порога; тогда возвращается max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            insert = current[j - 1] + 1
+            delete = previous[j] + 1
+            current.append(min(cost, insert, delete))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Строки, получаемые из word удалением не более max_distance символов"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))} - result
+        result |= frontier
+    return result
+
+
+class FuzzyIndex(BaseIndex):
+    """Индекс для нечеткого поиска по словам имени (удаления SymSpell)
+
+    Если расстояние между словами не больше k, то из каждого можно удалить
+    не более k символов так, чтобы получилась одна и та же строка. Поэтому
+    для каждого слова хранятся все его "удаления" (от начала слова длиной
+    prefix_length), а поиск перебирает удаления запроса и проверяет
+    расстоянием только найденных кандидатов, не сравнивая запрос со всеми
+    словами книги.
+
+    Удаление ленивое: удаления слова без контактов остаются в таблице и
+    пропускаются при поиске, а когда таких слов становится больше, чем
+    живых, таблица перестраивается.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._postings: Dict[str, Set[int]] = {}
+        # Удаление -> слово или список слов (одиночные слова не оборачиваются ради памяти)
+        self._deletes: Dict[str, Union[str, List[str]]] = {}
+        self._dead: Set[str] = set()  # Слова без контактов, чьи удаления еще в таблице
+
+    def _insert(self, word: str) -> None:
+        """Добавление удалений слова в таблицу"""
+        table = self._deletes
+        for item in deletes(word[:self.prefix_length], self.max_distance):
+            entry = table.get(item)
+            if entry is None:
+                table[item] = word
+            elif isinstance(entry, str):
+                table[item] = [entry, word]
+            else:
+                entry.append(word)
+
+    def _rebuild(self) -> None:
+        """Перестройка таблицы только из живых слов"""
+        self._deletes = {}
+        self._dead.clear()
+        for word in self._postings:
+            self._insert(word)
+
+    def add(self, contact_id: int, contact: Contact) -> None:
+        """Добавление контакта в индекс"""
+        postings = self._postings
+        for word in name_tokens(contact.name):
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = {contact_id}
+                if word not in self._dead:
+                    self._insert(word)
+                else:
+                    self._dead.discard(word)
+            else:
+                ids.add(contact_id)
+
+    def remove(self, contact_id: int, contact: Contact) -> None:
+        """Удаление контакта из индекса"""
+        postings = self._postings
+        for word in name_tokens(contact.name):
+            ids = postings.get(word)
+            if ids is not None:
+                ids.discard(contact_id)
+                if not ids:
+                    del postings[word]
+                    self._dead.add(word)
+        if len(self._dead) > len(postings) + 64:
+            self._rebuild()
+
+    def clear(self) -> None:
+        """Очистка индекса"""
+        self._postings.clear()
+        self._deletes = {}
+        self._dead.clear()
+
+    def words_within(self, word: str, max_distance: int) -> Dict[str, int]:
+        """Живые слова индекса на расстоянии не больше max_distance от word"""
+        if max_distance > self.max_distance:
+            raise ValueError(f"Индекс построен для расстояния не больше {self.max_distance}")
+        found: Dict[str, int] = {}
+        checked: Set[str] = set()
+        postings, table = self._postings, self._deletes
+        for item in deletes(word[:self.prefix_length], max_distance):
+            entry = table.get(item)
+            if entry is None:
+                continue
+            for candidate in ((entry,) if isinstance(entry, str) else entry):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if candidate not in postings:
+                    continue
+                distance = edit_distance(word, candidate, max_distance)
+                if distance <= max_distance:
+                    found[candidate] = distance
+        return found
+
+    def search(self, word: str, max_distance: int) -> Dict[int, int]:
+        """ID контактов с наименьшим расстоянием от word до слова имени"""
+        best: Dict[int, int] = {}
+        postings = self._postings
+        for found_word, distance in self.words_within(word, max_distance).items():
+            for contact_id in postings[found_word]:
+                if distance < best.get(contact_id, max_distance + 1):
+                    best[contact_id] = distance
+        return best
+
+    def __len__(self) -> int:
+        return len(self._postings)
@@ -0,0 +1,147 @@
+
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+from exceptions import FileOperationError
+
+OP_ADD = 'add'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+
+class Journal:
+    """Журнал изменений телефонной книги (write-ahead log)
+
+    Операции дописываются в файл-спутник <книга>.journal по одной JSON-строке
+    и сбрасываются на диск (fsync) пачками по batch_size операций или явным
+    вызовом flush. Повторное применение журнала идемпотентно.
+    """
+
+    SUFFIX = '.journal'
+
+    def __init__(self, book_path: str, batch_size: int = 100):
+        self.path = book_path + self.SUFFIX
+        self.batch_size = batch_size
+        self._file = None
+        self._pending = 0
+        self._valid_size: Optional[int] = None  # Длина журнала без оборванной записи
+
+    def append(self, op: str, contact_id: int, data: Optional[List[str]] = None) -> None:
+        """Запись операции в журнал"""
+        record = [op, contact_id] if data is None else [op, contact_id, data]
+        try:
+            if self._file is None:
+                if self._valid_size is not None:
+                    os.truncate(self.path, self._valid_size)
+                    self._valid_size = None
+                self._file = open(self.path, 'a', encoding='UTF-8')
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            raise FileOperationError(f"Ошибка записи журнала", self.path) from e
+
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Сброс накопленных операций на диск"""
+        if self._file is None or not self._pending:
+            return
+        self.write_out()
+        self.sync()
+
+    def write_out(self) -> None:
+        """Передача буфера операций операционной системе (без fsync)"""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+        except OSError as e:
+            raise FileOperationError(f"Ошибка записи журнала", self.path) from e
+        self._pending = 0
+
+    def sync(self) -> None:
+        """fsync уже переданных записей; можно вызывать из другого потока"""
+        file = self._file
+        if file is None:
+            return
+        try:
+            os.fsync(file.fileno())
+        except (OSError, ValueError) as e:
+            raise FileOperationError(f"Ошибка записи журнала", self.path) from e
+
+    def replay(self) -> Iterator[Tuple[str, int, Optional[List[str]]]]:
+        """Чтение операций журнала в порядке записи"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+        except OSError as e:
+            raise FileOperationError(f"Ошибка чтения журнала", self.path) from e
+
+        offset = 0
+        while offset < len(content):
+            end = content.find(b'\n', offset)
+            if end == -1:
+                # Оборванная последняя запись после сбоя: пропускаем ее
+                # и отрезаем перед следующей дозаписью
+                self._valid_size = offset
+                break
+            try:
+                record = json.loads(content[offset:end].decode('UTF-8'))
+            except ValueError as e:
+                raise FileOperationError(f"Журнал поврежден (позиция {offset})", self.path) from e
+            offset = end + 1
+            op, contact_id = record[0], record[1]
+            data = record[2] if len(record) > 2 else None
+            yield op, contact_id, data
+
+    def written_size(self) -> int:
+        """Длина журнала в байтах после передачи буфера операций ОС"""
+        self.write_out()
+        if self._file is not None:
+            return os.fstat(self._file.fileno()).st_size
+        if self._valid_size is not None:
+            return self._valid_size
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def discard_head(self, size: int) -> None:
+        """Удаление первых size байт журнала - операций, уже перенесенных в основной файл
+
+        Операции, дописанные после этой позиции, остаются в журнале.
+        """
+        from .file_handler import FileHandler  # file_handler загружен вместе с книгой
+        self.close()
+        try:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, 'rb') as file:
+                file.seek(size)
+                tail = file.read() if self._valid_size is None else file.read(max(0, self._valid_size - size))
+            self._valid_size = None
+            if tail:
+                FileHandler.write_atomic(self.path, [tail], binary=True)
+            else:
+                os.remove(self.path)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка очистки журнала", self.path) from e
+
+    def truncate(self) -> None:
+        """Очистка журнала после переноса изменений в основной файл"""
+        self.close()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            raise FileOperationError(f"Ошибка очистки журнала", self.path) from e
+
+    def close(self) -> None:
+        """Сброс и закрытие файла журнала"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
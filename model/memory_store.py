@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .aho_corasick import AhoCorasick
+from .base import BaseContactStore
+from .contact import Contact
+from .phone_index import normalize_phone
+from .search_key import FIELD_SEPARATOR, SEARCH_FIELDS, SearchKey, fold
+
+
+class ScanContactStore(BaseContactStore):
+    """Операции хранилища перебором строк iter_rows
+
+    Поиск сравнивает строку с поисковыми ключами контактов: ключ берется
+    из кэша книги keys (и кладется туда), а без кэша вычисляется при каждом
+    обходе. Поиск по номеру и сортировка перебирают все строки.
+    """
+
+    def search(self, folded_term: str, ids: Optional[Iterable[int]] = None,
+               keys: Optional[Dict[int, SearchKey]] = None) -> Iterator[Tuple[int, Contact]]:
+        """Пары (ID, контакт), поисковый ключ которых содержит приведенную строку"""
+        for contact_id, text in self._iter_key_texts(ids, keys):
+            if folded_term in text:
+                yield contact_id, self[contact_id]
+
+    def search_many(self, folded_terms: Iterable[str],
+                    keys: Optional[Dict[int, SearchKey]] = None) -> Dict[str, Dict[int, Contact]]:
+        """Поиск по многим строкам за один проход автоматом Ахо-Корасик"""
+        results: Dict[str, Dict[int, Contact]] = {term: {} for term in folded_terms}
+        match_all = results.get('')
+        patterns = [term for term in results if term]
+        if not patterns and match_all is None:
+            return results
+
+        automaton = AhoCorasick(patterns)
+        targets = [results[term] for term in patterns]
+        for contact_id, text in self._iter_key_texts(None, keys):
+            contact = None
+            if match_all is not None:
+                contact = match_all[contact_id] = self[contact_id]
+            hits = automaton.find_all(text)
+            if hits:
+                if contact is None:
+                    contact = self[contact_id]
+                for pattern_no in hits:
+                    targets[pattern_no][contact_id] = contact
+        return results
+
+    def _iter_key_texts(self, ids: Optional[Iterable[int]],
+                        keys: Optional[Dict[int, SearchKey]]) -> Iterator[Tuple[int, str]]:
+        """Пары (ID, текст поискового ключа)"""
+        if keys is None:
+            # Приведение поля за полем и строки целиком совпадает: разделитель не меняется
+            return ((contact_id, fold(FIELD_SEPARATOR.join(fields))) for contact_id, fields in self.iter_rows(ids))
+        return self._iter_cached_key_texts(ids, keys)
+
+    def _iter_cached_key_texts(self, ids: Optional[Iterable[int]],
+                               keys: Dict[int, SearchKey]) -> Iterator[Tuple[int, str]]:
+        for contact_id, fields in self.iter_rows(ids):
+            key = keys.get(contact_id)
+            if key is None:
+                key = keys[contact_id] = SearchKey.from_fields(*fields)
+            yield contact_id, key.text
+
+    def iter_ids(self, start: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID по возрастанию (при reverse - по убыванию) начиная с start включительно
+
+        ID обходятся подряд, поэтому при плотной нумерации первая страница
+        не зависит от размера книги. Когда пропусков набирается столько же,
+        сколько контактов, оставшиеся ID упорядочиваются сортировкой: после
+        массовых удалений время ограничено одним проходом по хранилищу.
+        """
+        step = -1 if reverse else 1
+        if start is None:
+            start = max(self, default=0) if reverse else 1
+        contact_id, misses, limit = start, 0, len(self)
+        while contact_id > 0 and misses <= limit:
+            if contact_id in self:
+                yield contact_id
+            else:
+                misses += 1
+            contact_id += step
+        if contact_id > 0:
+            yield from sorted((cid for cid in self if (cid <= contact_id if reverse else cid >= contact_id)),
+                              reverse=reverse)
+
+    def find_phone(self, digits: str, prefix: bool = False) -> Iterator[Tuple[int, Contact]]:
+        """Контакты с нормализованным номером digits (или начинающимся с него)"""
+        for contact_id, (_, phone, _) in self.iter_rows():
+            normalized = normalize_phone(phone)
+            if normalized.startswith(digits) if prefix else normalized == digits:
+                yield contact_id, self[contact_id]
+
+    def sorted_ids(self, field: str, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[int]:
+        """Упорядочение полным перебором с той же семантикой, что у SortedIndex"""
+        position = SEARCH_FIELDS.index(field)
+        keys = sorted((fields[position].lower(), contact_id) for contact_id, fields in self.iter_rows())
+        low = (start or '').lower()
+        high = None if end is None else end.lower()
+        for value, contact_id in keys:
+            if value < low:
+                continue
+            if high is not None and value[:len(high)] > high:
+                break
+            yield contact_id
+
+    def frozen_rows(self) -> List[Tuple[int, Sequence[str]]]:
+        """Копия строк по возрастанию ID"""
+        rows = self.iter_rows() if self.ordered else self.iter_rows(sorted(self))
+        return list(rows)
+
+    def max_id(self) -> int:
+        return max(self, default=0)
+
+    def save(self) -> None:
+        """Хранилище в памяти: книгу записывает в файл PhoneBook"""
+
+    def close(self) -> None:
+        """Хранилищу в памяти нечего освобождать"""
+
+
+class DictContactStore(dict, ScanContactStore):
+    """Хранилище контактов в словаре ID -> Contact
+
+    Строки выдаются в порядке добавления контактов.
+    """
+
+    def iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) всех контактов или только ids"""
+        if ids is None:
+            return ((cid, (c.name, c.phone, c.comment)) for cid, c in self.items())
+        return ((cid, (c.name, c.phone, c.comment)) for cid, c in ((i, self[i]) for i in ids))
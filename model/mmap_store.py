@@ -0,0 +1,160 @@
+
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from .contact import Contact
+from .memory_store import ScanContactStore
+from exceptions import FileOperationError
+
+# Переводы строк в том же смысле, что и при чтении файла в текстовом режиме
+_NEWLINE = re.compile(rb'\r\n|\r|\n')
+# Пробельные символы ASCII, которые отбрасывает str.strip()
+_ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+# Первые байты UTF-8 последовательностей пробельных символов Unicode (\xa0,   и т.п.)
+_UNICODE_WHITESPACE_LEAD = frozenset((0xC2, 0xE1, 0xE2, 0xE3))
+
+
+class MmapContactStore(Mapping, ScanContactStore):
+    """Хранилище контактов только для чтения поверх отображенного в память файла
+
+    При открытии строится только массив смещений строк; контакт декодируется
+    при каждом обращении. ID контакта - номер строки, как в FileHandler.load.
+    Страницы файла отображаются только для чтения и разделяются между
+    процессами, открывшими тот же файл.
+    """
+
+    ordered = True
+
+    def __init__(self, file_path: str, separator: str = ';'):
+        self.file_path = file_path
+        self.separator = separator
+        self._ids = array('Q')
+        self._starts = array('Q')
+        self._ends = array('Q')
+        self._mmap = None
+
+        try:
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size:
+                    self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as e:
+            raise FileOperationError(f"Файл не найден", file_path) from e
+        except PermissionError as e:
+            raise FileOperationError(f"Нет доступа к файлу", file_path) from e
+        except OSError as e:
+            raise FileOperationError(f"Ошибка при чтении файла", file_path) from e
+
+        if self._mmap is not None:
+            self._build_offsets()
+
+    def _build_offsets(self) -> None:
+        """Построение массивов ID и границ непустых строк"""
+        data = self._mmap
+        ids, starts, ends = self._ids, self._starts, self._ends
+        line_num = 0
+        start = 0
+        size = len(data)
+        for match in _NEWLINE.finditer(data):
+            line_num += 1
+            if self._is_content(start, match.start()):
+                ids.append(line_num)
+                starts.append(start)
+                ends.append(match.start())
+            start = match.end()
+        if start < size and self._is_content(start, size):
+            ids.append(line_num + 1)
+            starts.append(start)
+            ends.append(size)
+
+    def _is_content(self, start: int, end: int) -> bool:
+        """Проверка, что строка не пустая (как line.strip() в текстовом режиме)"""
+        if start == end:
+            return False
+        raw = self._mmap[start:end].strip(_ASCII_WHITESPACE)
+        if not raw:
+            return False
+        if raw[0] in _UNICODE_WHITESPACE_LEAD:
+            return bool(self._decode(raw).strip())
+        return True
+
+    def _decode(self, raw: bytes) -> str:
+        try:
+            return raw.decode('UTF-8')
+        except UnicodeDecodeError as e:
+            raise FileOperationError(f"Ошибка кодировки файла. Используйте UTF-8.", self.file_path) from e
+
+    def _position(self, contact_id: int) -> int:
+        """Позиция ID в массиве смещений или -1"""
+        pos = bisect_left(self._ids, contact_id)
+        if pos < len(self._ids) and self._ids[pos] == contact_id:
+            return pos
+        return -1
+
+    def _contact_at(self, pos: int) -> Contact:
+        line = self._decode(self._mmap[self._starts[pos]:self._ends[pos]]).strip()
+        return Contact.from_list(line.split(self.separator), self._ids[pos])
+
+    def __getitem__(self, contact_id: int) -> Contact:
+        pos = self._position(contact_id)
+        if pos < 0:
+            raise KeyError(contact_id)
+        return self._contact_at(pos)
+
+    def __contains__(self, contact_id: object) -> bool:
+        return isinstance(contact_id, int) and self._position(contact_id) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def values(self) -> ValuesView:
+        return _ValuesView(self)
+
+    def items(self) -> ItemsView:
+        return _ItemsView(self)
+
+    def iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) в порядке строк файла или только ids"""
+        contacts = self._iter_contacts() if ids is None else (self[contact_id] for contact_id in ids)
+        return ((contact.id, (contact.name, contact.phone, contact.comment)) for contact in contacts)
+
+    def iter_ids(self, start: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID по возрастанию (при reverse - по убыванию) начиная с start включительно, двоичным поиском"""
+        ids = self._ids
+        if reverse:
+            end = len(ids) if start is None else bisect_right(ids, start)
+            return (ids[pos] for pos in range(end - 1, -1, -1))
+        return (ids[pos] for pos in range(0 if start is None else bisect_left(ids, start), len(ids)))
+
+    def max_id(self) -> int:
+        return self._ids[-1] if self._ids else 0
+
+    def _iter_contacts(self) -> Iterator[Contact]:
+        """Последовательное декодирование всех контактов без поиска по ID"""
+        return (self._contact_at(pos) for pos in range(len(self._ids)))
+
+    def copy(self) -> Dict[int, Contact]:
+        """Декодированная копия всех контактов"""
+        return dict(self.items())
+
+    def close(self) -> None:
+        """Освобождение отображения файла"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self) -> Iterator[Contact]:
+        return self._mapping._iter_contacts()
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self) -> Iterator:
+        return ((contact.id, contact) for contact in self._mapping._iter_contacts())
@@ -0,0 +1,85 @@
+
+from typing import Dict, Iterable, Optional, Set
+from .base import BaseIndex
+from .contact import Contact
+from .search_key import fold
+
+
+class NGramIndex(BaseIndex):
+    """Инвертированный индекс n-грамм для поиска по подстроке
+
+    Для каждой n-граммы хранится множество ID контактов, в полях которых
+    она встречается. Поиск пересекает множества n-грамм запроса и возвращает
+    кандидатов, которые затем проверяются обычным сравнением подстрок.
+    """
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _grams(self, values: Iterable[str]) -> Set[str]:
+        """Множество n-грамм набора строк (в виде для поиска, см. fold)"""
+        n = self.n
+        grams = set()
+        for value in values:
+            value = fold(value)
+            grams.update(value[i:i + n] for i in range(len(value) - n + 1))
+        return grams
+
+    def add(self, contact_id: int, contact: Contact) -> None:
+        """Добавление контакта в индекс"""
+        postings = self._postings
+        for gram in self._grams((contact.name, contact.phone, contact.comment)):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {contact_id}
+            else:
+                ids.add(contact_id)
+
+    def remove(self, contact_id: int, contact: Contact) -> None:
+        """Удаление контакта из индекса"""
+        postings = self._postings
+        for gram in self._grams((contact.name, contact.phone, contact.comment)):
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(contact_id)
+                if not ids:
+                    del postings[gram]
+
+    def clear(self) -> None:
+        """Очистка индекса"""
+        self._postings.clear()
+
+    @property
+    def postings(self) -> Dict[str, Set[int]]:
+        """Списки ID по n-граммам (для сериализации)"""
+        return self._postings
+
+    def restore(self, postings: Dict[str, Set[int]]) -> None:
+        """Восстановление индекса из сохраненных списков"""
+        self._postings = postings
+
+    def candidates(self, folded_term: str) -> Optional[Set[int]]:
+        """ID контактов, которые могут содержать строку поиска
+
+        Возвращает None, если запрос короче n и индекс не может сузить поиск.
+        """
+        if len(folded_term) < self.n:
+            return None
+
+        grams = self._grams((folded_term,))
+        postings = []
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+
+        # Пересекаем, начиная с самого короткого списка
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
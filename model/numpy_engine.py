@@ -0,0 +1,84 @@
+from typing import Dict, List, TYPE_CHECKING
+from .phone_index import normalize_phone, normalize_phone_prefix
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость
+    np = None
+
+if TYPE_CHECKING:
+    from .phonebook import PhoneBook
+
+HAS_NUMPY = np is not None
+
+
+class NumpyEngine:
+    """Пакетные операции над всей книгой на массивах NumPy
+
+    Столбцы книги выгружаются один раз: ID - int64, нормализованные номера -
+    байтовые строки фиксированной ширины, комментарии - коды категорий.
+    Все операции возвращают ID контактов. Движок работает со снимком
+    книги: после ее изменения нужно вызвать refresh().
+    """
+
+    def __init__(self, phonebook: 'PhoneBook'):
+        if np is None:
+            raise ImportError("Для NumpyEngine требуется пакет numpy")
+        self._phonebook = phonebook
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Повторная выгрузка столбцов книги в массивы"""
+        ids: List[int] = []
+        phones: List[bytes] = []
+        codes: List[int] = []
+        categories: Dict[str, int] = {}
+        for contact_id, (_, phone, comment) in self._phonebook._iter_rows():
+            ids.append(contact_id)
+            phones.append(normalize_phone(phone).encode('ascii'))
+            code = categories.get(comment)
+            if code is None:
+                code = categories[comment] = len(categories)
+            codes.append(code)
+
+        width = max(map(len, phones), default=0) or 1
+        self.ids = np.array(ids, dtype=np.int64)
+        self.phones = np.array(phones, dtype=f'S{width}')
+        self.comment_codes = np.array(codes, dtype=np.int32)
+        self.comments: List[str] = list(categories)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def duplicate_phones(self) -> Dict[str, List[int]]:
+        """Группы ID контактов с одинаковым нормализованным номером"""
+        if not len(self.ids):
+            return {}
+        order = np.argsort(self.phones, kind='stable')
+        phones = self.phones[order]
+        boundaries = np.flatnonzero(phones[1:] != phones[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(phones)]))
+        repeated = ends - starts > 1
+
+        groups = {}
+        for start, end in zip(starts[repeated].tolist(), ends[repeated].tolist()):
+            phone = phones[start]
+            if phone:  # Контакты без номера дубликатами не считаются
+                groups[phone.decode('ascii')] = np.sort(self.ids[order[start:end]]).tolist()
+        return groups
+
+    def comment_counts(self) -> Dict[str, int]:
+        """Число контактов для каждого значения комментария"""
+        counts = np.bincount(self.comment_codes, minlength=len(self.comments))
+        return {comment: int(count) for comment, count in zip(self.comments, counts.tolist()) if count}
+
+    def find_by_phone_prefix(self, prefix: str) -> List[int]:
+        """ID контактов, нормализованный номер которых начинается с префикса"""
+        digits = normalize_phone_prefix(prefix).encode('ascii')
+        width = self.phones.dtype.itemsize
+        if not digits or len(digits) > width:
+            return []
+        table = self.phones.view(np.uint8).reshape(len(self.phones), width)
+        mask = (table[:, :len(digits)] == np.frombuffer(digits, dtype=np.uint8)).all(axis=1)
+        return self.ids[mask].tolist()
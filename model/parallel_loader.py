@@ -0,0 +1,79 @@
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+# Переводы строк в том же смысле, что и при чтении файла в текстовом режиме
+_NEWLINE = re.compile(r'\r\n|\r|\n')
+# Файлы меньше этого размера выгоднее разобрать в одном процессе
+MIN_PARALLEL_SIZE = 4 << 20
+# Число диапазонов на один процесс: выравнивает нагрузку между процессами
+RANGES_PER_WORKER = 4
+
+
+def split_ranges(file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """Разбиение файла на диапазоны байт, границы которых стоят сразу после '\\n'
+
+    Граница после '\\n' не разрезает ни символ UTF-8, ни пару '\\r\\n'.
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            position = max(size * i // parts, bounds[-1])
+            if position >= size:
+                break
+            file.seek(position)
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def parse_range(file_path: str, start: int, end: int,
+                separator: str) -> Tuple[int, List[Tuple[int, List[str]]]]:
+    """Разбор диапазона файла в отдельном процессе
+
+    Возвращает число строк в диапазоне и непустые записи с номерами строк,
+    отсчитываемыми от начала диапазона (с 1).
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('UTF-8')
+
+    lines = _NEWLINE.split(text)
+    if lines and lines[-1] == '':
+        # Диапазон заканчивается переводом строки - пустой хвост не строка
+        lines.pop()
+
+    records = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            records.append((line_num, line.split(separator)))
+    return len(lines), records
+
+
+def iter_records_parallel(file_path: str, separator: str,
+                          workers: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+    """Пары (номер строки, поля) по всему файлу, разобранному в нескольких процессах
+
+    Номера строк совпадают с FileHandler.iter_records: каждый диапазон
+    сообщает число своих строк, и номера сдвигаются на сумму предыдущих.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(file_path, workers * RANGES_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_range, file_path, start, end, separator)
+                   for start, end in ranges]
+        line_offset = 0
+        for future in futures:
+            line_count, records = future.result()
+            for line_num, fields in records:
+                yield line_offset + line_num, fields
+            line_offset += line_count
@@ -0,0 +1,131 @@
+
+import re
+from typing import Dict, Optional, Set
+from .base import BaseIndex
+from .contact import Contact
+
+_NON_DIGITS = re.compile(r'[^0-9]')
+
+
+def normalize_phone(phone: str) -> str:
+    """Приведение номера телефона к последовательности цифр
+
+    Все символы, кроме цифр, отбрасываются. Российские номера приводятся
+    к виду с кодом страны 7: "8 (981) 156-32-13" и "9811563213" дают
+    "79811563213". Номер, начинающийся с "+", считается полным.
+    """
+    digits = _NON_DIGITS.sub('', phone)
+    if phone.lstrip().startswith('+'):
+        return digits
+    if len(digits) == 11 and digits[0] == '8':
+        return '7' + digits[1:]
+    if len(digits) == 10:
+        return '7' + digits
+    return digits
+
+
+def normalize_phone_prefix(prefix: str) -> str:
+    """Приведение начала номера к виду, сравнимому с normalize_phone
+
+    Ведущая "8" без "+" - выход на междугороднюю связь, она заменяется на
+    код страны 7 при любой длине префикса: "8 (981) 156" дает "7981156"
+    и находит номера, записанные как "+7 981 ...". Остальные префиксы
+    нормализуются как полный номер.
+    """
+    digits = _NON_DIGITS.sub('', prefix)
+    if digits[:1] == '8' and len(digits) <= 11 and not prefix.lstrip().startswith('+'):
+        return '7' + digits[1:]
+    return normalize_phone(prefix)
+
+
+class _TrieNode:
+    """Узел префиксного дерева"""
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.ids: Optional[Set[int]] = None
+
+
+class PhoneTrie(BaseIndex):
+    """Префиксное дерево по нормализованным цифрам телефонов
+
+    Точный поиск и поиск по префиксу проходят по дереву за время,
+    пропорциональное длине номера (плюс размер результата).
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, contact_id: int, contact: Contact) -> None:
+        """Добавление контакта в индекс"""
+        digits = normalize_phone(contact.phone)
+        if not digits:
+            return
+        node = self._root
+        for digit in digits:
+            child = node.children.get(digit)
+            if child is None:
+                child = node.children[digit] = _TrieNode()
+            node = child
+        if node.ids is None:
+            node.ids = set()
+        node.ids.add(contact_id)
+
+    def remove(self, contact_id: int, contact: Contact) -> None:
+        """Удаление контакта из индекса"""
+        digits = normalize_phone(contact.phone)
+        if not digits:
+            return
+        path = [self._root]
+        for digit in digits:
+            node = path[-1].children.get(digit)
+            if node is None:
+                return
+            path.append(node)
+
+        node = path[-1]
+        if node.ids is not None:
+            node.ids.discard(contact_id)
+            if not node.ids:
+                node.ids = None
+
+        # Удаляем опустевшие ветви снизу вверх
+        for i in range(len(digits), 0, -1):
+            node = path[i]
+            if node.ids is not None or node.children:
+                break
+            del path[i - 1].children[digits[i - 1]]
+
+    def clear(self) -> None:
+        """Очистка индекса"""
+        self._root = _TrieNode()
+
+    def _find_node(self, digits: str) -> Optional[_TrieNode]:
+        node = self._root
+        for digit in digits:
+            node = node.children.get(digit)
+            if node is None:
+                return None
+        return node
+
+    def find(self, digits: str) -> Set[int]:
+        """ID контактов с точно таким нормализованным номером"""
+        node = self._find_node(digits)
+        if node is None or node.ids is None:
+            return set()
+        return set(node.ids)
+
+    def find_prefix(self, digits: str) -> Set[int]:
+        """ID контактов, нормализованный номер которых начинается с digits"""
+        node = self._find_node(digits)
+        result: Set[int] = set()
+        if node is None:
+            return result
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.ids:
+                result.update(node.ids)
+            stack.extend(node.children.values())
+        return result
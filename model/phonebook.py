@@ -1,62 +1,388 @@
 
-from typing import Dict, List, Optional, Iterator
+import heapq
+from functools import partial
+from itertools import islice
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Callable, Dict, NamedTuple, Iterable, List, Mapping, Optional, Iterator,
+                    Sequence, Tuple, Union)
+from .base import BaseContactStore, BaseIndex
+from .columnar_store import ColumnarContactStore
 from .contact import Contact
-from .file_handler import FileHandler
-from exceptions import ContactNotFoundError
+from .file_handler import FileHandler, FORMAT_SNAPSHOT, FORMAT_SQLITE, FORMAT_TEXT, same_file
+from .fuzzy_index import FuzzyIndex, edit_distance, name_tokens
+from .journal import Journal, OP_ADD, OP_UPDATE, OP_DELETE
+from .memory_store import DictContactStore
+from .mmap_store import MmapContactStore
+from .ngram_index import NGramIndex
+from .phone_index import PhoneTrie, normalize_phone, normalize_phone_prefix
+from .search_key import FIELD_SEPARATOR, SearchKey, fold
+from .snapshot import SnapshotData, read_snapshot
+from .sorted_index import SortedIndex
+from .sqlite_store import SQLiteContactStore
+from exceptions import ContactNotFoundError, ReadOnlyError
+import metrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+OPEN_MODES = ('text', 'mmap', 'sqlite')
+STORAGE_TYPES = ('dict', 'columnar')
+SORTED_FIELDS = ('name', 'phone')
+MERGE_STRATEGIES = ('first', 'last', 'longest')
+FILE_FORMATS = (FORMAT_TEXT, FORMAT_SNAPSHOT, FORMAT_SQLITE)
+
+
+class _BookState(NamedTuple):
+    """Загруженное содержимое книги, готовое к подключению"""
+    file_path: str
+    file_format: str
+    contacts: BaseContactStore
+    journal: Optional[Journal]
+    indexes: Dict[str, BaseIndex]
+    read_only: bool
+    last_id: int
 
 
 class PhoneBook:
     """Класс для управления телефонной книгой"""
 
-    def __init__(self):
-        self._contacts: Dict[int, Contact] = {}
+    def __init__(self, ngram_index: bool = False, phone_index: bool = False, reuse_ids: bool = False,
+                 journal: bool = False, storage: str = 'dict', sorted_index: bool = False,
+                 fuzzy_index: bool = False, search_key_cache: Optional[bool] = None):
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Неизвестный тип хранилища: {storage}")
+        self._storage = storage
+        # Кэш ключей держит копию всех полей в памяти: по умолчанию он включен
+        # только для словаря, колоночное хранилище экономит память без него
+        self._cache_search_keys = storage == 'dict' if search_key_cache is None else search_key_cache
+        self._contacts: BaseContactStore = self._new_store()
+        self._last_id = 0  # Наибольший выданный ID
+        self._reuse_ids = reuse_ids
+        self._free_ids: List[int] = []  # Куча освобожденных ID для режима reuse_ids
         self._file_handler = FileHandler()
         self._is_open = False
+        self._read_only = False
         self._file_path: Optional[str] = None
+        self._file_format = FORMAT_TEXT
+        self._use_journal = journal
+        self._journal: Optional[Journal] = None
+        # Фабрики включенных индексов: при открытии файла индексы строятся заново
+        self._index_factories: Dict[str, Callable[[], BaseIndex]] = {}
+        if ngram_index:
+            self._index_factories['ngram'] = NGramIndex
+        if phone_index:
+            self._index_factories['phone'] = PhoneTrie
+        if sorted_index:
+            for field in SORTED_FIELDS:
+                self._index_factories[f'sorted_{field}'] = partial(SortedIndex, field)
+        if fuzzy_index:
+            self._index_factories['fuzzy'] = FuzzyIndex
+        self._indexes: List[BaseIndex] = []
+        self._ngram_index: Optional[NGramIndex] = None
+        self._phone_index: Optional[PhoneTrie] = None
+        self._sorted_indexes: Dict[str, SortedIndex] = {}
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        # Поисковые ключи контактов: вычисляются при первом поиске,
+        # сбрасываются при изменении полей в update_contact и при удалении.
+        # Без кэша (см. _key_cache) ключи вычисляются при каждом поиске
+        self._search_keys: Dict[int, SearchKey] = {}
+        self._set_indexes(self._create_indexes())
 
     @property
     def is_open(self) -> bool:
         """Проверка, открыта ли телефонная книга"""
         return self._is_open
 
+    @property
+    def read_only(self) -> bool:
+        """Проверка, открыта ли телефонная книга только для чтения"""
+        return self._read_only
+
     @property
     def file_path(self) -> Optional[str]:
         """Получение пути к файлу"""
         return self._file_path
 
-    def open(self, file_path: str) -> bool:
-        """Открытие телефонной книги из файла"""
+    def open(self, file_path: str, streaming: bool = False, mode: str = 'text',
+             workers: Optional[int] = None) -> bool:
+        """Открытие телефонной книги из файла
+
+        При streaming=True контакты создаются прямо по ходу чтения файла,
+        без промежуточного словаря со списками полей.
+        В режиме журнала после загрузки применяются операции из журнала.
+        Режим mode='mmap' открывает книгу только для чтения: файл отображается
+        в память, а контакты декодируются при обращении к ним.
+        Режим mode='sqlite' открывает (или создает) базу SQLite: контакты
+        остаются в базе, поиск идет по ее индексам, а изменения пишутся в
+        нее сразу. Базу SQLite можно открыть и без mode='sqlite'.
+        Формат файла (текст, бинарный снимок или база SQLite) определяется по заголовку.
+        При заданном workers текстовый файл разбирается в пуле из workers
+        процессов (0 - по числу ядер); ID совпадают с обычной загрузкой.
+        """
         try:
-            contacts_dict = self._file_handler.load(file_path)
-            self._contacts = {}
-            for contact_id, contact_data in contacts_dict.items():
-                self._contacts[contact_id] = Contact.from_list(contact_data, contact_id)
-            self._is_open = True
-            self._file_path = file_path
+            self._apply_state(self._load_state(file_path, streaming, mode, workers))
+            return True
+        except Exception as e:
+            self._is_open = False
+            raise e
+
+    async def aopen(self, file_path: str, streaming: bool = False, mode: str = 'text',
+                    workers: Optional[int] = None, executor: Optional['Executor'] = None) -> bool:
+        """Асинхронное открытие: чтение, разбор и построение индексов идут в executor
+
+        По умолчанию используется пул потоков цикла событий. Текущее
+        содержимое книги заменяется только после полной загрузки файла.
+        """
+        import asyncio  # Уже загружен, раз вызывается корутина
+        loop = asyncio.get_running_loop()
+        try:
+            state = await loop.run_in_executor(executor, self._load_state, file_path, streaming, mode, workers)
+            self._apply_state(state)
             return True
         except Exception as e:
             self._is_open = False
             raise e
 
-    def save(self, file_path: Optional[str] = None) -> None:
-        """Сохранение телефонной книги в файл"""
+    @metrics.timed('phonebook.open')
+    def _load_state(self, file_path: str, streaming: bool, mode: str,
+                    workers: Optional[int] = None) -> _BookState:
+        """Загрузка файла и построение индексов без изменения текущей книги"""
+        if mode not in OPEN_MODES:
+            raise ValueError(f"Неизвестный режим открытия: {mode}")
+        if mode == 'mmap' and self._use_journal:
+            raise ValueError("Режим mmap не поддерживает журнал изменений")
+
+        file_format = self._file_handler.detect_format(file_path)
+        if mode == 'sqlite' or file_format == FORMAT_SQLITE:
+            return self._load_sqlite_state(file_path, mode)
+        snapshot = None
+        if file_format == FORMAT_SNAPSHOT:
+            snapshot = read_snapshot(file_path, use_mmap=mode == 'mmap')
+            contacts = self._store_from_snapshot(snapshot)
+        elif mode == 'mmap':
+            contacts = MmapContactStore(file_path, self._file_handler.separator)
+        elif self._storage == 'columnar':
+            contacts = ColumnarContactStore()
+            for contact_id, contact_data in self._iter_text_records(file_path, workers):
+                contacts.put_fields(contact_id, contact_data)
+        elif streaming or workers is not None:
+            contacts = DictContactStore((contact_id, Contact.from_list(contact_data, contact_id))
+                                        for contact_id, contact_data in self._iter_text_records(file_path, workers))
+        else:
+            contacts_dict = self._file_handler.load(file_path)
+            contacts = DictContactStore()
+            for contact_id, contact_data in contacts_dict.items():
+                contacts[contact_id] = Contact.from_list(contact_data, contact_id)
+
+        journal = None
+        replayed = False
+        if self._use_journal:
+            journal = Journal(file_path)
+            with metrics.timer('phonebook.replay_journal'):
+                for op, contact_id, contact_data in journal.replay():
+                    replayed = True
+                    if op == OP_DELETE:
+                        contacts.pop(contact_id, None)
+                    else:
+                        contacts[contact_id] = Contact.from_list(contact_data, contact_id)
+
+        indexes = self._create_indexes()
+        restored = None
+        if snapshot is not None and not replayed and self._restore_ngram_index(indexes.get('ngram'), snapshot):
+            restored = indexes['ngram']
+        with metrics.timer('phonebook.build_indexes'):
+            for index in indexes.values():
+                if index is not restored:
+                    for contact_id, contact in contacts.items():
+                        index.add(contact_id, contact)
+
+        return _BookState(file_path, file_format, contacts, journal, indexes,
+                          mode == 'mmap', contacts.max_id())
+
+    def _load_sqlite_state(self, file_path: str, mode: str) -> _BookState:
+        """Подключение базы SQLite: контакты не загружаются, индексы в памяти не строятся"""
+        if mode == 'mmap':
+            raise ValueError("Режим mmap не поддерживает базы SQLite")
+        if self._use_journal:
+            raise ValueError("Хранилище SQLite не поддерживает журнал изменений")
+        if self._index_factories:
+            raise ValueError("Для базы SQLite используются ее индексы, индексы в памяти не поддерживаются")
+        contacts = SQLiteContactStore(file_path)
+        return _BookState(file_path, FORMAT_SQLITE, contacts, None, {}, False, contacts.max_id())
+
+    def _apply_state(self, state: _BookState) -> None:
+        """Подмена содержимого книги загруженным состоянием"""
+        self.close()
+        self._journal = state.journal
+        self._contacts = state.contacts
+        self._read_only = state.read_only
+        self._last_id = state.last_id
+        self._free_ids = []
+        self._set_indexes(state.indexes)
+        self._is_open = True
+        self._file_path = state.file_path
+        self._file_format = state.file_format
+
+    def _iter_text_records(self, file_path: str, workers: Optional[int]) -> Iterator[Tuple[int, List[str]]]:
+        """Записи текстового файла: потоком или через пул процессов"""
+        if workers is None:
+            return self._file_handler.iter_records(file_path)
+        return self._file_handler.iter_records_parallel(file_path, workers or None)
+
+    def iter_file(self, file_path: str) -> Iterator[Contact]:
+        """Потоковое чтение контактов из файла без загрузки в книгу"""
+        for contact_id, contact_data in self._file_handler.iter_records(file_path):
+            yield Contact.from_list(contact_data, contact_id)
+
+    @metrics.timed('phonebook.save')
+    def save(self, file_path: Optional[str] = None, format: Optional[str] = None, keep_ids: bool = False) -> None:
+        """Сохранение телефонной книги в файл
+
+        format: 'text', 'snapshot' (бинарный снимок) или 'sqlite' (база
+        SQLite). По умолчанию книга сохраняется в формате открытого файла,
+        а в новый файл - текстом. Книга, открытая из базы SQLite, хранит
+        изменения в ней, и save() в этот же файл только фиксирует их.
+        С keep_ids=True текстовый файл сохраняет ID контактов (номера строк):
+        на месте отсутствующих ID остаются пустые строки.
+        """
+        save_path, format = self._resolve_save_target(file_path, format)
+
+        if self._contacts.persistent and save_path == self._file_path:
+            # Изменения уже в файле хранилища, остается зафиксировать последний пакет
+            if format != self._file_format:
+                raise ValueError("Хранилище нельзя сохранить в другом формате в собственный файл")
+            self._contacts.save()
+            return
+
+        if self._journal is not None and save_path == self._file_path:
+            if format == self._file_format:
+                # Изменения уже записаны в журнал, достаточно сбросить его на диск
+                self._journal.flush()
+            else:
+                self._file_format = format
+                self.compact()
+            return
+
+        self._write_file(save_path, format, keep_ids)
+        if save_path == self._file_path:
+            self._file_format = format
+
+    @metrics.timed('phonebook.asave')
+    async def asave(self, file_path: Optional[str] = None, format: Optional[str] = None,
+                    executor: Optional['Executor'] = None) -> None:
+        """Асинхронное сохранение: запись файла идет в executor
+
+        Перед записью снимается копия полей контактов, поэтому книгу можно
+        изменять, пока сохранение не завершено. Индекс n-грамм в снимок
+        при этом не пишется и будет построен при открытии.
+        Книга в базе SQLite сохраняется синхронно: копия всех строк
+        свела бы на нет хранение контактов вне памяти.
+        """
+        import asyncio  # Уже загружен, раз вызывается корутина
+        save_path, format = self._resolve_save_target(file_path, format)
+        loop = asyncio.get_running_loop()
+
+        if self._contacts.persistent:
+            self.save(save_path, format)
+            return
+
+        if self._journal is not None and save_path == self._file_path:
+            if format != self._file_format:
+                # Смена формата с журналом требует сжатия, выполняем синхронно
+                self.save(save_path, format)
+                return
+            self._journal.write_out()
+            await loop.run_in_executor(executor, self._journal.sync)
+            return
+
+        rows = self._capture_rows()
+        await loop.run_in_executor(executor, self._write_rows, save_path, format, rows)
+        if save_path == self._file_path:
+            self._file_format = format
+
+    def _resolve_save_target(self, file_path: Optional[str], format: Optional[str]) -> Tuple[str, str]:
+        """Путь и формат для сохранения с проверкой состояния книги"""
         if not self._is_open:
             raise ValueError("Телефонная книга не открыта")
 
         save_path = file_path or self._file_path
         if not save_path:
             raise ValueError("Не указан путь для сохранения")
+        if self._file_path and save_path != self._file_path and same_file(save_path, self._file_path):
+            # Другая запись пути к открытому файлу: сохраняем как в собственный файл
+            save_path = self._file_path
+
+        if format is None:
+            format = self._file_format if save_path == self._file_path else FORMAT_TEXT
+        if format not in FILE_FORMATS:
+            raise ValueError(f"Неизвестный формат файла: {format}")
+        return save_path, format
+
+    def _capture_rows(self) -> Iterable[Tuple[int, Sequence[str]]]:
+        """Неизменяемая копия полей контактов для фонового сохранения"""
+        return self._contacts.frozen_rows()
+
+    def compact(self) -> None:
+        """Перенос журнала в основной файл и очистка журнала
+
+        Файл перезаписывается атомарно с сохранением ID (номеров строк),
+        поэтому повторное применение журнала после сбоя безопасно.
+        """
+        if self._journal is None:
+            raise ValueError("Журнал не используется")
+        self._check_writable()
+
+        self._write_file(self._file_path, self._file_format, keep_ids=True)
+        self._journal.truncate()
+
+    def _write_file(self, save_path: str, format: str, keep_ids: bool = False) -> None:
+        """Запись всех контактов в файл заданного формата"""
+        ordered = self._contacts.ordered  # Строки выдаются по порядку ID без сортировки
+        if format != FORMAT_TEXT or ordered:
+            ids = None if ordered else sorted(self._contacts)
+            self._write_rows(save_path, format, self._iter_rows(ids), keep_ids, with_index=True)
+        else:
+            contacts_dict = {cid: contact.to_list() for cid, contact in self._contacts.items()}
+            if keep_ids:
+                self._file_handler.save(save_path, contacts_dict, keep_ids=True)
+            else:
+                self._file_handler.save(save_path, contacts_dict)
 
-        contacts_dict = {cid: contact.to_list() for cid, contact in self._contacts.items()}
-        self._file_handler.save(save_path, contacts_dict)
+    def _write_rows(self, save_path: str, format: str, rows: Iterable[Tuple[int, Sequence[str]]],
+                    keep_ids: bool = False, with_index: bool = False) -> None:
+        """Запись пар (ID, поля), упорядоченных по ID, в файл заданного формата"""
+        if format == FORMAT_SNAPSHOT:
+            # Снимок всегда хранит ID явно
+            index = {}
+            if with_index and self._ngram_index is not None:
+                index = {'ngram_n': self._ngram_index.n, 'ngram_postings': self._ngram_index.postings}
+            self._file_handler.save_snapshot(save_path, rows, **index)
+        elif format == FORMAT_SQLITE:
+            SQLiteContactStore.write_rows(save_path, rows)
+        else:
+            self._file_handler.save_rows(save_path, rows, keep_ids=keep_ids)
 
+    def close(self) -> None:
+        """Сброс и закрытие журнала, освобождение файла хранилища"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._contacts.close()
+
+    @metrics.timed('phonebook.add_contact')
     def add_contact(self, contact: Contact) -> int:
         """Добавление нового контакта"""
-        new_id = self._get_next_id()
-        contact.id = new_id
-        self._contacts[new_id] = contact
+        self._check_writable()
+        new_id = self._allocate_id()
+        self._insert_contact(new_id, contact)
+        if self._journal is not None:
+            self._journal.append(OP_ADD, new_id, contact.to_list())
         return new_id
 
+    def add_contacts(self, contacts: Iterable[Contact]) -> List[int]:
+        """Пакетное добавление контактов, возвращает назначенные ID"""
+        return [self.add_contact(contact) for contact in contacts]
+
     def get_contact(self, contact_id: int) -> Contact:
         """Получение контакта по ID"""
         if contact_id not in self._contacts:
@@ -64,40 +390,263 @@ class PhoneBook:
         return self._contacts[contact_id]
 
     def get_all_contacts(self) -> Dict[int, Contact]:
-        """Получение всех контактов"""
+        """Получение копии всех контактов"""
         return self._contacts.copy()
 
-    def find_contacts(self, search_term: str) -> Dict[int, Contact]:
-        """Поиск контактов по всем полям"""
-        result = {}
-        search_term_lower = search_term.lower()
+    def view(self) -> Mapping[int, Contact]:
+        """Представление всех контактов только для чтения, без копирования
+
+        Представление отражает последующие изменения книги.
+        """
+        return MappingProxyType(self._contacts)
+
+    def iter_ids(self, start_id: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID контактов по возрастанию (или убыванию) начиная с start_id включительно
+
+        Порядок дает хранилище без сортировки всей книги (база SQLite -
+        запросом по первичному ключу), поэтому первая страница строится за
+        время, не зависящее ни от размера книги, ни от пропусков в нумерации.
+        """
+        return self._contacts.iter_ids(start_id, reverse)
+
+    def get_page(self, start_id: Optional[int] = None, size: int = 20,
+                 reverse: bool = False) -> List[Tuple[int, Contact]]:
+        """Страница контактов в порядке возрастания ID
+
+        При reverse=True берутся size контактов с ID не больше start_id
+        (предыдущая страница); результат все равно упорядочен по возрастанию.
+        """
+        ids = list(islice(self.iter_ids(start_id, reverse), size))
+        if reverse:
+            ids.reverse()
+        return [(contact_id, self._contacts[contact_id]) for contact_id in ids]
+
+    def list_sorted(self, by: str = 'name', start: Optional[str] = None, end: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[Tuple[int, Contact]]:
+        """Контакты по алфавиту значения поля by ('name' или 'phone')
+
+        start - нижняя граница значения, end - верхняя граница, включающая все
+        значения, которые с нее начинаются: start='Ив', end='Ик' дает имена
+        от "Ив" до "Ик..." включительно. Регистр не учитывается.
+        С sorted_index=True используется поддерживаемый индекс, иначе
+        упорядочивает хранилище: база SQLite - по своему индексу, хранилища
+        в памяти - сортировкой при каждом вызове.
+        """
+        if by not in SORTED_FIELDS:
+            raise ValueError(f"Сортировка возможна только по полям: {', '.join(SORTED_FIELDS)}")
+
+        index = self._sorted_indexes.get(by)
+        if index is not None:
+            ids = index.iter_ids(start, end)
+        else:
+            ids = self._contacts.sorted_ids(by, start, end)
+        return [(contact_id, self._contacts[contact_id]) for contact_id in islice(ids, limit)]
+
+    @metrics.timed('phonebook.find_contacts')
+    def find_contacts(self, search_term: str,
+                      lazy: bool = False) -> Union[Dict[int, Contact], Iterator[Tuple[int, Contact]]]:
+        """Поиск контактов по всем полям
+
+        При lazy=True возвращается итератор пар (ID, контакт) без построения
+        словаря результатов; книгу нельзя изменять, пока итератор не исчерпан
+        (метрика phonebook.find_contacts учитывает тогда только создание итератора).
+        """
+        matches = self._iter_matches(search_term)
+        if lazy:
+            return matches
+        found = dict(matches)
+        metrics.increment('phonebook.find_contacts.results', len(found))
+        return found
+
+    def _iter_matches(self, search_term: str) -> Iterator[Tuple[int, Contact]]:
+        """Пары (ID, контакт), поля которых содержат строку поиска"""
+        folded_term = fold(search_term)
+        if FIELD_SEPARATOR in folded_term:
+            return iter(())
+
+        ids = None
+        if self._ngram_index is not None:
+            candidates = self._ngram_index.candidates(folded_term)
+            if candidates is not None:
+                ids = sorted(candidates)
+        return self._contacts.search(folded_term, ids, self._key_cache())
+
+    def _key_cache(self) -> Optional[Dict[int, SearchKey]]:
+        """Кэш поисковых ключей или None, если ключи не кэшируются
+
+        В режиме mmap кэш не ведется никогда: он превратил бы отображенный
+        файл в копию всех контактов в памяти.
+        """
+        if self._cache_search_keys and not self._read_only:
+            return self._search_keys
+        return None
+
+    @metrics.timed('phonebook.find_contacts_many')
+    def find_contacts_many(self, search_terms: Iterable[str]) -> Dict[str, Dict[int, Contact]]:
+        """Поиск по многим строкам за один проход по книге
+
+        Результат для каждой строки совпадает с find_contacts(строка).
+        Хранилище в памяти ищет все строки одновременно автоматом
+        Ахо-Корасик по поисковым ключам контактов, общим с find_contacts.
+        """
+        folded_terms = {term: fold(term) for term in search_terms}
+        found = self._contacts.search_many(
+            list(dict.fromkeys(folded for folded in folded_terms.values() if FIELD_SEPARATOR not in folded)),
+            self._key_cache())
+        results: Dict[str, Dict[int, Contact]] = {}
+        issued: Dict[str, Dict[int, Contact]] = {}
+        for term, folded_term in folded_terms.items():
+            if folded_term in found:
+                results[term] = issued[folded_term] = found.pop(folded_term)
+            elif folded_term in issued:
+                # Строки, совпавшие после приведения, получают отдельные словари
+                results[term] = dict(issued[folded_term])
+            else:
+                results[term] = {}
+        return results
+
+    @metrics.timed('phonebook.fuzzy_find')
+    def fuzzy_find(self, search_term: str, max_distance: int = 2) -> Dict[int, Contact]:
+        """Поиск по имени с опечатками
+
+        Каждое слово запроса должно отличаться от какого-либо слова имени не
+        больше чем на max_distance правок (расстояние Левенштейна, без учета
+        регистра и ё/е). Контакты упорядочены по сумме расстояний, затем по ID.
+        С fuzzy_index=True кандидаты берутся из индекса, иначе проверяются
+        все контакты.
+        """
+        if max_distance < 0:
+            raise ValueError("Расстояние не может быть отрицательным")
+        words = name_tokens(search_term)
+        if not words:
+            return {}
+
+        index = self._fuzzy_index
+        if index is not None and max_distance <= index.max_distance:
+            scores: Optional[Dict[int, int]] = None
+            for word in words:
+                found = index.search(word, max_distance)
+                if scores is not None:
+                    found = {cid: scores[cid] + distance for cid, distance in found.items() if cid in scores}
+                scores = found
+                if not scores:
+                    return {}
+        else:
+            scores = self._fuzzy_scan(words, max_distance)
 
-        for contact_id, contact in self._contacts.items():
-            if (search_term_lower in contact.name.lower() or
-                    search_term_lower in contact.phone.lower() or
-                    search_term_lower in contact.comment.lower()):
-                result[contact_id] = contact
+        ranked = sorted(scores, key=lambda cid: (scores[cid], cid))
+        return {cid: self._contacts[cid] for cid in ranked}
 
-        return result
+    def _fuzzy_scan(self, words: List[str], max_distance: int) -> Dict[int, int]:
+        """Суммы расстояний для fuzzy_find полным перебором контактов"""
+        scores = {}
+        for contact_id, (name, _, _) in self._iter_rows():
+            tokens = name_tokens(name)
+            total = 0
+            for word in words:
+                distance = min((edit_distance(word, token, max_distance) for token in tokens),
+                               default=max_distance + 1)
+                if distance > max_distance:
+                    break
+                total += distance
+            else:
+                scores[contact_id] = total
+        return scores
 
+    def find_by_phone(self, phone: str) -> Dict[int, Contact]:
+        """Поиск контактов по номеру телефона без учета форматирования"""
+        digits = normalize_phone(phone)
+        if not digits:
+            return {}
+        if self._phone_index is not None:
+            ids = self._phone_index.find(digits)
+            return {cid: self._contacts[cid] for cid in sorted(ids)}
+        return dict(self._contacts.find_phone(digits))
+
+    def find_by_phone_prefix(self, prefix: str) -> Dict[int, Contact]:
+        """Поиск контактов, номер телефона которых начинается с префикса
+
+        Ведущая "8" префикса считается кодом страны 7, как в полном номере.
+        """
+        digits = normalize_phone_prefix(prefix)
+        if not digits:
+            return {}
+        if self._phone_index is not None:
+            ids = self._phone_index.find_prefix(digits)
+            return {cid: self._contacts[cid] for cid in sorted(ids)}
+        return dict(self._contacts.find_phone(digits, prefix=True))
+
+    @metrics.timed('phonebook.update_contact')
     def update_contact(self, contact_id: int, **kwargs) -> Contact:
         """Обновление контакта"""
+        self._check_writable()
         if contact_id not in self._contacts:
             raise ContactNotFoundError(contact_id=contact_id)
 
         contact = self._contacts[contact_id]
+        self._unindex_contact(contact_id, contact)
         for key, value in kwargs.items():
-            if hasattr(contact, key) and value:
+            if hasattr(contact, key) and value and getattr(contact, key) != value:
                 setattr(contact, key, value)
+                self._search_keys.pop(contact_id, None)
+        # Для колоночного хранилища contact - копия, записываем изменения обратно
+        self._contacts[contact_id] = contact
+        self._index_contact(contact_id, contact)
+        if self._journal is not None:
+            self._journal.append(OP_UPDATE, contact_id, contact.to_list())
 
         return contact
 
+    @metrics.timed('phonebook.delete_contact')
     def delete_contact(self, contact_id: int) -> Contact:
         """Удаление контакта"""
+        self._check_writable()
         if contact_id not in self._contacts:
             raise ContactNotFoundError(contact_id=contact_id)
 
-        return self._contacts.pop(contact_id)
+        contact = self._contacts.pop(contact_id)
+        self._unindex_contact(contact_id, contact)
+        self._search_keys.pop(contact_id, None)
+        if self._journal is not None:
+            self._journal.append(OP_DELETE, contact_id)
+        if self._reuse_ids:
+            heapq.heappush(self._free_ids, contact_id)
+        return contact
+
+    def find_duplicates(self, threshold: float = 0.7) -> List[List[int]]:
+        """Группы ID вероятных дубликатов
+
+        Контакты считаются дубликатами, если их имена совпадают без учета
+        регистра, ё/е и порядка слов или похожи (коэффициент Жаккара n-грамм
+        не ниже threshold; threshold=1 отключает поиск похожих), а номера
+        после нормализации совпадают или отсутствуют.
+        """
+        from .dedup import find_duplicate_groups
+        return find_duplicate_groups(self._iter_rows(), threshold)
+
+    def merge_duplicates(self, strategy: str = 'first', threshold: float = 0.7) -> Dict[int, List[int]]:
+        """Слияние групп дубликатов, возвращает {оставленный ID: удаленные ID}
+
+        Стратегии: 'first' - остается контакт с наименьшим ID, 'last' - с
+        наибольшим, 'longest' - наименьший ID, а каждое поле берется самым
+        длинным из значений группы.
+        """
+        self._check_writable()
+        if strategy not in MERGE_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия слияния: {strategy}")
+
+        report = {}
+        for ids in self.find_duplicates(threshold):
+            keep = ids[-1] if strategy == 'last' else ids[0]
+            if strategy == 'longest':
+                group = [self._contacts[contact_id] for contact_id in ids]
+                self.update_contact(keep, **{field: max((getattr(contact, field) for contact in group), key=len)
+                                             for field in ('name', 'phone', 'comment')})
+            removed = [contact_id for contact_id in ids if contact_id != keep]
+            for contact_id in removed:
+                self.delete_contact(contact_id)
+            report[keep] = removed
+        return report
 
     def __len__(self) -> int:
         return len(self._contacts)
@@ -105,8 +654,83 @@ class PhoneBook:
     def __iter__(self) -> Iterator[Contact]:
         return iter(self._contacts.values())
 
+    def _new_store(self) -> BaseContactStore:
+        """Пустое хранилище контактов выбранного типа"""
+        if self._storage == 'columnar':
+            return ColumnarContactStore()
+        return DictContactStore()
+
+    def _store_from_snapshot(self, snapshot: SnapshotData) -> BaseContactStore:
+        """Хранилище контактов из столбцов снимка"""
+        if self._storage == 'columnar':
+            return ColumnarContactStore.from_columns(snapshot.ids, snapshot.names,
+                                                     snapshot.phones, snapshot.comments)
+        return DictContactStore((cid, Contact(name, phone, comment, cid))
+                                for cid, name, phone, comment in zip(snapshot.ids, snapshot.names,
+                                                                     snapshot.phones, snapshot.comments))
+
+    @staticmethod
+    def _restore_ngram_index(index: Optional[NGramIndex], snapshot: SnapshotData) -> bool:
+        """Восстановление индекса n-грамм из снимка, если он там сохранен"""
+        if index is None or snapshot.ngram_postings is None or snapshot.ngram_n != index.n:
+            return False
+        index.restore(snapshot.ngram_postings)
+        return True
+
+    def _iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Sequence[str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) всех контактов или только ids"""
+        return self._contacts.iter_rows(ids)
+
+    def _check_writable(self) -> None:
+        """Проверка, что книгу можно изменять"""
+        if self._read_only:
+            raise ReadOnlyError()
+
     def _get_next_id(self) -> int:
-        """Получение следующего ID для нового контакта"""
-        if self._contacts:
-            return max(self._contacts.keys()) + 1
-        return 1
\ No newline at end of file
+        """Получение следующего ID для нового контакта (без его резервирования)"""
+        if self._free_ids:
+            return self._free_ids[0]
+        return self._last_id + 1
+
+    def _allocate_id(self) -> int:
+        """Выдача ID для нового контакта за O(1) (O(log n) при повторном использовании ID)"""
+        if self._free_ids:
+            return heapq.heappop(self._free_ids)
+        self._last_id += 1
+        return self._last_id
+
+    def _insert_contact(self, contact_id: int, contact: Contact) -> None:
+        """Размещение контакта под заданным ID без журнала и проверок
+
+        ID выдает вызывающий: add_contact или, например, ShardedPhoneBook,
+        который распределяет ID между процессами-шардами.
+        """
+        contact.id = contact_id
+        self._contacts[contact_id] = contact
+        if contact_id > self._last_id:
+            self._last_id = contact_id
+        self._index_contact(contact_id, contact)
+
+    def _index_contact(self, contact_id: int, contact: Contact) -> None:
+        """Добавление контакта во все индексы"""
+        for index in self._indexes:
+            index.add(contact_id, contact)
+
+    def _unindex_contact(self, contact_id: int, contact: Contact) -> None:
+        """Удаление контакта из всех индексов"""
+        for index in self._indexes:
+            index.remove(contact_id, contact)
+
+    def _create_indexes(self) -> Dict[str, BaseIndex]:
+        """Новые пустые экземпляры включенных индексов"""
+        return {name: factory() for name, factory in self._index_factories.items()}
+
+    def _set_indexes(self, indexes: Dict[str, BaseIndex]) -> None:
+        """Подключение индексов к книге"""
+        self._search_keys = {}
+        self._indexes = list(indexes.values())
+        self._ngram_index = indexes.get('ngram')
+        self._phone_index = indexes.get('phone')
+        self._fuzzy_index = indexes.get('fuzzy')
+        self._sorted_indexes = {field: indexes[f'sorted_{field}'] for field in SORTED_FIELDS
+                                if f'sorted_{field}' in indexes}
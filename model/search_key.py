@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+SEARCH_FIELDS = ('name', 'phone', 'comment')
+FIELD_SEPARATOR = '\x00'  # Не встречается в полях, поэтому совпадение не пересекает границу полей
+
+
+def fold(text: str) -> str:
+    """Приведение строки к виду для поиска: casefold и замена ё на е"""
+    return text.casefold().replace('ё', 'е')
+
+
+class SearchKey(NamedTuple):
+    """Поисковый ключ контакта: приведенные поля одной строкой, разделенные FIELD_SEPARATOR"""
+    text: str
+
+    @classmethod
+    def from_fields(cls, name: str, phone: str, comment: str) -> 'SearchKey':
+        """Ключ по исходным значениям полей"""
+        return cls(FIELD_SEPARATOR.join((fold(name), fold(phone), fold(comment))))
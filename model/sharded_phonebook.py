@@ -0,0 +1,317 @@
+import heapq
+import multiprocessing
+import os
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .contact import Contact
+from .file_handler import FileHandler, FORMAT_SNAPSHOT, FORMAT_SQLITE, FORMAT_TEXT
+from .phonebook import FILE_FORMATS, PhoneBook
+from .snapshot import read_snapshot
+from .sqlite_store import SQLiteContactStore
+
+ROWS_BATCH = 50_000  # Сколько строк шард отправляет одним сообщением при сохранении
+UNSUPPORTED_OPTIONS = ('journal', 'reuse_ids')
+
+
+class _Shard:
+    """Часть книги внутри процесса-шарда: контакты с ID % shards == shard"""
+
+    def __init__(self, shard: int, shards: int, book_options: Dict[str, Any]):
+        self.shard = shard
+        self.shards = shards
+        self.book_options = book_options
+        self.phonebook = PhoneBook(**book_options)
+
+    def load(self, file_path: str) -> int:
+        """Загрузка своей части файла, возвращает наибольший ID шарда
+
+        Все шарды читают файл одновременно, и каждый оставляет только свои
+        строки: разбор не ускоряется, но и не упирается в передачу строк
+        через каналы.
+        """
+        file_handler = FileHandler()
+        file_format = file_handler.detect_format(file_path)
+        store = None
+        if file_format == FORMAT_SNAPSHOT:
+            data = read_snapshot(file_path)
+            records = zip(data.ids, zip(data.names, data.phones, data.comments))
+        elif file_format == FORMAT_SQLITE:
+            # База служит только форматом файла: контакты шарда хранятся в памяти
+            store = SQLiteContactStore(file_path)
+            records = store.iter_rows()
+        else:
+            records = file_handler.iter_records(file_path)
+        phonebook = PhoneBook(**self.book_options)
+        shard, shards = self.shard, self.shards
+        try:
+            for contact_id, contact_data in records:
+                if contact_id % shards == shard:
+                    phonebook._insert_contact(contact_id, Contact.from_list(contact_data))
+        finally:
+            if store is not None:
+                store.close()
+        self.phonebook = phonebook
+        return phonebook._last_id
+
+    def insert(self, rows: List[Tuple[int, Sequence[str]]]) -> None:
+        for contact_id, contact_data in rows:
+            self.phonebook._insert_contact(contact_id, Contact.from_list(contact_data))
+
+    def get(self, contact_id: int) -> Contact:
+        return self.phonebook.get_contact(contact_id)
+
+    def find(self, search_term: str) -> List[Tuple[int, str, str, str]]:
+        """Найденные контакты строками: кортежи передаются между процессами в разы быстрее объектов"""
+        return [(contact_id, contact.name, contact.phone, contact.comment)
+                for contact_id, contact in self.phonebook.find_contacts(search_term, lazy=True)]
+
+    def update(self, contact_id: int, fields: Dict[str, str]) -> Contact:
+        return self.phonebook.update_contact(contact_id, **fields)
+
+    def delete(self, contact_id: int) -> Contact:
+        return self.phonebook.delete_contact(contact_id)
+
+    def count(self) -> int:
+        return len(self.phonebook)
+
+    def rows(self) -> Iterator[List[Tuple[int, Tuple[str, str, str]]]]:
+        """Строки шарда по возрастанию ID порциями по ROWS_BATCH"""
+        batch = []
+        for contact_id, contact in sorted(self.phonebook.get_all_contacts().items()):
+            batch.append((contact_id, (contact.name, contact.phone, contact.comment)))
+            if len(batch) == ROWS_BATCH:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _shard_main(conn, shard: int, shards: int, book_options: Dict[str, Any]) -> None:
+    """Цикл процесса-шарда: команда (имя, аргументы) -> ответ ('ok' | 'error', значение)
+
+    Команда rows отвечает серией сообщений ('batch', строки), за которой следует ('ok', None).
+    """
+    worker = _Shard(shard, shards, book_options)
+    while True:
+        try:
+            command, args = conn.recv()
+        except EOFError:
+            return
+        if command == 'close':
+            conn.close()
+            return
+        try:
+            if command == 'rows':
+                for batch in worker.rows():
+                    conn.send(('batch', batch))
+                result = None
+            else:
+                result = getattr(worker, command)(*args)
+        except Exception as e:
+            conn.send(('error', e))
+        else:
+            conn.send(('ok', result))
+
+
+class ShardedPhoneBook:
+    """Телефонная книга, разделенная по ID между несколькими процессами
+
+    Контакт с ID i хранится в шарде i % shards - отдельном процессе со своим
+    PhoneBook (и его индексами, если они включены в book_options). ID выдает
+    этот объект, поэтому они сквозные, как в обычной книге. Поиск рассылается
+    всем шардам сразу и выполняется параллельно на разных ядрах, результаты
+    сливаются по ID.
+
+    Контакты, которые возвращают методы, - копии, полученные из шардов:
+    изменять их нужно через update_contact. Журнал изменений и повторное
+    использование ID не поддерживаются.
+    """
+
+    def __init__(self, shards: Optional[int] = None, mp_context: Optional[Any] = None, **book_options):
+        for option in UNSUPPORTED_OPTIONS:
+            if book_options.get(option):
+                raise ValueError(f"Шардированная книга не поддерживает параметр {option}")
+        self._shards = shards or os.cpu_count() or 1
+        if self._shards < 1:
+            raise ValueError("Число шардов должно быть положительным")
+        self._file_handler = FileHandler()
+        self._is_open = False
+        self._file_path: Optional[str] = None
+        self._file_format = FORMAT_TEXT
+        self._last_id = 0
+        context = mp_context or multiprocessing.get_context()
+        self._connections = []
+        self._processes = []
+        for shard in range(self._shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_main, args=(child_conn, shard, self._shards, book_options),
+                                      daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    @property
+    def shards(self) -> int:
+        """Число шардов"""
+        return self._shards
+
+    @property
+    def is_open(self) -> bool:
+        """Проверка, открыта ли телефонная книга"""
+        return self._is_open
+
+    @property
+    def file_path(self) -> Optional[str]:
+        """Получение пути к файлу"""
+        return self._file_path
+
+    def open(self, file_path: str) -> bool:
+        """Открытие телефонной книги из файла (текста, снимка или базы SQLite); шарды читают его параллельно"""
+        try:
+            file_format = self._file_handler.detect_format(file_path)
+            last_ids = self._broadcast('load', file_path)
+        except Exception as e:
+            self._is_open = False
+            raise e
+        self._last_id = max(last_ids, default=0)
+        self._file_path = file_path
+        self._file_format = file_format
+        self._is_open = True
+        return True
+
+    def save(self, file_path: Optional[str] = None, format: Optional[str] = None) -> None:
+        """Сохранение телефонной книги в файл; строки шардов сливаются по ID потоком"""
+        if not self._is_open:
+            raise ValueError("Телефонная книга не открыта")
+        save_path = file_path or self._file_path
+        if format is None:
+            format = self._file_format if save_path == self._file_path else FORMAT_TEXT
+        if format not in FILE_FORMATS:
+            raise ValueError(f"Неизвестный формат файла: {format}")
+
+        for conn in self._connections:
+            conn.send(('rows', ()))
+        streams = [self._iter_shard_rows(shard) for shard in range(self._shards)]
+        rows = heapq.merge(*streams, key=itemgetter(0))
+        try:
+            if format == FORMAT_SNAPSHOT:
+                self._file_handler.save_snapshot(save_path, rows)
+            elif format == FORMAT_SQLITE:
+                SQLiteContactStore.write_rows(save_path, rows)
+            else:
+                self._file_handler.save_rows(save_path, rows)
+        finally:
+            # Если запись прервалась, ответы шардов все равно нужно дочитать
+            for stream in streams:
+                try:
+                    for _ in stream:
+                        pass
+                except Exception:
+                    pass
+        if save_path == self._file_path:
+            self._file_format = format
+
+    def add_contact(self, contact: Contact) -> int:
+        """Добавление нового контакта"""
+        return self.add_contacts([contact])[0]
+
+    def add_contacts(self, contacts: Iterable[Contact]) -> List[int]:
+        """Пакетное добавление: каждый шард получает свою часть одним сообщением"""
+        batches: List[List[Tuple[int, Sequence[str]]]] = [[] for _ in range(self._shards)]
+        ids = []
+        for contact in contacts:
+            self._last_id += 1
+            contact.id = self._last_id
+            batches[self._last_id % self._shards].append((self._last_id, contact.to_list()))
+            ids.append(self._last_id)
+        self._gather([shard for shard, batch in enumerate(batches) if batch], 'insert',
+                     lambda shard: (batches[shard],))
+        return ids
+
+    def get_contact(self, contact_id: int) -> Contact:
+        """Получение контакта по ID"""
+        return self._call(self._shard_of(contact_id), 'get', contact_id)
+
+    def update_contact(self, contact_id: int, **kwargs) -> Contact:
+        """Изменение полей контакта, возвращает обновленную копию"""
+        return self._call(self._shard_of(contact_id), 'update', contact_id, kwargs)
+
+    def delete_contact(self, contact_id: int) -> Contact:
+        """Удаление контакта, возвращает удаленный контакт"""
+        return self._call(self._shard_of(contact_id), 'delete', contact_id)
+
+    def find_contacts(self, search_term: str) -> Dict[int, Contact]:
+        """Поиск контактов по всем полям во всех шардах параллельно"""
+        found = self._broadcast('find', search_term)
+        rows = found[0] if len(found) == 1 else heapq.merge(*found)
+        return {contact_id: Contact(name, phone, comment, contact_id) for contact_id, name, phone, comment in rows}
+
+    def __len__(self) -> int:
+        return sum(self._broadcast('count'))
+
+    def close(self) -> None:
+        """Остановка процессов-шардов"""
+        for conn, process in zip(self._connections, self._processes):
+            try:
+                conn.send(('close', ()))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+        self._is_open = False
+
+    def __enter__(self) -> 'ShardedPhoneBook':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _shard_of(self, contact_id: int) -> int:
+        return contact_id % self._shards
+
+    def _call(self, shard: int, command: str, *args) -> Any:
+        """Команда одному шарду с ожиданием ответа"""
+        self._connections[shard].send((command, args))
+        return self._receive(shard)
+
+    def _broadcast(self, command: str, *args) -> List[Any]:
+        """Команда всем шардам: сначала рассылка, потом сбор ответов, чтобы шарды работали одновременно"""
+        return self._gather(range(self._shards), command, lambda shard: args)
+
+    def _gather(self, shards: Iterable[int], command: str, args_of) -> List[Any]:
+        shards = list(shards)
+        for shard in shards:
+            self._connections[shard].send((command, args_of(shard)))
+        results, error = [], None
+        for shard in shards:
+            # Ответы читаются у всех шардов, даже после ошибки, иначе протокол собьется
+            try:
+                results.append(self._receive(shard))
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def _receive(self, shard: int) -> Any:
+        status, value = self._connections[shard].recv()
+        if status == 'error':
+            raise value
+        return value
+
+    def _iter_shard_rows(self, shard: int) -> Iterator[Tuple[int, Sequence[str]]]:
+        """Строки шарда по возрастанию ID из ответа на команду rows"""
+        conn = self._connections[shard]
+        while True:
+            status, value = conn.recv()
+            if status == 'batch':
+                yield from value
+            elif status == 'error':
+                raise value
+            else:
+                return
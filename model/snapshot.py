@@ -0,0 +1,175 @@
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from exceptions import FileOperationError
+
+# Формат снимка (все числа little-endian):
+#   MAGIC, заголовок <HHQ: версия, флаги, число контактов
+#   столбец ID: count * int64
+#   три строковых столбца (имена, телефоны, комментарии):
+#       <Q длина в байтах, UTF-8 строка значений, разделенных '\0'
+#   [FLAG_NGRAM_INDEX] индекс n-грамм:
+#       <HQQ n, число n-грамм, число ID; n-граммы через '\0' (<Q длина + байты);
+#       размеры списков: grams * int64; ID всех списков подряд: int64
+MAGIC = b'PBSNAP\x00\x01'
+FORMAT_VERSION = 1
+FLAG_NGRAM_INDEX = 1
+
+_HEADER = struct.Struct('<HHQ')
+_LENGTH = struct.Struct('<Q')
+_INDEX_HEADER = struct.Struct('<HQQ')
+_SEPARATOR = '\x00'
+
+
+class SnapshotData(NamedTuple):
+    """Содержимое снимка: столбцы контактов и, при наличии, индекс n-грамм"""
+    ids: Sequence[int]
+    names: List[str]
+    phones: List[str]
+    comments: List[str]
+    ngram_n: Optional[int] = None
+    ngram_postings: Optional[Dict[str, Set[int]]] = None
+
+
+def is_snapshot(file_path: str) -> bool:
+    """Проверка, начинается ли файл с заголовка снимка"""
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _int64_bytes(values: Iterable[int]) -> bytes:
+    column = array('q', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _int64_column(buffer: memoryview) -> array:
+    column = array('q')
+    column.frombytes(buffer)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+def _string_column(values: Sequence[str]) -> bytes:
+    joined = _SEPARATOR.join(values)
+    if joined.count(_SEPARATOR) != max(len(values) - 1, 0):
+        raise ValueError("Поля контактов не должны содержать символ \\0")
+    encoded = joined.encode('UTF-8')
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def encode_snapshot(rows: Iterable[Tuple[int, Sequence[str]]],
+                    ngram_n: Optional[int] = None,
+                    ngram_postings: Optional[Dict[str, Set[int]]] = None) -> Iterable[bytes]:
+    """Части бинарного снимка для пар (ID, поля), упорядоченных по ID"""
+    ids: List[int] = []
+    names: List[str] = []
+    phones: List[str] = []
+    comments: List[str] = []
+    for contact_id, (name, phone, comment) in rows:
+        ids.append(contact_id)
+        names.append(name)
+        phones.append(phone)
+        comments.append(comment)
+
+    flags = FLAG_NGRAM_INDEX if ngram_postings is not None else 0
+    yield MAGIC + _HEADER.pack(FORMAT_VERSION, flags, len(ids))
+    yield _int64_bytes(ids)
+    yield _string_column(names)
+    yield _string_column(phones)
+    yield _string_column(comments)
+
+    if ngram_postings is not None:
+        grams = list(ngram_postings)
+        total = sum(len(ids) for ids in ngram_postings.values())
+        yield _INDEX_HEADER.pack(ngram_n, len(grams), total)
+        yield _string_column(grams)
+        yield _int64_bytes(len(ngram_postings[gram]) for gram in grams)
+        yield _int64_bytes(cid for gram in grams for cid in ngram_postings[gram])
+
+
+class _Reader:
+    """Последовательное чтение частей снимка из буфера без копирования"""
+
+    def __init__(self, buffer: memoryview):
+        self.buffer = buffer
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        if self.offset + size > len(self.buffer):
+            raise ValueError("Снимок обрезан")
+        chunk = self.buffer[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        return fmt.unpack(self.take(fmt.size))
+
+    def strings(self, count: int) -> List[str]:
+        length, = self.unpack(_LENGTH)
+        text = str(self.take(length), 'UTF-8')
+        values = text.split(_SEPARATOR) if count else []
+        if len(values) != count:
+            raise ValueError("Неверное число строк в столбце")
+        return values
+
+
+def decode_snapshot(buffer) -> SnapshotData:
+    """Разбор снимка из bytes или mmap"""
+    reader = _Reader(memoryview(buffer))
+    if bytes(reader.take(len(MAGIC))) != MAGIC:
+        raise ValueError("Файл не является снимком телефонной книги")
+    version, flags, count = reader.unpack(_HEADER)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+
+    ids = _int64_column(reader.take(count * 8))
+    names = reader.strings(count)
+    phones = reader.strings(count)
+    comments = reader.strings(count)
+
+    ngram_n = ngram_postings = None
+    if flags & FLAG_NGRAM_INDEX:
+        ngram_n, gram_count, total = reader.unpack(_INDEX_HEADER)
+        grams = reader.strings(gram_count)
+        sizes = _int64_column(reader.take(gram_count * 8))
+        posting_ids = _int64_column(reader.take(total * 8))
+        ngram_postings = {}
+        start = 0
+        for gram, size in zip(grams, sizes):
+            ngram_postings[gram] = set(posting_ids[start:start + size])
+            start += size
+
+    return SnapshotData(ids, names, phones, comments, ngram_n, ngram_postings)
+
+
+def read_snapshot(file_path: str, use_mmap: bool = False) -> SnapshotData:
+    """Чтение снимка: одним чтением файла или через отображение в память"""
+    try:
+        with open(file_path, 'rb') as file:
+            if not use_mmap:
+                return decode_snapshot(file.read())
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                try:
+                    return decode_snapshot(mapped)
+                except (ValueError, struct.error) as e:
+                    # Трассировка держит срезы отображения и мешает его закрыть,
+                    # поэтому выходим из обработчика до повторного исключения
+                    error = str(e)
+                raise ValueError(error)
+    except FileNotFoundError as e:
+        raise FileOperationError(f"Файл не найден", file_path) from e
+    except PermissionError as e:
+        raise FileOperationError(f"Нет доступа к файлу", file_path) from e
+    except (ValueError, struct.error) as e:
+        raise FileOperationError(f"Поврежденный снимок телефонной книги", file_path) from e
+    except Exception as e:
+        raise FileOperationError(f"Ошибка при чтении снимка", file_path) from e
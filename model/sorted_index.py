@@ -0,0 +1,123 @@
+
+from bisect import bisect_left, insort
+from typing import Iterator, List, Optional, Tuple
+from .base import BaseIndex
+from .contact import Contact
+
+# Ключ индекса: значение поля в нижнем регистре и ID (для одинаковых значений)
+SortKey = Tuple[str, int]
+
+# Символ, больший любого другого: граница "все строки с этим префиксом"
+_MAX_CHAR = '\U0010ffff'
+
+
+class _SortedList:
+    """Отсортированный список из блоков ограниченного размера
+
+    Вставка и удаление сдвигают элементы только внутри одного блока,
+    поэтому стоят O(sqrt n) вместо O(n) у обычного списка.
+    """
+
+    LOAD = 1000
+
+    def __init__(self):
+        self._lists: List[List[SortKey]] = []
+        self._maxes: List[SortKey] = []
+        self._len = 0
+
+    def add(self, key: SortKey) -> None:
+        lists, maxes = self._lists, self._maxes
+        if not lists:
+            lists.append([key])
+            maxes.append(key)
+        else:
+            pos = bisect_left(maxes, key)
+            if pos == len(maxes):
+                pos -= 1
+                lists[pos].append(key)
+                maxes[pos] = key
+            else:
+                insort(lists[pos], key)
+            if len(lists[pos]) > 2 * self.LOAD:
+                block = lists[pos]
+                lists[pos:pos + 1] = [block[:self.LOAD], block[self.LOAD:]]
+                maxes[pos:pos + 1] = [block[self.LOAD - 1], block[-1]]
+        self._len += 1
+
+    def remove(self, key: SortKey) -> None:
+        lists, maxes = self._lists, self._maxes
+        pos = bisect_left(maxes, key)
+        if pos == len(maxes):
+            return
+        block = lists[pos]
+        idx = bisect_left(block, key)
+        if idx == len(block) or block[idx] != key:
+            return
+        del block[idx]
+        self._len -= 1
+        if block:
+            maxes[pos] = block[-1]
+        else:
+            del lists[pos], maxes[pos]
+
+    def clear(self) -> None:
+        self._lists.clear()
+        self._maxes.clear()
+        self._len = 0
+
+    def iter_from(self, key: SortKey) -> Iterator[SortKey]:
+        """Ключи не меньше key по возрастанию"""
+        lists = self._lists
+        pos = bisect_left(self._maxes, key)
+        if pos == len(lists):
+            return
+        yield from lists[pos][bisect_left(lists[pos], key):]
+        for block in lists[pos + 1:]:
+            yield from block
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class SortedIndex(BaseIndex):
+    """Упорядоченный индекс по значению поля контакта (без учета регистра)
+
+    Поддерживается при изменениях книги и позволяет выдавать контакты
+    в алфавитном порядке и по диапазонам значений без сортировки всей книги.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys = _SortedList()
+
+    def key(self, contact_id: int, contact: Contact) -> SortKey:
+        """Ключ контакта в индексе"""
+        return getattr(contact, self.field).lower(), contact_id
+
+    def add(self, contact_id: int, contact: Contact) -> None:
+        """Добавление контакта в индекс"""
+        self._keys.add(self.key(contact_id, contact))
+
+    def remove(self, contact_id: int, contact: Contact) -> None:
+        """Удаление контакта из индекса"""
+        self._keys.remove(self.key(contact_id, contact))
+
+    def clear(self) -> None:
+        """Очистка индекса"""
+        self._keys.clear()
+
+    def iter_ids(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[int]:
+        """ID контактов по возрастанию значения поля
+
+        start - нижняя граница значения, end - верхняя граница, включающая
+        все значения, которые начинаются с end (границы без учета регистра).
+        """
+        low = ((start or '').lower(), 0)
+        high = None if end is None else (end.lower() + _MAX_CHAR, 0)
+        for key in self._keys.iter_from(low):
+            if high is not None and key >= high:
+                break
+            yield key[1]
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,374 @@
+import os
+import threading
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from weakref import WeakValueDictionary
+from .base import BaseContactStore, BaseModel
+from .contact import Contact
+from .phone_index import normalize_phone
+from .search_key import SearchKey, fold
+from exceptions import FileOperationError
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Заголовок файла базы данных SQLite
+SQLITE_MAGIC = b'SQLite format 3\x00'
+# Число изменений в одной транзакции: фиксация после каждого изменения
+# упирается в fsync, а бесконечная транзакция раздувает WAL
+BATCH_SIZE = 1000
+# Разделитель полей поискового ключа в базе ('\0' в тексте SQLite недопустим)
+KEY_SEPARATOR = '\x1f'
+# Символ, больший любого другого: граница "все строки с этим префиксом", как в SortedIndex
+_MAX_CHAR = '\U0010ffff'
+# Ограничение SQLite на число параметров запроса (с запасом)
+_MAX_PARAMS = 500
+# Число строк результата, выбираемых за один захват блокировки соединения
+_FETCH_SIZE = 256
+
+# Открытые хранилища по id(): write_rows не должен заменять файл под их соединением
+_open_stores: 'WeakValueDictionary[int, SQLiteContactStore]' = WeakValueDictionary()
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    comment TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    phone_key TEXT NOT NULL,
+    phone_digits TEXT NOT NULL,
+    search_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts (name_key, id);
+CREATE INDEX IF NOT EXISTS contacts_phone_key ON contacts (phone_key, id);
+CREATE INDEX IF NOT EXISTS contacts_phone_digits ON contacts (phone_digits);
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5 (
+    search_key, content='contacts', content_rowid='id', tokenize='trigram case_sensitive 1'
+);
+"""
+
+# Триггеры поддерживают полнотекстовый индекс при изменении таблицы контактов
+_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_fts (rowid, search_key) VALUES (new.id, new.search_key);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_fts (contacts_fts, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE OF search_key ON contacts BEGIN
+    INSERT INTO contacts_fts (contacts_fts, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+    INSERT INTO contacts_fts (rowid, search_key) VALUES (new.id, new.search_key);
+END;
+"""
+
+_COLUMNS = 'id, name, phone, comment, name_key, phone_key, phone_digits, search_key'
+_INSERT = f"INSERT INTO contacts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_OR_IGNORE = _INSERT.replace("INSERT", "INSERT OR IGNORE", 1)
+_UPDATE = ("UPDATE contacts SET name = ?, phone = ?, comment = ?, name_key = ?, phone_key = ?, phone_digits = ?, "
+           "search_key = ? WHERE id = ?")
+_SORT_COLUMNS = {'name': 'name_key', 'phone': 'phone_key'}
+
+
+def is_sqlite(file_path: str) -> bool:
+    """Проверка, начинается ли файл с заголовка базы SQLite"""
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _row_values(contact_id: int, fields: Sequence[str]) -> Tuple:
+    """Значения строки таблицы: поля контакта и производные ключи для индексов"""
+    name, phone, comment = fields
+    return (contact_id, name, phone, comment, name.lower(), phone.lower(), normalize_phone(phone),
+            KEY_SEPARATOR.join((fold(name), fold(phone), fold(comment))))
+
+
+class SQLiteContactStore(MutableMapping, BaseContactStore, BaseModel):
+    """Хранилище контактов в базе SQLite
+
+    Контакты не загружаются в память: каждое обращение - запрос к базе, а
+    открытие не зависит от размера книги. Поиск по подстроке идет через
+    полнотекстовый индекс FTS5 с триграммами по полям, приведенным через
+    search_key.fold, поиск по номеру и сортировка - через индексы столбцов.
+    База работает в режиме WAL; изменения фиксируются пакетами по
+    batch_size, остаток - при save() и close().
+
+    Соединение не привязано к потоку, открывшему базу (книгу открывает
+    aopen в пуле потоков, читает ConcurrentPhoneBook из разных потоков):
+    каждое обращение к нему выполняется под блокировкой хранилища, а
+    результаты запросов выбираются порциями по _FETCH_SIZE строк.
+    """
+
+    ordered = True
+    persistent = True
+
+    def __init__(self, file_path: str, batch_size: int = BATCH_SIZE):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self._conn: Optional['sqlite3.Connection'] = None
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._count: Optional[int] = None
+        self.load()
+
+    @classmethod
+    def write_rows(cls, file_path: str, rows: Iterable[Tuple[int, Sequence[str]]]) -> None:
+        """Создание новой базы из пар (ID, поля) с атомарной заменой файла
+
+        Строки вставляются одной транзакцией, а полнотекстовый индекс
+        строится один раз после вставки, а не триггером на каждую строку.
+        Базу, открытую хранилищем, заменить нельзя: изменения через ее
+        соединение ушли бы в удаленный файл.
+        """
+        import sqlite3
+        from .file_handler import create_temp_file, same_file  # file_handler сам импортирует этот модуль
+        if any(same_file(store.file_path, file_path) for store in list(_open_stores.values())):
+            raise FileOperationError(f"База открыта, ее нельзя перезаписать", file_path)
+        fd, temp_path = create_temp_file(file_path)
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(temp_path, isolation_level=None)
+            try:
+                conn.executescript(_TABLES)
+                conn.execute("BEGIN")
+                conn.executemany(_INSERT, (_row_values(contact_id, fields) for contact_id, fields in rows))
+                conn.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+                conn.execute("COMMIT")
+                conn.executescript(_TRIGGERS)
+            finally:
+                conn.close()
+            # Журнал WAL старой базы не должен примениться к новой
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(file_path + suffix):
+                    os.unlink(file_path + suffix)
+            os.replace(temp_path, file_path)
+        except PermissionError as e:
+            raise FileOperationError(f"Нет доступа для записи в файл", file_path) from e
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Ошибка при сохранении базы SQLite", file_path) from e
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def load(self) -> None:
+        """Подключение к базе; таблицы и индексы создаются, если их нет"""
+        # sqlite3 загружается при первом открытии базы, а не при импорте модуля
+        import sqlite3
+        try:
+            conn = sqlite3.connect(self.file_path, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_TABLES + _TRIGGERS)
+            except BaseException:
+                conn.close()
+                raise
+        except sqlite3.OperationalError as e:
+            if 'fts5' in str(e):
+                raise FileOperationError(f"SQLite собран без поддержки FTS5", self.file_path) from e
+            raise FileOperationError(f"Ошибка при открытии базы SQLite", self.file_path) from e
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Ошибка при открытии базы SQLite", self.file_path) from e
+        self._conn = conn
+        self._pending = 0
+        self._count = None
+        _open_stores[id(self)] = self
+
+    def save(self) -> None:
+        """Фиксация накопленных изменений"""
+        with self._lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+            self._pending = 0
+
+    def close(self) -> None:
+        """Фиксация изменений и закрытие соединения"""
+        with self._lock:
+            if self._conn is not None:
+                self.save()
+                self._conn.close()
+                self._conn = None
+            _open_stores.pop(id(self), None)
+
+    def _fetchone(self, query: str, params: Sequence = ()) -> Optional[Tuple]:
+        """Первая строка результата запроса"""
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def _fetch(self, query: str, params: Sequence = ()) -> Iterator[Tuple]:
+        """Строки результата запроса, выбираемые порциями под блокировкой"""
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            rows = cursor.fetchmany(_FETCH_SIZE)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cursor.fetchmany(_FETCH_SIZE)
+
+    def _write(self, query: str, params: Sequence) -> int:
+        """Изменение в текущей пакетной транзакции, возвращает число затронутых строк"""
+        with self._lock:
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN")
+            return self._conn.execute(query, params).rowcount
+
+    def max_id(self) -> int:
+        """Наибольший ID (0 для пустой базы) без перебора строк"""
+        return self._fetchone("SELECT max(id) FROM contacts")[0] or 0
+
+    def iter_rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """Пары (ID, (имя, телефон, комментарий)) в порядке возрастания ID
+
+        Если передан ids, выдаются только строки с этими ID (в их порядке).
+        """
+        if ids is None:
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts ORDER BY id")
+            return ((row[0], row[1:]) for row in rows)
+        return self._iter_rows_by_ids(iter(ids))
+
+    def _iter_rows_by_ids(self, ids: Iterator[int]) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        while True:
+            chunk = list(islice(ids, _MAX_PARAMS))
+            if not chunk:
+                return
+            placeholders = ','.join('?' * len(chunk))
+            found = {row[0]: row[1:] for row in self._fetch(
+                f"SELECT id, name, phone, comment FROM contacts WHERE id IN ({placeholders})", chunk)}
+            for contact_id in chunk:
+                if contact_id in found:
+                    yield contact_id, found[contact_id]
+
+    def iter_ids(self, start: Optional[int] = None, reverse: bool = False) -> Iterator[int]:
+        """ID по возрастанию (при reverse - по убыванию) начиная с start включительно, по первичному ключу"""
+        if reverse:
+            if start is None:
+                rows = self._fetch("SELECT id FROM contacts ORDER BY id DESC")
+            else:
+                rows = self._fetch("SELECT id FROM contacts WHERE id <= ? ORDER BY id DESC", (start,))
+        else:
+            rows = self._fetch("SELECT id FROM contacts WHERE id >= ? ORDER BY id", (start or 0,))
+        return (row[0] for row in rows)
+
+    def frozen_rows(self) -> List[Tuple[int, Tuple[str, str, str]]]:
+        """Копия всех строк в памяти"""
+        return list(self.iter_rows())
+
+    def search(self, folded_term: str, ids: Optional[Iterable[int]] = None,
+               keys: Optional[Dict[int, SearchKey]] = None) -> Iterator[Tuple[int, Contact]]:
+        """Пары (ID, контакт), поисковый ключ которых содержит приведенную строку
+
+        Строки от трех символов ищутся по триграммному индексу FTS5; более
+        короткие - перебором ключей в базе (триграммный индекс их не ускоряет).
+        Кандидаты ids и кэш ключей книги не нужны: ключи хранятся в базе.
+        """
+        if KEY_SEPARATOR in folded_term:
+            return iter(())
+        if not folded_term:
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts ORDER BY id")
+        elif len(folded_term) < 3:
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts "
+                               "WHERE instr(search_key, ?) > 0 ORDER BY id", (folded_term,))
+        else:
+            phrase = '"' + folded_term.replace('"', '""') + '"'
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts WHERE id IN "
+                               "(SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?) ORDER BY id",
+                               (phrase,))
+        return ((row[0], Contact(row[1], row[2], row[3], row[0])) for row in rows)
+
+    def search_many(self, folded_terms: Iterable[str],
+                    keys: Optional[Dict[int, SearchKey]] = None) -> Dict[str, Dict[int, Contact]]:
+        """Каждая строка ищется по индексу базы: это быстрее прохода по всей книге"""
+        return {term: dict(self.search(term)) for term in folded_terms}
+
+    def find_phone(self, digits: str, prefix: bool = False) -> Iterator[Tuple[int, Contact]]:
+        """Контакты с нормализованным номером digits (или начинающимся с него)"""
+        if prefix:
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts "
+                               "WHERE phone_digits >= ? AND phone_digits < ? ORDER BY id",
+                               (digits, digits + _MAX_CHAR))
+        else:
+            rows = self._fetch("SELECT id, name, phone, comment FROM contacts "
+                               "WHERE phone_digits = ? ORDER BY id", (digits,))
+        return ((row[0], Contact(row[1], row[2], row[3], row[0])) for row in rows)
+
+    def sorted_ids(self, field: str, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[int]:
+        """ID по возрастанию значения поля без учета регистра, с семантикой границ SortedIndex"""
+        column = _SORT_COLUMNS[field]
+        query = f"SELECT id FROM contacts WHERE {column} >= ?"
+        params = [(start or '').lower()]
+        if end is not None:
+            query += f" AND {column} < ?"
+            params.append(end.lower() + _MAX_CHAR)
+        rows = self._fetch(query + f" ORDER BY {column}, id", params)
+        return (row[0] for row in rows)
+
+    def _changed(self) -> None:
+        """Учет изменения в текущей пакетной транзакции"""
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.save()
+
+    def __getitem__(self, contact_id: int) -> Contact:
+        row = self._fetchone("SELECT name, phone, comment FROM contacts WHERE id = ?", (contact_id,))
+        if row is None:
+            raise KeyError(contact_id)
+        return Contact(row[0], row[1], row[2], contact_id)
+
+    def __setitem__(self, contact_id: int, contact: Contact) -> None:
+        values = _row_values(contact_id, (contact.name, contact.phone, contact.comment))
+        with self._lock:
+            if self._write(_INSERT_OR_IGNORE, values):
+                if self._count is not None:
+                    self._count += 1
+            else:
+                self._write(_UPDATE, values[1:] + values[:1])
+            self._changed()
+
+    def __delitem__(self, contact_id: int) -> None:
+        with self._lock:
+            if not self._write("DELETE FROM contacts WHERE id = ?", (contact_id,)):
+                raise KeyError(contact_id)
+            if self._count is not None:
+                self._count -= 1
+            self._changed()
+
+    def __contains__(self, contact_id: object) -> bool:
+        return self._fetchone("SELECT 1 FROM contacts WHERE id = ?", (contact_id,)) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[0] for row in self._fetch("SELECT id FROM contacts ORDER BY id"))
+
+    def __len__(self) -> int:
+        # count(*) перебирает индекс, поэтому считается один раз, дальше поддерживается
+        with self._lock:
+            if self._count is None:
+                self._count = self._fetchone("SELECT count(*) FROM contacts")[0]
+            return self._count
+
+    def values(self) -> ValuesView:
+        return _ValuesView(self)
+
+    def items(self) -> ItemsView:
+        return _ItemsView(self)
+
+    def _iter_contacts(self) -> Iterator[Contact]:
+        """Все контакты одним запросом, без обращения по каждому ID"""
+        return (Contact(*fields, contact_id) for contact_id, fields in self.iter_rows())
+
+    def copy(self) -> Dict[int, Contact]:
+        """Копия контактов в виде словаря"""
+        return dict(self.items())
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self) -> Iterator[Contact]:
+        return self._mapping._iter_contacts()
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self) -> Iterator:
+        return ((contact.id, contact) for contact in self._mapping._iter_contacts())
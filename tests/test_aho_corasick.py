@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.aho_corasick import AhoCorasick
+from model.contact import Contact
+from model.phonebook import PhoneBook
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Тесты автомата Ахо-Корасик"""
+
+    def test_find_all(self):
+        """Находятся все образцы, включая вложенные и перекрывающиеся"""
+        automaton = AhoCorasick(["he", "she", "his", "hers", "xyz"])
+        self.assertEqual(automaton.find_all("ushers"), {0, 1, 3})
+        self.assertEqual(automaton.find_all("ahishers"), {0, 1, 2, 3})
+        self.assertEqual(automaton.find_all("xy"), set())
+
+    def test_matches_naive_search(self):
+        """Результат совпадает с проверкой каждого образца оператором in"""
+        patterns = ["аба", "ба", "а", "бааб", "ааа", "абв"]
+        automaton = AhoCorasick(patterns)
+        for text in ("абааба", "ааааб", "вбв", "абвабааб", ""):
+            with self.subTest(text=text):
+                expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+                self.assertEqual(automaton.find_all(text), expected)
+
+
+class TestFindContactsMany(unittest.TestCase):
+    """Тесты пакетного поиска контактов"""
+
+    def setUp(self):
+        self.phonebook = PhoneBook()
+        self.phonebook.add_contacts([
+            Contact("Иван Иванов", "+79123456789", "Коллега"),
+            Contact("Мария Петрова", "+79987654321", "Подруга"),
+            Contact("Алексей Сидоров", "+79555555555", "Друг"),
+            Contact("Косивченко", "8981563213", "Отус Студент"),
+        ])
+        self.terms = ["иван", "ИВАН", "+7", "друг", "ов", "555", "", "нет такого", "а;+7", "Сидоров\x00"]
+
+    def test_matches_find_contacts(self):
+        """Результат для каждой строки совпадает с find_contacts"""
+        results = self.phonebook.find_contacts_many(self.terms)
+        self.assertEqual(list(results), self.terms)
+        for term in self.terms:
+            with self.subTest(term=term):
+                self.assertEqual(results[term], self.phonebook.find_contacts(term))
+
+    def test_cache_follows_mutations(self):
+        """Кэш полей обновляется при изменении и удалении контактов"""
+        self.phonebook.find_contacts_many(["иван"])
+        self.phonebook.update_contact(1, name="Петр Петров")
+        self.phonebook.delete_contact(3)
+        results = self.phonebook.find_contacts_many(["иван", "петр", "сидоров"])
+        self.assertEqual(results["иван"], {})
+        self.assertEqual(list(results["петр"]), [1, 2])
+        self.assertEqual(results["сидоров"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.file_handler import FileHandler
+from model.journal import Journal
+from exceptions import FileOperationError
+
+
+class TestAsyncPhoneBook(unittest.IsolatedAsyncioTestCase):
+    """Тесты асинхронного открытия и сохранения"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.book_path = os.path.join(self.temp_dir.name, "book.txt")
+        with open(self.book_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n\nМария Петрова;+79987654321;Подруга")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_aopen(self):
+        """Асинхронное открытие дает тот же результат, что и open"""
+        phonebook = PhoneBook(ngram_index=True)
+        self.assertTrue(await phonebook.aopen(self.book_path))
+
+        self.assertTrue(phonebook.is_open)
+        self.assertEqual(sorted(c.id for c in phonebook), [1, 3])
+        self.assertEqual(list(phonebook.find_contacts("петрова")), [3])
+
+    async def test_aopen_failure(self):
+        """Ошибка асинхронного открытия"""
+        phonebook = PhoneBook()
+        with self.assertRaises(FileOperationError):
+            await phonebook.aopen(os.path.join(self.temp_dir.name, "nonexistent.txt"))
+        self.assertFalse(phonebook.is_open)
+
+    async def test_asave_uses_state_at_call(self):
+        """Сохраняется состояние на момент вызова asave"""
+        for storage in ('dict', 'columnar'):
+            with self.subTest(storage=storage):
+                phonebook = PhoneBook(storage=storage)
+                await phonebook.aopen(self.book_path)
+                phonebook.add_contact(Contact("Алексей Сидоров", "+79555555555", "Друг"))
+                target = os.path.join(self.temp_dir.name, f"{storage}.txt")
+
+                save = asyncio.create_task(phonebook.asave(target))
+                await asyncio.sleep(0)  # asave снимает копию и уходит в executor
+                phonebook.update_contact(1, name="Изменен после вызова")
+                await save
+
+                saved = FileHandler().load(target)
+                self.assertEqual(saved[1][0], "Иван Иванов")
+                self.assertEqual(len(saved), 3)
+
+    async def test_asave_snapshot(self):
+        """Асинхронное сохранение снимка"""
+        phonebook = PhoneBook()
+        await phonebook.aopen(self.book_path)
+        target = os.path.join(self.temp_dir.name, "book.snap")
+        await phonebook.asave(target, format='snapshot')
+
+        reopened = PhoneBook()
+        await reopened.aopen(target)
+        self.assertEqual(sorted(c.id for c in reopened), [1, 3])
+
+    async def test_asave_journal(self):
+        """В режиме журнала asave сбрасывает журнал"""
+        phonebook = PhoneBook(journal=True)
+        await phonebook.aopen(self.book_path)
+        phonebook.delete_contact(1)
+        await phonebook.asave()
+
+        self.assertEqual(list(Journal(self.book_path).replay()), [('delete', 1, None)])
+        phonebook.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controller.batch_controller import main
+from model.phonebook import PhoneBook
+
+
+class TestBatchController(unittest.TestCase):
+    """Тесты командного режима с потоковым вводом и выводом"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'book.txt')
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n"
+                    "Мария Петрова;+79987654321;Подруга\n"
+                    "Иван Иванов;8 (912) 345-67-89;\n"
+                    "Ольга Иванова;+79111111111;Сестра\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_command(self, *argv: str, stdin: str = ''):
+        """Запуск команды, возвращает код выхода, stdout и stderr"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = main(list(argv), io.StringIO(stdin), stdout, stderr)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_find_terms(self):
+        """Поиск по аргументам выводит строки запрос, ID, имя, телефон, комментарий"""
+        code, out, _ = self.run_command('find', 'петрова', 'нет такого', '--file', self.file_path)
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "петрова\t2\tМария Петрова\t+79987654321\tПодруга\n")
+
+    def test_find_stdin_batches(self):
+        """Запросы из stdin обрабатываются пакетами, пустые строки пропускаются"""
+        code, out, _ = self.run_command('find', '--file', self.file_path, '--batch-size', '1', '--format', 'json',
+                                        stdin="сестра\n\nмария\n")
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual([(row['query'], row['id']) for row in rows], [("сестра", 4), ("мария", 2)])
+        self.assertEqual(rows[0]['name'], "Ольга Иванова")
+
+    def test_import_new_file(self):
+        """Импорт создает книгу, выводит ID и сообщает о некорректных строках"""
+        new_path = os.path.join(self.temp_dir.name, 'new.txt')
+        code, out, err = self.run_command('import', '--file', new_path, '--batch-size', '2',
+                                          stdin="Петр Петров;+70000000001;\nбез телефона\nАнна;;Соседка\n")
+        self.assertEqual(code, 1)
+        self.assertEqual(out, "1\n2\n")
+        self.assertIn("Строка 2", err)
+        phonebook = PhoneBook()
+        phonebook.open(new_path)
+        self.assertEqual([c.name for c in phonebook], ["Петр Петров", "Анна"])
+
+    def test_import_keeps_printed_ids(self):
+        """Выведенные при импорте ID совпадают с ID после сохранения, пустые строки пропускаются"""
+        gap_path = os.path.join(self.temp_dir.name, 'gaps.txt')
+        with open(gap_path, 'w', encoding='utf-8') as f:
+            f.write("Анна;+70000000001;x\n\nБорис;+70000000002;y")
+        code, out, err = self.run_command('import', '--file', gap_path, stdin="Вера;+70000000003;\n\n")
+        self.assertEqual((code, out, err), (0, "4\n", ""))
+        self.assertEqual(self.run_command('find', 'вера', '--file', gap_path)[1],
+                         "вера\t4\tВера\t+70000000003\t\n")
+
+    def test_export_round_trip(self):
+        """Вывод export в формате text читается командой import"""
+        code, out, _ = self.run_command('export', '--file', self.file_path, '--batch-size', '3')
+        self.assertEqual(code, 0)
+        copy_path = os.path.join(self.temp_dir.name, 'copy.txt')
+        self.assertEqual(self.run_command('import', '--file', copy_path, stdin=out)[0], 0)
+        original, copy = PhoneBook(), PhoneBook()
+        original.open(self.file_path)
+        copy.open(copy_path)
+        self.assertEqual(copy.get_all_contacts(), original.get_all_contacts())
+
+        code, out, _ = self.run_command('export', '--file', self.file_path, '--format', 'tsv')
+        self.assertEqual(out.splitlines()[1], "2\tМария Петрова\t+79987654321\tПодруга")
+
+    def test_dedupe_and_merge(self):
+        """dedupe выводит группы дубликатов, --merge сливает их и сохраняет книгу"""
+        self.assertEqual(self.run_command('dedupe', '--file', self.file_path)[1], "1\t3\n")
+        code, out, _ = self.run_command('dedupe', '--file', self.file_path, '--merge', 'first')
+        self.assertEqual((code, out), (0, "1\t3\n"))
+        self.assertEqual(self.run_command('dedupe', '--file', self.file_path)[1], "")
+
+    def test_stats(self):
+        """Сводка по книге и время открытия"""
+        code, out, _ = self.run_command('stats', '--file', self.file_path)
+        self.assertEqual(code, 0)
+        stats = dict(line.split('\t') for line in out.splitlines())
+        self.assertEqual((stats['contacts'], stats['with_phone'], stats['with_comment'], stats['unique_phones']),
+                         ('4', '4', '3', '3'))
+        self.assertIn('open_ms', stats)
+
+    def test_errors(self):
+        """Ошибка открытия книги дает код выхода 1 и сообщение в stderr"""
+        code, out, err = self.run_command('find', 'иван', '--file', os.path.join(self.temp_dir.name, 'missing.txt'))
+        self.assertEqual((code, out), (1, ""))
+        self.assertTrue(err.startswith("Ошибка:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import subprocess
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.data import generate_contacts, write_book
+from benchmarks.run import BENCHMARKS, BenchmarkEnv, compare, measure
+from model.file_handler import FileHandler
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Тесты набора замеров производительности"""
+
+    def test_generator_is_deterministic(self):
+        """Одинаковый seed дает одинаковые контакты, которые читаются из файла"""
+        first = [c.to_list() for c in generate_contacts(50)]
+        self.assertEqual(first, [c.to_list() for c in generate_contacts(50)])
+        self.assertNotEqual(first, [c.to_list() for c in generate_contacts(50, seed=1)])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "book.txt")
+            write_book(path, 50)
+            self.assertEqual(list(FileHandler().load(path).values()), first)
+
+    def test_measure_all(self):
+        """Каждый замер выдает пропускную способность и пик памяти"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env = BenchmarkEnv(100, temp_dir)
+            for name, benchmark in BENCHMARKS.items():
+                with self.subTest(name=name):
+                    result = measure(benchmark, env, repeat=1)
+                    self.assertGreater(result['throughput'], 0)
+                    self.assertIn('peak_mb', result)
+            self.assertIn('p95_ms', measure(BENCHMARKS['find_contacts'], env, memory=False, repeat=1))
+
+    def test_compare(self):
+        """Регрессией считается ухудшение сверх допуска"""
+        baseline = {'load': {'throughput': 100.0, 'peak_mb': 10.0}, 'find_contacts': {'p95_ms': 2.0}}
+        self.assertEqual(compare({'load': {'throughput': 80.0, 'peak_mb': 12.0}}, baseline), [])
+        self.assertEqual(len(compare({'load': {'throughput': 70.0, 'peak_mb': 13.0},
+                                      'find_contacts': {'p95_ms': 1.0}}, baseline)), 2)
+        self.assertEqual(compare({'save': {'throughput': 1.0}}, baseline), [])
+
+    def test_compare_ignores_timer_noise(self):
+        """Рост субмикросекундной задержки в разы, но меньше MIN_DELTA, не регрессия"""
+        baseline = {'add_contact': {'p95_ms': 0.0005, 'p99_ms': 0.0005}}
+        self.assertEqual(compare({'add_contact': {'p95_ms': 0.0009, 'p99_ms': 0.0009}}, baseline), [])
+        self.assertEqual(len(compare({'add_contact': {'p95_ms': 0.1, 'p99_ms': 0.0009}}, baseline)), 1)
+
+    def test_run_as_script(self):
+        """Скрипт замеров запускается напрямую, а не только через -m"""
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'run.py')
+        result = subprocess.run([sys.executable, script, '--help'], capture_output=True, cwd=os.sep)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.base import BaseContactStore
+from model.columnar_store import ColumnarContactStore
+from model.memory_store import DictContactStore
+from exceptions import ContactNotFoundError
+
+
+class TestColumnarContactStore(unittest.TestCase):
+    """Тесты колоночного хранилища контактов"""
+
+    def setUp(self):
+        self.phonebook = PhoneBook(storage='columnar')
+        self.phonebook.add_contacts([
+            Contact("Иван Иванов", "+79123456789", "Коллега"),
+            Contact("Мария Петрова", "+79987654321", "Подруга"),
+            Contact("Алексей Сидоров", "+79555555555", "Друг"),
+        ])
+
+    def test_contact_has_slots(self):
+        """Контакт не имеет словаря атрибутов"""
+        self.assertFalse(hasattr(Contact("Иван", "1", ""), '__dict__'))
+
+    def test_store_mapping(self):
+        """Хранилище ведет себя как словарь ID -> Contact"""
+        store = ColumnarContactStore()
+        store[3] = Contact("Иван", "1", "a")
+        store.put_fields(1, ["Мария", "2", "b"])
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(list(store), [1, 3])
+        self.assertEqual(store[3].to_list(), ["Иван", "1", "a"])
+        self.assertEqual(store[3].id, 3)
+        self.assertNotIn(2, store)
+
+        del store[3]
+        self.assertEqual(list(store.iter_rows()), [(1, ("Мария", "2", "b"))])
+        with self.assertRaises(KeyError):
+            del store[3]
+        with self.assertRaises(ValueError):
+            store.put_fields(5, ["Только имя"])
+
+    def test_phonebook_operations(self):
+        """Основные операции книги с колоночным хранилищем"""
+        self.assertEqual(len(self.phonebook), 3)
+        self.assertEqual(list(self.phonebook.find_contacts("петрова")), [2])
+
+        updated = self.phonebook.update_contact(1, phone="+70000000000")
+        self.assertEqual(updated.phone, "+70000000000")
+        self.assertEqual(self.phonebook.get_contact(1).phone, "+70000000000")
+
+        self.assertEqual(self.phonebook.delete_contact(3).name, "Алексей Сидоров")
+        with self.assertRaises(ContactNotFoundError):
+            self.phonebook.get_contact(3)
+        self.assertEqual([c.name for c in self.phonebook], ["Иван Иванов", "Мария Петрова"])
+
+    def test_save_and_open(self):
+        """Сохранение и загрузка книги с колоночным хранилищем"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n\nМария Петрова;+79987654321;Подруга")
+            temp_path = f.name
+
+        try:
+            phonebook = PhoneBook(storage='columnar')
+            phonebook.open(temp_path)
+            self.assertEqual(sorted(c.id for c in phonebook), [1, 3])
+
+            phonebook.add_contact(Contact("Алексей Сидоров", "+79555555555", "Друг"))
+            phonebook.save()
+
+            with open(temp_path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+            self.assertEqual(lines, ["Иван Иванов;+79123456789;Коллега",
+                                     "Мария Петрова;+79987654321;Подруга",
+                                     "Алексей Сидоров;+79555555555;Друг"])
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def test_unknown_storage(self):
+        """Неизвестный тип хранилища"""
+        with self.assertRaises(ValueError):
+            PhoneBook(storage='unknown')
+
+    def test_store_interface(self):
+        """Словарь и колоночное хранилище одинаково отвечают на операции BaseContactStore"""
+        for store in (DictContactStore(), ColumnarContactStore()):
+            with self.subTest(store=type(store).__name__):
+                self.assertIsInstance(store, BaseContactStore)
+                for contact in self.phonebook:
+                    store[contact.id] = contact
+                self.assertEqual(store.max_id(), 3)
+                self.assertEqual([cid for cid, _ in store.frozen_rows()], [1, 2, 3])
+                self.assertEqual([cid for cid, _ in store.search("иван")], [1])
+                self.assertEqual(sorted(store.search_many(["", "петр"])['']), [1, 2, 3])
+                self.assertEqual([cid for cid, _ in store.find_phone("7955", prefix=True)], [3])
+                self.assertEqual(list(store.sorted_ids('name')), [3, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
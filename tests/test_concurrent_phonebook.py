@@ -0,0 +1,188 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.concurrent_phonebook import ConcurrentPhoneBook, RWLock
+from exceptions import ContactNotFoundError
+
+
+class TestRWLock(unittest.TestCase):
+    """Тесты блокировки читатели-писатель"""
+
+    def test_readers_share_lock(self):
+        """Два читателя удерживают блокировку одновременно"""
+        lock = RWLock()
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read_locked():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(both_inside.broken)
+
+    def test_writer_excludes_readers(self):
+        """Читатель ждет, пока писатель не отпустит блокировку"""
+        lock = RWLock()
+        events = []
+
+        def reader_target():
+            with lock.read_locked():
+                events.append('read')
+
+        lock.acquire_write()
+        reader = threading.Thread(target=reader_target)
+        reader.start()
+        reader.join(0.1)
+        events.append('write done')
+        lock.release_write()
+        reader.join(5)
+        self.assertEqual(events, ['write done', 'read'])
+
+    def test_reentrancy(self):
+        """Повторный вход, чтение под записью и запрет повышения чтения до записи"""
+        lock = RWLock()
+        with lock.write_locked():
+            with lock.write_locked():
+                with lock.read_locked():
+                    pass
+        with lock.read_locked():
+            with lock.read_locked():
+                with self.assertRaises(RuntimeError):
+                    lock.acquire_write()
+        with lock.write_locked():
+            pass
+
+
+class TestConcurrentPhoneBook(unittest.TestCase):
+    """Тесты телефонной книги под нагрузкой из нескольких потоков"""
+
+    THREADS = 8
+
+    def setUp(self):
+        self.phonebook = ConcurrentPhoneBook(ngram_index=True)
+        self.phonebook.add_contacts(Contact(f"Контакт {i}", f"+7900{i:07d}", "Коллега" if i % 2 else "Друг")
+                                    for i in range(500))
+
+    def run_threads(self, target, count=THREADS):
+        errors = []
+
+        def wrapper(number):
+            try:
+                target(number)
+            except Exception as error:  # Ошибка в потоке не должна потеряться
+                errors.append(error)
+
+        threads = [threading.Thread(target=wrapper, args=(number,)) for number in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_add_unique_ids(self):
+        """Одновременные добавления получают разные ID"""
+        ids = []
+
+        def writer(number):
+            for i in range(200):
+                ids.append(self.phonebook.add_contact(Contact(f"Поток {number} {i}", "", "")))
+
+        self.run_threads(writer)
+        self.assertEqual(len(set(ids)), self.THREADS * 200)
+        self.assertEqual(len(self.phonebook), 500 + self.THREADS * 200)
+
+    def test_readers_and_writers(self):
+        """Поиск и перебор не падают при одновременных изменениях и удалениях"""
+        def worker(number):
+            if number % 2:
+                for contact_id in range(number, 501, self.THREADS):
+                    try:
+                        self.phonebook.update_contact(contact_id, comment="Сосед")
+                        self.phonebook.delete_contact(contact_id)
+                    except ContactNotFoundError:
+                        pass
+            else:
+                for _ in range(30):
+                    for contact_id, contact in self.phonebook.find_contacts("коллега", lazy=True):
+                        self.assertIn("Коллега", contact.comment)
+                    self.phonebook.find_contacts_many(["друг", "сосед"])
+                    list(self.phonebook)
+                    self.phonebook.get_page(size=50)
+                    dict(self.phonebook.view())
+
+        self.run_threads(worker)
+        remaining = {contact.id for contact in self.phonebook}
+        self.assertFalse(any(contact_id % 2 for contact_id in remaining))
+        self.assertEqual(self.phonebook.find_contacts("сосед"), {})
+
+    def test_snapshot_results(self):
+        """Ленивый поиск и view не видят изменений после вызова"""
+        matches = self.phonebook.find_contacts("друг", lazy=True)
+        view = self.phonebook.view()
+        self.phonebook.delete_contact(1)
+        self.assertIn(1, dict(matches))
+        self.assertIn(1, view)
+
+    def test_save_and_asave(self):
+        """Сохранение, в том числе асинхронное, под блокировкой"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'book.txt')
+            open(file_path, 'w', encoding='utf-8').close()
+            phonebook = ConcurrentPhoneBook()
+            phonebook.open(file_path)
+            phonebook.add_contacts(Contact(c.name, c.phone, c.comment) for c in self.phonebook)
+            phonebook.save()
+            phonebook.delete_contact(1)
+            asyncio.run(phonebook.asave())
+            reopened = ConcurrentPhoneBook()
+            reopened.open(file_path)
+            self.assertEqual(len(reopened), 499)
+
+    def test_file_written_without_lock(self):
+        """Пока сохранение и сжатие пишут файл, чтение и изменения книги не ждут"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'book.txt')
+            open(file_path, 'w', encoding='utf-8').close()
+            phonebook = ConcurrentPhoneBook(journal=True)
+            phonebook.open(file_path)
+            phonebook.add_contacts(Contact(c.name, c.phone, c.comment) for c in self.phonebook)
+            write_rows = phonebook._write_rows
+            added = []
+
+            def slow_write(*args, **kwargs):
+                # Другой поток читает и изменяет книгу, пока файл еще не записан
+                def other():
+                    added.append(len(phonebook.find_contacts("коллега")))
+                    added.append(phonebook.add_contact(Contact("Во время записи", "", "")))
+                thread = threading.Thread(target=other)
+                thread.start()
+                thread.join(timeout=5)
+                self.assertFalse(thread.is_alive())
+                write_rows(*args, **kwargs)
+
+            phonebook._write_rows = slow_write
+            phonebook.save(os.path.join(temp_dir, 'copy.txt'))
+            phonebook.compact()
+            phonebook.close()
+            self.assertEqual(added[1::2], [501, 502])
+
+            reopened = ConcurrentPhoneBook(journal=True)
+            reopened.open(file_path)
+            self.assertEqual(len(reopened), 502)
+            self.assertEqual(set(reopened.find_contacts("во время записи")), {501, 502})
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.dedup import MinHashLSH, jaccard, name_key, shingles
+from exceptions import ReadOnlyError
+
+
+class TestDedup(unittest.TestCase):
+    """Тесты поиска и слияния дубликатов"""
+
+    def setUp(self):
+        self.phonebook = PhoneBook()
+        self.phonebook.add_contacts([
+            Contact("Иванов Иван", "89102865656", "Коллега"),
+            Contact("Иван Иванов", "+7 (910) 286-56-56", ""),
+            Contact("Мария Петрова", "+79987654321", "Подруга"),
+            Contact("Иван Иванов", "+79000000000", "Другой Иван"),
+            Contact("Косивченко Алексей", "8981563213", ""),
+            Contact("Косивченко Алексей", "", "Отус Студент, группа 2"),
+            Contact("Петрова Мария", "+79987654321", ""),
+            Contact("Алексей Сидоров", "+79555555555", "Друг"),
+        ])
+
+    def test_name_key(self):
+        """Ключ имени не зависит от регистра, ё/е, знаков и порядка слов"""
+        self.assertEqual(name_key("Фёдоров, Иван"), name_key("иван  федоров"))
+        self.assertEqual(name_key("   "), "")
+
+    def test_minhash_estimates_similarity(self):
+        """Похожие множества попадают в общие корзины, непохожие - нет"""
+        lsh = MinHashLSH()
+        a, b, c = shingles("алексей сидоров"), shingles("алексей сидорова"), shingles("мария петрова")
+        self.assertGreaterEqual(jaccard(a, b), 0.7)
+        for key, items in (("a", a), ("b", b), ("c", c)):
+            lsh.add(key, items)
+        self.assertEqual(set(lsh.candidate_pairs()), {("a", "b")})
+        self.assertEqual(lsh.signature(a), MinHashLSH().signature(a))
+
+    def test_find_duplicates(self):
+        """Группы учитывают нормализацию номера и пустые номера"""
+        self.assertEqual(self.phonebook.find_duplicates(), [[1, 2], [3, 7], [5, 6]])
+
+    def test_near_duplicates(self):
+        """Похожие имена находятся через LSH, точное сравнение их не находит"""
+        self.phonebook.add_contact(Contact("Сидорова Алексей", "8 955 555 55 55", ""))
+        self.phonebook.add_contact(Contact("Косевченко Алексей", "", ""))
+        self.assertEqual(self.phonebook.find_duplicates(), [[1, 2], [3, 7], [5, 6, 10], [8, 9]])
+        self.assertNotIn([8, 9], self.phonebook.find_duplicates(threshold=1))
+
+    def test_merge_first(self):
+        """Стратегия first оставляет наименьший ID"""
+        report = self.phonebook.merge_duplicates()
+        self.assertEqual(report, {1: [2], 3: [7], 5: [6]})
+        self.assertEqual(sorted(c.id for c in self.phonebook), [1, 3, 4, 5, 8])
+        self.assertEqual(self.phonebook.find_duplicates(), [])
+
+    def test_merge_last_and_longest(self):
+        """Стратегии last и longest"""
+        phonebook = PhoneBook()
+        phonebook.add_contacts(Contact(c.name, c.phone, c.comment) for c in self.phonebook)
+        self.assertEqual(phonebook.merge_duplicates('last'), {2: [1], 7: [3], 6: [5]})
+
+        report = self.phonebook.merge_duplicates('longest')
+        self.assertEqual(report[5], [6])
+        self.assertEqual(self.phonebook.get_contact(5).to_list(),
+                         ["Косивченко Алексей", "8981563213", "Отус Студент, группа 2"])
+
+    def test_merge_errors(self):
+        """Неизвестная стратегия и книга только для чтения"""
+        with self.assertRaises(ValueError):
+            self.phonebook.merge_duplicates('random')
+        self.phonebook._read_only = True
+        with self.assertRaises(ReadOnlyError):
+            self.phonebook.merge_duplicates()
+
+
+if __name__ == '__main__':
+    unittest.main()
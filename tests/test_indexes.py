@@ -0,0 +1,261 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.ngram_index import NGramIndex
+from model.phone_index import normalize_phone, normalize_phone_prefix
+from model.sorted_index import SortedIndex
+from model.fuzzy_index import FuzzyIndex, edit_distance
+
+
+def make_contacts():
+    return [
+        Contact("Иван Иванов", "+79123456789", "Коллега"),
+        Contact("Мария Петрова", "+79987654321", "Подруга"),
+        Contact("Алексей Сидоров", "+79555555555", "Друг"),
+        Contact("Косивченко", "8981563213", "Отус Студент"),
+        Contact("Test@Name", "+123", "Comment#123"),
+    ]
+
+
+class TestNGramIndex(unittest.TestCase):
+    """Тесты n-граммного индекса"""
+
+    def setUp(self):
+        self.plain = PhoneBook()
+        self.indexed = PhoneBook(ngram_index=True)
+        for contact in make_contacts():
+            self.plain.add_contact(contact)
+        for contact in make_contacts():
+            self.indexed.add_contact(contact)
+
+    def assertSameResults(self, search_term):
+        expected = {cid: c.to_list() for cid, c in self.plain.find_contacts(search_term).items()}
+        actual = {cid: c.to_list() for cid, c in self.indexed.find_contacts(search_term).items()}
+        self.assertEqual(actual, expected)
+
+    def test_results_match_full_scan(self):
+        """Результаты поиска с индексом совпадают с полным перебором"""
+        for search_term in ["Иван", "иван", "петрова", "+7912345", "коллега", "нет",
+                            "", " ", "@", "#12", "a" * 100, "студ", "55555"]:
+            with self.subTest(search_term=search_term):
+                self.assertSameResults(search_term)
+
+    def test_index_follows_mutations(self):
+        """Индекс обновляется при изменении и удалении контактов"""
+        self.plain.update_contact(1, name="Пётр Первый")
+        self.indexed.update_contact(1, name="Пётр Первый")
+        self.plain.delete_contact(2)
+        self.indexed.delete_contact(2)
+
+        for search_term in ["Иван", "Пётр", "Петрова", "Первый"]:
+            with self.subTest(search_term=search_term):
+                self.assertSameResults(search_term)
+
+    def test_candidates(self):
+        """Кандидаты сужают поиск, короткий запрос не использует индекс"""
+        index = NGramIndex()
+        index.add(1, Contact("Иван", "123", ""))
+        index.add(2, Contact("Мария", "456", ""))
+
+        self.assertEqual(index.candidates("ива"), {1})
+        self.assertEqual(index.candidates("xyz"), set())
+        self.assertIsNone(index.candidates("ив"))
+
+        index.remove(1, Contact("Иван", "123", ""))
+        self.assertEqual(index.candidates("ива"), set())
+
+
+
+class TestPhoneIndex(unittest.TestCase):
+    """Тесты префиксного дерева телефонов"""
+
+    def setUp(self):
+        self.plain = PhoneBook()
+        self.indexed = PhoneBook(phone_index=True)
+        for contact in make_contacts():
+            self.plain.add_contact(contact)
+        for contact in make_contacts():
+            self.indexed.add_contact(contact)
+
+    def test_normalize_phone(self):
+        """Нормализация разных форматов номера"""
+        test_cases = [
+            ("+7 (898) 156", "7898156"),
+            ("8981563213", "78981563213"),
+            ("8 (981) 156-32-13", "79811563213"),
+            ("+1-800-123-4567", "18001234567"),
+            ("456464646", "456464646"),
+            ("нет номера", ""),
+        ]
+        for phone, expected in test_cases:
+            with self.subTest(phone=phone):
+                self.assertEqual(normalize_phone(phone), expected)
+
+    def test_normalize_phone_prefix(self):
+        """Ведущая 8 префикса заменяется на 7 при любой длине"""
+        test_cases = [
+            ("8981", "7981"),
+            ("8 (981) 156", "7981156"),
+            ("8 (981) 156-32-13", "79811563213"),
+            ("+7 981", "7981"),
+            ("+8 981", "8981"),
+            ("981", "981"),
+            ("9811563213", "79811563213"),
+        ]
+        for prefix, expected in test_cases:
+            with self.subTest(prefix=prefix):
+                self.assertEqual(normalize_phone_prefix(prefix), expected)
+
+    def test_prefix_lookup_across_formats(self):
+        """Префикс с 8 находит номера с +7 и наоборот"""
+        for phonebook in (self.plain, self.indexed):
+            phonebook.add_contact(Contact("Ёлкин", "89811563213", ""))
+            phonebook.add_contact(Contact("Сосновкин", "+7 981 156 00 00", ""))
+            with self.subTest(indexed=phonebook is self.indexed):
+                for prefix in ("8981", "8 (981) 156", "+7981", "7981", "+7 (981) 156"):
+                    with self.subTest(prefix=prefix):
+                        self.assertEqual(list(phonebook.find_by_phone_prefix(prefix)), [6, 7])
+                self.assertEqual(list(phonebook.find_by_phone_prefix("8 981 156 32")), [6])
+
+    def test_prefix_lookup_ignores_formatting(self):
+        """Поиск по префиксу не зависит от форматирования номера"""
+        for phonebook in (self.plain, self.indexed):
+            with self.subTest(indexed=phonebook is self.indexed):
+                results = phonebook.find_by_phone_prefix("+7 (898) 156")
+                self.assertEqual([c.name for c in results.values()], ["Косивченко"])
+                self.assertEqual(len(phonebook.find_by_phone_prefix("+7 9")), 3)
+                self.assertEqual(phonebook.find_by_phone_prefix("---"), {})
+
+    def test_exact_lookup(self):
+        """Точный поиск по номеру в разных форматах"""
+        for phonebook in (self.plain, self.indexed):
+            with self.subTest(indexed=phonebook is self.indexed):
+                self.assertEqual(list(phonebook.find_by_phone("+7 (898) 156-32-13")), [4])
+                self.assertEqual(phonebook.find_by_phone("+7981156"), {})
+
+    def test_index_follows_mutations(self):
+        """Индекс телефонов обновляется при изменении и удалении"""
+        self.indexed.update_contact(4, phone="+7 999 000 11 22")
+        self.assertEqual(self.indexed.find_by_phone_prefix("898"), {})
+        self.assertEqual(list(self.indexed.find_by_phone("89990001122")), [4])
+
+        self.indexed.delete_contact(4)
+        self.assertEqual(self.indexed.find_by_phone("89990001122"), {})
+        self.assertEqual(len(self.indexed.find_by_phone_prefix("7")), 3)
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Тесты упорядоченного индекса"""
+
+    def setUp(self):
+        self.plain = PhoneBook()
+        self.indexed = PhoneBook(sorted_index=True)
+        for contact in make_contacts() + [Contact("ивлев", "+79000000000", ""), Contact("Икар", "+7911", "")]:
+            self.plain.add_contact(contact)
+            self.indexed.add_contact(Contact(contact.name, contact.phone, contact.comment))
+
+    def names(self, book, **kwargs):
+        return [contact.name for _, contact in book.list_sorted(**kwargs)]
+
+    def test_results_match_full_scan(self):
+        """Индекс и полная сортировка дают одинаковый порядок"""
+        for kwargs in ({}, {'by': 'phone'}, {'start': 'Ив', 'end': 'Ик'}, {'start': 'К'},
+                       {'end': 'И'}, {'start': 'ив', 'end': 'ив'}, {'limit': 2}):
+            with self.subTest(**kwargs):
+                self.assertEqual(self.names(self.indexed, **kwargs), self.names(self.plain, **kwargs))
+
+    def test_range_is_case_insensitive(self):
+        """Верхняя граница включает все значения с этим префиксом"""
+        self.assertEqual(self.names(self.indexed, start='Ив', end='Ик'), ["Иван Иванов", "ивлев", "Икар"])
+        self.assertEqual(self.names(self.indexed, start='ИВ', end='ИВ'), ["Иван Иванов", "ивлев"])
+
+    def test_index_follows_mutations(self):
+        """Индекс обновляется при изменении и удалении контактов"""
+        self.indexed.update_contact(1, name="Яков")
+        self.indexed.delete_contact(6)
+        self.assertEqual(self.names(self.indexed)[-1], "Яков")
+        self.assertNotIn("ивлев", self.names(self.indexed))
+        self.assertEqual(len(self.indexed._sorted_indexes['name']), len(self.indexed))
+
+    def test_unknown_field(self):
+        """Сортировка по неизвестному полю запрещена"""
+        with self.assertRaises(ValueError):
+            self.indexed.list_sorted(by='comment')
+
+    def test_many_keys(self):
+        """Блоки индекса делятся и сохраняют порядок"""
+        index = SortedIndex('name')
+        contacts = {i: Contact(f"{(i * 7919) % 5000:05d}", "", "") for i in range(1, 5001)}
+        for contact_id, contact in contacts.items():
+            index.add(contact_id, contact)
+        for contact_id in range(1, 5001, 2):
+            index.remove(contact_id, contacts[contact_id])
+        expected = sorted(range(2, 5001, 2), key=lambda i: (contacts[i].name, i))
+        self.assertEqual(list(index.iter_ids()), expected)
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    """Тесты нечеткого поиска по имени"""
+
+    def setUp(self):
+        self.plain = PhoneBook()
+        self.indexed = PhoneBook(fuzzy_index=True)
+        for contact in make_contacts() + [Contact("Косевченко Анна", "+7911", ""), Contact("Косивченков", "+7912", "")]:
+            self.plain.add_contact(contact)
+            self.indexed.add_contact(Contact(contact.name, contact.phone, contact.comment))
+
+    def test_edit_distance(self):
+        """Расстояние Левенштейна и ранний выход по порогу"""
+        self.assertEqual(edit_distance("косивченко", "косевченко"), 1)
+        self.assertEqual(edit_distance("", "abc"), 3)
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+
+    def test_ranked_results(self):
+        """Результаты упорядочены по расстоянию"""
+        self.assertEqual(list(self.indexed.fuzzy_find("Косевченко", max_distance=1)), [6, 4])
+        self.assertEqual(list(self.indexed.fuzzy_find("Косевченко")), [6, 4, 7])
+        self.assertEqual(list(self.indexed.fuzzy_find("косивченко анна")), [6])
+        self.assertEqual(self.indexed.fuzzy_find("Иавн", max_distance=0), {})
+
+    def test_results_match_full_scan(self):
+        """Индекс и полный перебор дают одинаковый результат"""
+        for term in ("Косевченко", "ивон", "Петрава Мария", "sidorov", "", "test name"):
+            for max_distance in (0, 1, 2, 3):
+                with self.subTest(term=term, max_distance=max_distance):
+                    self.assertEqual(list(self.indexed.fuzzy_find(term, max_distance)),
+                                     list(self.plain.fuzzy_find(term, max_distance)))
+
+    def test_index_follows_mutations(self):
+        """Индекс обновляется при изменении и удалении контактов"""
+        self.indexed.update_contact(4, name="Петренко")
+        self.indexed.delete_contact(6)
+        self.assertEqual(list(self.indexed.fuzzy_find("Косевченко")), [7])
+        self.indexed.add_contact(Contact("Косевченко", "+7913", ""))
+        self.assertEqual(list(self.indexed.fuzzy_find("Косевченко", 0)), [8])
+
+    def test_lazy_deletion_rebuild(self):
+        """Удаленные слова пропускаются и вычищаются перестройкой"""
+        index = FuzzyIndex(max_distance=1)
+        contacts = [Contact(f"слово{i}", "", "") for i in range(200)]
+        for contact_id, contact in enumerate(contacts):
+            index.add(contact_id, contact)
+        for contact_id, contact in enumerate(contacts[:150]):
+            index.remove(contact_id, contact)
+        self.assertEqual(index.search("слово1", 0), {})
+        self.assertEqual(index.search("слово199", 0), {199: 0})
+        self.assertLessEqual(len(index._dead), len(index) + 64)
+
+    def test_negative_distance(self):
+        """Отрицательное расстояние запрещено"""
+        with self.assertRaises(ValueError):
+            self.indexed.fuzzy_find("Иван", -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import tempfile
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.journal import Journal
+from exceptions import FileOperationError
+
+
+class TestJournal(unittest.TestCase):
+    """Тесты режима журнала изменений"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.book_path = os.path.join(self.temp_dir.name, "book.txt")
+        with open(self.book_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\nМария Петрова;+79987654321;Подруга")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_book(self):
+        with open(self.book_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def make_changes(self):
+        phonebook = PhoneBook(journal=True)
+        phonebook.open(self.book_path)
+        phonebook.add_contact(Contact("Алексей Сидоров", "+79555555555", "Друг"))
+        phonebook.update_contact(2, comment="Сестра")
+        phonebook.delete_contact(1)
+        return phonebook
+
+    def test_save_appends_to_journal_only(self):
+        """Сохранение дописывает журнал и не трогает основной файл"""
+        original = self.read_book()
+        phonebook = self.make_changes()
+        phonebook.save()
+        phonebook.close()
+
+        self.assertEqual(self.read_book(), original)
+        self.assertEqual(len(list(Journal(self.book_path).replay())), 3)
+
+    def test_open_replays_journal(self):
+        """При открытии журнал применяется к основному файлу"""
+        phonebook = self.make_changes()
+        phonebook.close()
+
+        reopened = PhoneBook(journal=True)
+        reopened.open(self.book_path)
+        self.assertEqual(sorted(c.id for c in reopened), [2, 3])
+        self.assertEqual(reopened.get_contact(2).comment, "Сестра")
+        self.assertEqual(reopened.get_contact(3).name, "Алексей Сидоров")
+
+    def test_compact_keeps_ids(self):
+        """Сжатие переносит журнал в файл и сохраняет ID"""
+        phonebook = self.make_changes()
+        phonebook.compact()
+        phonebook.close()
+
+        self.assertFalse(os.path.exists(self.book_path + Journal.SUFFIX))
+        self.assertEqual(self.read_book(),
+                         "\nМария Петрова;+79987654321;Сестра\nАлексей Сидоров;+79555555555;Друг")
+
+        reopened = PhoneBook(journal=True)
+        reopened.open(self.book_path)
+        self.assertEqual(reopened.get_contact(3).name, "Алексей Сидоров")
+
+    def test_torn_last_record_is_ignored(self):
+        """Оборванная последняя запись журнала пропускается"""
+        phonebook = self.make_changes()
+        phonebook.close()
+        with open(self.book_path + Journal.SUFFIX, 'a', encoding='utf-8') as f:
+            f.write('["add", 9, ["Оборв')
+
+        reopened = PhoneBook(journal=True)
+        reopened.open(self.book_path)
+        self.assertEqual(len(reopened), 2)
+
+        # Следующая дозапись отрезает оборванный хвост
+        reopened.add_contact(Contact("Новый", "1", ""))
+        reopened.close()
+        self.assertEqual(len(list(Journal(self.book_path).replay())), 4)
+
+    def test_corrupted_journal(self):
+        """Поврежденная запись в середине журнала вызывает ошибку"""
+        with open(self.book_path + Journal.SUFFIX, 'w', encoding='utf-8') as f:
+            f.write('мусор\n["delete", 1]\n')
+
+        with self.assertRaises(FileOperationError):
+            PhoneBook(journal=True).open(self.book_path)
+
+    def test_saved_file_mode(self):
+        """Атомарное сохранение дает новому файлу права по umask, а существующему - прежние"""
+        phonebook = PhoneBook()
+        phonebook.open(self.book_path)
+        umask = os.umask(0o022)
+        try:
+            for format in ('text', 'snapshot', 'sqlite'):
+                with self.subTest(format=format):
+                    new_path = os.path.join(self.temp_dir.name, f"new.{format}")
+                    phonebook.save(new_path, format=format)
+                    self.assertEqual(os.stat(new_path).st_mode & 0o777, 0o644)
+        finally:
+            os.umask(umask)
+        os.chmod(self.book_path, 0o640)
+        phonebook.save()
+        self.assertEqual(os.stat(self.book_path).st_mode & 0o777, 0o640)
+
+    def test_save_keeps_process_umask(self):
+        """Сохранение не меняет umask процесса даже на время: он общий для всех потоков"""
+        phonebook = PhoneBook()
+        phonebook.open(self.book_path)
+        with patch('os.umask', side_effect=AssertionError("umask изменен")):
+            for format in ('text', 'snapshot', 'sqlite'):
+                with self.subTest(format=format):
+                    phonebook.save(os.path.join(self.temp_dir.name, f"copy.{format}"), format=format)
+
+    def test_compact_without_journal(self):
+        """Сжатие без режима журнала недопустимо"""
+        phonebook = PhoneBook()
+        phonebook.open(self.book_path)
+        with self.assertRaises(ValueError):
+            phonebook.compact()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -95,17 +95,70 @@ class TestPhoneBookController(unittest.TestCase):
         with patch('controller.phonebook_controller.ConsoleView.show_contacts') as mock_show_contacts:
             with patch('controller.phonebook_controller.ConsoleView.show_message') as mock_show_message:
                 with patch.object(self.controller.phone_book, 'find_contacts') as mock_find:
-                    mock_find.return_value = {1: mock_contact}
+                    mock_find.return_value = iter([(1, mock_contact)])
+                    mock_show_contacts.return_value = 1
 
                     self.controller._find_contacts()
 
                     # Проверяем вызовы
                     mock_get_input.assert_called_once_with(text.input_word_to_find)
-                    mock_find.assert_called_once_with("Иван")
+                    mock_find.assert_called_once_with("Иван", lazy=True)
                     mock_show_contacts.assert_called_once()
                     mock_show_message.assert_called_once_with("Найдено контактов: 1")
 
 
+    def test_show_all_contacts_paging(self):
+        """Интеграционный тест постраничного показа контактов"""
+        from model.contact import Contact
+
+        self.controller.phone_book._is_open = True
+        self.controller.phone_book.add_contacts(
+            Contact(f"Контакт {i}", str(i), "") for i in range(1, text.page_size * 2 + 6))
+
+        with patch('controller.phonebook_controller.ConsoleView.get_input') as mock_get_input:
+            mock_get_input.side_effect = ["n", "p", "42", "q"]
+            with patch('controller.phonebook_controller.ConsoleView.show_contacts_page') as mock_page:
+                self.controller._show_all_contacts()
+
+        first_ids = [call_args[0][0][0][0] for call_args in mock_page.call_args_list]
+        self.assertEqual(first_ids, [1, text.page_size + 1, 1, 42])
+        self.assertEqual(len(mock_page.call_args_list[-1][0][0]), 4)
+
+    def test_show_all_contacts_last_page(self):
+        """Переход дальше последней страницы завершает просмотр"""
+        from model.contact import Contact
+
+        self.controller.phone_book._is_open = True
+        self.controller.phone_book.add_contact(Contact("Иван Иванов", "+79123456789", "Коллега"))
+
+        with patch('controller.phonebook_controller.ConsoleView.get_input') as mock_get_input:
+            mock_get_input.return_value = ""
+            with patch('controller.phonebook_controller.ConsoleView.show_message') as mock_show:
+                with patch('controller.phonebook_controller.ConsoleView.show_contacts_page'):
+                    self.controller._show_all_contacts()
+
+        mock_show.assert_called_once_with(text.page_last)
+
+    def test_show_all_contacts_beyond_last_id(self):
+        """С пустой страницы после перехода за последний ID листание продолжается от него"""
+        from model.contact import Contact
+
+        self.controller.phone_book._is_open = True
+        self.controller.phone_book.add_contacts(
+            Contact(f"Контакт {i}", str(i), "") for i in range(1, text.page_size + 6))
+        last_id = text.page_size + 5
+
+        with patch('controller.phonebook_controller.ConsoleView.get_input') as mock_get_input:
+            mock_get_input.side_effect = ["100", "p", "100", "n"]
+            with patch('controller.phonebook_controller.ConsoleView.show_message') as mock_show:
+                with patch('controller.phonebook_controller.ConsoleView.show_contacts_page') as mock_page:
+                    self.controller._show_all_contacts()
+
+        pages = [call_args[0][0] for call_args in mock_page.call_args_list]
+        self.assertEqual([len(page) for page in pages], [text.page_size, 0, text.page_size, 0])
+        self.assertEqual(pages[2][-1][0], last_id)
+        mock_show.assert_called_once_with(text.page_last)
+
 class TestErrorHandling(unittest.TestCase):
     """Тесты обработки ошибок"""
 
@@ -217,5 +270,32 @@ class TestConsoleView(unittest.TestCase):
             mock_print.assert_called_with("Телефонная книга пуста")
 
 
+    def test_show_contacts_from_iterator(self):
+        """Тест отображения контактов из итератора без копии"""
+        from view.console_view import ConsoleView
+        from model.contact import Contact
+
+        rows = iter([(2, Contact("Мария Петрова", "+79987654321", "Подруга", 2))])
+        with patch('builtins.print') as mock_print:
+            count = ConsoleView.show_contacts(rows)
+
+        self.assertEqual(count, 1)
+        self.assertIn("Мария Петрова", mock_print.call_args[0][0])
+
+    def test_show_contacts_page_single_write(self):
+        """Страница контактов выводится одной записью"""
+        from view.console_view import ConsoleView
+        from model.contact import Contact
+
+        page = [(1, Contact("Иван Иванов", "+79123456789", "Коллега", 1)),
+                (3, Contact("Мария Петрова", "+79987654321", "Подруга", 3))]
+        with patch('builtins.print') as mock_print:
+            ConsoleView.show_contacts_page(page, 10)
+
+        mock_print.assert_called_once()
+        output = mock_print.call_args[0][0]
+        self.assertIn("Мария Петрова", output)
+        self.assertIn(text.page_info.format(first=1, last=3, total=10), output)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
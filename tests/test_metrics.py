@@ -0,0 +1,139 @@
+import unittest
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from controller.phonebook_controller import PhoneBookController
+
+
+class TestMetrics(unittest.TestCase):
+    """Тесты инструментирования и приемников метрик"""
+
+    def setUp(self):
+        metrics.clear_sinks()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.book_path = os.path.join(self.temp_dir.name, "book.txt")
+        with open(self.book_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\nМария Петрова;+79987654321;Подруга")
+
+    def tearDown(self):
+        metrics.clear_sinks()
+        self.temp_dir.cleanup()
+
+    def use_book(self):
+        phonebook = PhoneBook()
+        phonebook.open(self.book_path)
+        phonebook.find_contacts("иван")
+        phonebook.add_contact(Contact("Алексей Сидоров", "+79555555555", "Друг"))
+        phonebook.update_contact(3, comment="Сосед")
+        phonebook.delete_contact(1)
+        phonebook.save()
+
+    def test_disabled_by_default(self):
+        """Без приемников ничего не учитывается"""
+        self.assertFalse(metrics.is_enabled())
+        with patch.object(metrics, 'observe') as mock_observe:
+            self.use_book()
+        mock_observe.assert_not_called()
+
+    def test_histogram_summary(self):
+        """Гистограмма учитывает загрузку, поиск, изменения и сохранение"""
+        sink = metrics.histogram()
+        self.assertIs(metrics.histogram(), sink)
+        self.use_book()
+
+        summary = sink.summary()
+        for name in ('file.load', 'file.save', 'phonebook.open', 'phonebook.build_indexes',
+                     'phonebook.find_contacts', 'phonebook.add_contact', 'phonebook.update_contact',
+                     'phonebook.delete_contact', 'phonebook.save'):
+            self.assertEqual(summary[name]['count'], 1, name)
+        self.assertLessEqual(summary['file.load']['p50_ms'], summary['file.load']['max_ms'])
+        self.assertEqual(sink.counters(), {'phonebook.find_contacts.results': 1})
+
+        metrics.remove_sink(sink)
+        self.use_book()
+        self.assertEqual(sink.summary()['file.load']['count'], 1)
+
+    def test_timed_coroutine(self):
+        """Декоратор учитывает время корутины, а не только ее создание"""
+        sink = metrics.histogram()
+
+        @metrics.timed('sleep')
+        async def sleep():
+            await asyncio.sleep(0.01)
+
+        asyncio.run(sleep())
+        self.assertGreaterEqual(sink.summary()['sleep']['max_ms'], 5)
+
+    def test_logging_sink(self):
+        """Приемник logging пишет каждое измерение"""
+        metrics.add_sink(metrics.LoggingSink(level=logging.INFO))
+        with self.assertLogs('phonebook.metrics', level='INFO') as logs:
+            PhoneBook().find_contacts("иван")
+        self.assertTrue(any('phonebook.find_contacts' in line for line in logs.output))
+
+    def test_prometheus_file(self):
+        """Файл в формате Prometheus содержит гистограммы и счетчики, префикс не повторяется"""
+        path = os.path.join(self.temp_dir.name, "metrics.prom")
+        sink = metrics.PrometheusFileSink(path, interval=0)
+        metrics.add_sink(sink)
+        self.use_book()
+        sink.close()
+
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('# TYPE phonebook_file_load_seconds histogram', content)
+        self.assertIn('phonebook_file_load_seconds_bucket{le="+Inf"} 1', content)
+        self.assertIn('phonebook_find_contacts_results_total 1', content)
+        self.assertNotIn('phonebook_phonebook', content)
+        self.assertEqual([name for name in os.listdir(self.temp_dir.name) if name.endswith('.tmp')], [])
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o666 & ~umask)
+
+    def test_prometheus_written_in_background(self):
+        """Измерения не пишут файл сами: запись идет в фоновом потоке"""
+        path = os.path.join(self.temp_dir.name, "metrics.prom")
+        sink = metrics.PrometheusFileSink(path, interval=0)
+        writers = []
+        write = sink.write
+        sink.write = lambda: (writers.append(threading.get_ident()), write())
+        metrics.add_sink(sink)
+        PhoneBook().find_contacts("иван")
+        self.assertTrue(sink._writer.is_alive())
+        for _ in range(500):
+            if os.path.exists(path):
+                break
+            time.sleep(0.01)
+        sink.close()
+        self.assertTrue(writers)
+        self.assertNotEqual(writers[0], threading.get_ident())
+        self.assertFalse(sink._writer.is_alive())
+
+    def test_controller_stats(self):
+        """Пункт меню "Статистика" включает сбор при первом выборе и затем выводит сводку"""
+        controller = PhoneBookController()
+        self.assertFalse(metrics.is_enabled())
+        with patch('controller.phonebook_controller.ConsoleView.show_message') as mock_show:
+            controller._handle_choice(8)
+        mock_show.assert_called_once()
+        self.assertTrue(metrics.is_enabled())
+
+        controller.phone_book.find_contacts("иван")
+        with patch('builtins.print') as mock_print:
+            controller._handle_choice(8)
+        self.assertIn('phonebook.find_contacts', mock_print.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
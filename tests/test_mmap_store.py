@@ -0,0 +1,95 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.file_handler import FileHandler
+from model.mmap_store import MmapContactStore
+from exceptions import FileOperationError, ReadOnlyError
+
+
+class TestMmapContactStore(unittest.TestCase):
+    """Тесты режима отображения файла в память"""
+
+    content = ("Иван Иванов;+79123456789;Коллега\r\n"
+               "\n"
+               "   \t\n"
+               " 　\n"
+               "Мария Петрова;+79987654321;Подруга\r"
+               "Алексей Сидоров;+79555555555;Друг")
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False,
+                                         encoding='utf-8', newline='') as f:
+            f.write(self.content)
+            self.temp_path = f.name
+
+    def tearDown(self):
+        if os.path.exists(self.temp_path):
+            os.unlink(self.temp_path)
+
+    def test_ids_match_text_loader(self):
+        """ID и поля совпадают с обычной загрузкой файла"""
+        expected = FileHandler().load(self.temp_path)
+        store = MmapContactStore(self.temp_path)
+        try:
+            self.assertEqual(list(store), list(expected))
+            self.assertEqual({cid: c.to_list() for cid, c in store.items()}, expected)
+            self.assertEqual(store[5].name, "Мария Петрова")
+            self.assertNotIn(2, store)
+            with self.assertRaises(KeyError):
+                store[2]
+            self.assertEqual(list(store.iter_ids(2)), [5, 6])
+            self.assertEqual(list(store.iter_ids(4, reverse=True)), [1])
+            self.assertEqual(list(store.iter_ids(reverse=True)), [6, 5, 1])
+        finally:
+            store.close()
+
+    def test_phonebook_mmap_mode(self):
+        """Книга в режиме mmap поддерживает чтение и поиск"""
+        phonebook = PhoneBook()
+        phonebook.open(self.temp_path, mode='mmap')
+        try:
+            self.assertTrue(phonebook.read_only)
+            self.assertEqual(len(phonebook), 3)
+            self.assertEqual(phonebook.get_contact(6).name, "Алексей Сидоров")
+            self.assertEqual(list(phonebook.find_contacts("петрова")), [5])
+            self.assertEqual(len(list(phonebook)), 3)
+        finally:
+            phonebook.close()
+
+    def test_phonebook_mmap_is_read_only(self):
+        """Изменение книги в режиме mmap запрещено"""
+        phonebook = PhoneBook()
+        phonebook.open(self.temp_path, mode='mmap')
+        try:
+            with self.assertRaises(ReadOnlyError):
+                phonebook.add_contact(Contact("Новый", "1", ""))
+            with self.assertRaises(ReadOnlyError):
+                phonebook.update_contact(1, name="Новое имя")
+            with self.assertRaises(ReadOnlyError):
+                phonebook.delete_contact(1)
+        finally:
+            phonebook.close()
+
+    def test_empty_and_missing_file(self):
+        """Пустой файл открывается, отсутствующий вызывает ошибку"""
+        with open(self.temp_path, 'w', encoding='utf-8'):
+            pass
+        self.assertEqual(len(MmapContactStore(self.temp_path)), 0)
+
+        with self.assertRaises(FileOperationError):
+            MmapContactStore("nonexistent_file.txt")
+
+    def test_unknown_mode(self):
+        """Неизвестный режим открытия"""
+        with self.assertRaises(ValueError):
+            PhoneBook().open(self.temp_path, mode='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.numpy_engine import HAS_NUMPY, NumpyEngine
+
+
+def make_phonebook():
+    phonebook = PhoneBook()
+    phonebook.add_contacts([
+        Contact("Иван Иванов", "+79123456789", "Коллега"),
+        Contact("Мария Петрова", "8 (912) 345-67-89", "Подруга"),
+        Contact("Алексей Сидоров", "+79555555555", "Коллега"),
+        Contact("Косивченко", "9555555555", "Отус Студент"),
+        Contact("Без номера", "", "Коллега"),
+        Contact("Тоже без номера", "", ""),
+        Contact("Test@Name", "+123", "Comment#123"),
+    ])
+    return phonebook
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy не установлен")
+class TestNumpyEngine(unittest.TestCase):
+    """Тесты пакетных операций на NumPy"""
+
+    def setUp(self):
+        self.phonebook = make_phonebook()
+        self.engine = NumpyEngine(self.phonebook)
+
+    def test_duplicate_phones(self):
+        """Дубликаты ищутся по нормализованному номеру"""
+        self.assertEqual(self.engine.duplicate_phones(), {"79123456789": [1, 2], "79555555555": [3, 4]})
+
+    def test_comment_counts(self):
+        """Подсчет контактов по комментариям совпадает с циклом по книге"""
+        self.assertEqual(self.engine.comment_counts(), dict(Counter(c.comment for c in self.phonebook)))
+
+    def test_find_by_phone_prefix(self):
+        """Фильтр по префиксу совпадает с поиском книги"""
+        for prefix in ("7912", "+7 955", "8 912", "1", "79123456789", "791234567890", "", "6"):
+            with self.subTest(prefix=prefix):
+                self.assertEqual(self.engine.find_by_phone_prefix(prefix),
+                                 sorted(self.phonebook.find_by_phone_prefix(prefix)))
+
+    def test_refresh(self):
+        """После refresh движок видит изменения книги"""
+        self.phonebook.delete_contact(2)
+        self.phonebook.update_contact(3, phone="+7 912 345 67 89")
+        self.engine.refresh()
+        self.assertEqual(len(self.engine), len(self.phonebook))
+        self.assertEqual(self.engine.duplicate_phones(), {"79123456789": [1, 3]})
+
+    def test_empty_book(self):
+        """Пустая книга дает пустые результаты"""
+        engine = NumpyEngine(PhoneBook())
+        self.assertEqual(engine.duplicate_phones(), {})
+        self.assertEqual(engine.comment_counts(), {})
+        self.assertEqual(engine.find_by_phone_prefix("7"), [])
+
+
+@unittest.skipIf(HAS_NUMPY, "numpy установлен")
+class TestNumpyEngineUnavailable(unittest.TestCase):
+    """Тесты поведения без numpy"""
+
+    def test_requires_numpy(self):
+        """Без numpy движок не создается"""
+        with self.assertRaises(ImportError):
+            NumpyEngine(make_phonebook())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import tempfile
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.phonebook import PhoneBook
+from model.file_handler import FileHandler
+from model import parallel_loader
+
+
+class TestParallelLoader(unittest.TestCase):
+    """Тесты параллельной загрузки файла"""
+
+    def setUp(self):
+        lines = []
+        for i in range(2000):
+            if i % 7 == 0:
+                lines.append("")
+            elif i % 11 == 0:
+                lines.append("   ")
+            else:
+                lines.append(f"Контакт {i};+7912{i:07d};Комментарий {i}")
+        content = "\n".join(lines[:1000]) + "\r\n" + "\r\n".join(lines[1000:1500]) + "\r" + "\n".join(lines[1500:])
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False,
+                                         encoding='utf-8', newline='') as f:
+            f.write(content)
+            self.temp_path = f.name
+        self.file_handler = FileHandler()
+
+    def tearDown(self):
+        if os.path.exists(self.temp_path):
+            os.unlink(self.temp_path)
+
+    def test_split_ranges(self):
+        """Диапазоны покрывают файл и начинаются после перевода строки"""
+        ranges = parallel_loader.split_ranges(self.temp_path, 16)
+        size = os.path.getsize(self.temp_path)
+
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], size)
+        with open(self.temp_path, 'rb') as f:
+            data = f.read()
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1:start], b'\n')
+
+    def test_ids_match_serial_load(self):
+        """Параллельная загрузка дает те же номера строк, что и load"""
+        expected = self.file_handler.load(self.temp_path)
+        with patch.object(parallel_loader, 'MIN_PARALLEL_SIZE', 0):
+            result = self.file_handler.load_parallel(self.temp_path, workers=2)
+        self.assertEqual(result, expected)
+
+    def test_phonebook_open_with_workers(self):
+        """Открытие книги с параллельным разбором"""
+        expected = PhoneBook()
+        expected.open(self.temp_path)
+        for storage in ('dict', 'columnar'):
+            with self.subTest(storage=storage):
+                phonebook = PhoneBook(storage=storage)
+                with patch.object(parallel_loader, 'MIN_PARALLEL_SIZE', 0):
+                    phonebook.open(self.temp_path, workers=2)
+                self.assertEqual({c.id: c.to_list() for c in phonebook},
+                                 {c.id: c.to_list() for c in expected})
+
+
+if __name__ == '__main__':
+    unittest.main()
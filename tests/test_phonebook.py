@@ -10,6 +10,7 @@ from io import StringIO
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from model.contact import Contact
+from model.memory_store import DictContactStore
 from model.phonebook import PhoneBook
 from model.file_handler import FileHandler
 from exceptions import ContactNotFoundError, FileOperationError
@@ -124,6 +125,27 @@ class TestPhoneBook(unittest.TestCase):
         self.assertIn(1, contacts)
         self.assertIn(2, contacts)
 
+    def test_view_is_read_only_and_live(self):
+        """Тест представления контактов без копирования"""
+        self.phonebook.add_contact(self.contact1)
+        view = self.phonebook.view()
+
+        with self.assertRaises(TypeError):
+            view[5] = self.contact2
+        self.phonebook.add_contact(self.contact2)
+        self.assertEqual(len(view), 2)
+        self.assertIs(view[2], self.contact2)
+
+    def test_find_contacts_lazy(self):
+        """Тест ленивого поиска контактов"""
+        self.phonebook.add_contact(self.contact1)
+        self.phonebook.add_contact(self.contact2)
+        self.phonebook.add_contact(self.contact3)
+
+        results = self.phonebook.find_contacts("ов", lazy=True)
+        self.assertNotIsInstance(results, dict)
+        self.assertEqual(list(results), list(self.phonebook.find_contacts("ов").items()))
+
     def test_find_contacts_by_name(self):
         """Тест поиска контактов по имени"""
         self.phonebook.add_contact(self.contact1)
@@ -262,9 +284,9 @@ class TestPhoneBook(unittest.TestCase):
         mock_file_handler.return_value = mock_instance
 
         with patch.object(self.phonebook, '_file_handler', mock_instance):
-            self.phonebook._contacts = {
+            self.phonebook._contacts = DictContactStore({
                 1: Contact("Иван Иванов", "+79123456789", "Коллега", id=1)
-            }
+            })
             self.phonebook._is_open = True
             self.phonebook._file_path = "test_file.txt"
 
@@ -290,6 +312,76 @@ class TestPhoneBook(unittest.TestCase):
         self.phonebook.delete_contact(1)
         self.assertEqual(self.phonebook._get_next_id(), 3)
 
+    def test_next_id_after_delete_last(self):
+        """Тест: ID удаленного последнего контакта не выдается повторно"""
+        self.phonebook.add_contact(self.contact1)
+        self.phonebook.add_contact(self.contact2)
+        self.phonebook.delete_contact(2)
+
+        self.assertEqual(self.phonebook.add_contact(self.contact3), 3)
+
+    def test_reuse_ids(self):
+        """Тест повторного использования освобожденных ID"""
+        phonebook = PhoneBook(reuse_ids=True)
+        phonebook.add_contacts([self.contact1, self.contact2, self.contact3])
+        phonebook.delete_contact(2)
+        phonebook.delete_contact(1)
+
+        self.assertEqual(phonebook._get_next_id(), 1)
+        self.assertEqual(phonebook.add_contact(Contact("Новый", "1", "")), 1)
+        self.assertEqual(phonebook.add_contact(Contact("Новый", "2", "")), 2)
+        self.assertEqual(phonebook.add_contact(Contact("Новый", "3", "")), 4)
+
+    def test_get_page(self):
+        """Тест постраничного получения контактов по ID"""
+        self.phonebook.add_contacts(Contact(f"Контакт {i}", str(i), "") for i in range(1, 11))
+        self.phonebook.delete_contact(4)
+
+        self.assertEqual([cid for cid, _ in self.phonebook.get_page(size=3)], [1, 2, 3])
+        self.assertEqual([cid for cid, _ in self.phonebook.get_page(4, 3)], [5, 6, 7])
+        self.assertEqual([cid for cid, _ in self.phonebook.get_page(5, 3, reverse=True)], [2, 3, 5])
+        self.assertEqual([cid for cid, _ in self.phonebook.get_page(9, 5)], [9, 10])
+        self.assertEqual(self.phonebook.get_page(11, 5), [])
+        self.assertEqual(self.phonebook.get_page(0, 5, reverse=True), [])
+        self.assertEqual(self.phonebook.get_page(3, 1)[0][1].name, "Контакт 3")
+
+    def test_get_page_after_mass_delete(self):
+        """Страницы после массового удаления в разных хранилищах"""
+        for storage in ('dict', 'columnar'):
+            with self.subTest(storage=storage):
+                phonebook = PhoneBook(storage=storage)
+                phonebook.add_contacts(Contact(f"Контакт {i}", str(i), "") for i in range(1, 1001))
+                for contact_id in list(range(2, 500)) + list(range(502, 1000)):
+                    phonebook.delete_contact(contact_id)
+
+                self.assertEqual([cid for cid, _ in phonebook.get_page(size=3)], [1, 500, 501])
+                self.assertEqual([cid for cid, _ in phonebook.get_page(2, 2)], [500, 501])
+                self.assertEqual([cid for cid, _ in phonebook.get_page(size=3, reverse=True)], [500, 501, 1000])
+                self.assertEqual([cid for cid, _ in phonebook.get_page(999, 3, reverse=True)], [1, 500, 501])
+                self.assertEqual(list(phonebook.iter_ids(2000, reverse=True)), [1000, 501, 500, 1])
+                self.assertEqual(phonebook.get_page(1001, 5), [])
+
+    def test_add_contacts(self):
+        """Тест пакетного добавления контактов"""
+        ids = self.phonebook.add_contacts([self.contact1, self.contact2, self.contact3])
+
+        self.assertEqual(ids, [1, 2, 3])
+        self.assertEqual(len(self.phonebook), 3)
+        self.assertEqual(self.contact3.id, 3)
+
+    def test_next_id_restored_on_open(self):
+        """Тест восстановления счетчика ID при открытии файла"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n\nМария Петрова;+79987654321;Подруга\n")
+            temp_path = f.name
+
+        try:
+            self.phonebook.open(temp_path)
+            self.assertEqual(self.phonebook.add_contact(self.contact3), 4)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
 
 class TestFileHandler(unittest.TestCase):
     """Тесты для класса FileHandler"""
@@ -399,6 +491,42 @@ class TestFileHandler(unittest.TestCase):
                 os.unlink(temp_path)
 
 
+    def test_iter_records_streaming(self):
+        """Тест потокового чтения: номера строк совпадают с load, пустые строки пропускаются"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n")
+            f.write("\n")
+            f.write("Мария Петрова;+79987654321;Подруга\n")
+            temp_path = f.name
+
+        try:
+            records = list(self.file_handler.iter_records(temp_path, chunk_size=16))
+            self.assertEqual(records, list(self.file_handler.load(temp_path).items()))
+            self.assertEqual([line_num for line_num, _ in records], [1, 3])
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def test_iter_records_nonexistent_file(self):
+        """Тест потокового чтения несуществующего файла"""
+        with self.assertRaises(FileOperationError):
+            list(self.file_handler.iter_records("nonexistent_file.txt"))
+
+    def test_phonebook_open_streaming(self):
+        """Тест открытия телефонной книги в потоковом режиме"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n\nМария Петрова;+79987654321;Подруга")
+            temp_path = f.name
+
+        try:
+            phonebook = PhoneBook()
+            self.assertTrue(phonebook.open(temp_path, streaming=True))
+            self.assertEqual(len(phonebook), 2)
+            self.assertEqual(phonebook.get_contact(3).name, "Мария Петрова")
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
 class TestParameterizedContacts(unittest.TestCase):
     """Параметризованные тесты для контактов"""
 
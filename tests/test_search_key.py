@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.search_key import SearchKey, fold
+
+
+class TestSearchKey(unittest.TestCase):
+    """Тесты поисковых ключей контактов"""
+
+    def test_fold(self):
+        """Приведение учитывает casefold и ё/е"""
+        self.assertEqual(fold("Артём ЁЖИКОВ"), "артем ежиков")
+        self.assertEqual(fold("Straße"), "strasse")
+
+    def test_from_fields(self):
+        """Приведенные поля разделены символом, которого нет в строке поиска"""
+        key = SearchKey.from_fields("Фёдор", "+7 999", "Straße")
+        self.assertEqual(key.text, "федор\x00+7 999\x00strasse")
+
+
+class TestCachedSearch(unittest.TestCase):
+    """Тесты поиска по кэшированным ключам"""
+
+    def setUp(self):
+        self.books = [PhoneBook(), PhoneBook(ngram_index=True), PhoneBook(storage='columnar')]
+        for phonebook in self.books:
+            phonebook.add_contacts([
+                Contact("Артём Ёлкин", "+79123456789", "Коллега"),
+                Contact("Алёна Петрова", "+79987654321", "Straße 5"),
+                Contact("Елена Семенова", "+79555555555", "Друг"),
+            ])
+
+    def test_yo_and_casefold(self):
+        """Поиск не различает ё/е и учитывает casefold"""
+        for phonebook in self.books:
+            with self.subTest(indexes=list(phonebook._index_factories), storage=phonebook._storage):
+                self.assertEqual(list(phonebook.find_contacts("артем елкин")), [1])
+                self.assertEqual(list(phonebook.find_contacts("АЛЕНА")), [2])
+                self.assertEqual(list(phonebook.find_contacts("Ел")), [1, 3])
+                self.assertEqual(list(phonebook.find_contacts("STRASSE")), [2])
+                self.assertEqual(list(phonebook.find_contacts_many(["семёнова"])["семёнова"]), [3])
+
+    def test_key_invalidated_by_update(self):
+        """Ключ пересчитывается только при изменении поля"""
+        phonebook = self.books[0]
+        phonebook.find_contacts("")
+        key = phonebook._search_keys[1]
+        phonebook.update_contact(1, name="Артём Ёлкин")
+        self.assertIs(phonebook._search_keys[1], key)
+
+        phonebook.update_contact(1, comment="Сосед")
+        self.assertNotIn(1, phonebook._search_keys)
+        self.assertEqual(list(phonebook.find_contacts("сосед")), [1])
+        self.assertEqual(list(phonebook.find_contacts("коллега")), [])
+
+    def test_cache_policy(self):
+        """Ключи кэшируются по умолчанию только для словаря, в режиме mmap - никогда"""
+        dict_book, _, columnar_book = self.books
+        for phonebook in (dict_book, columnar_book):
+            phonebook.find_contacts_many(["ел", ""])
+        self.assertEqual(len(dict_book._search_keys), 3)
+        self.assertEqual(columnar_book._search_keys, {})
+
+        cached_columnar = PhoneBook(storage='columnar', search_key_cache=True)
+        cached_columnar.add_contacts(list(columnar_book))
+        self.assertEqual(list(cached_columnar.find_contacts("ел")), [1, 3])
+        self.assertEqual(len(cached_columnar._search_keys), 3)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'book.txt')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(';'.join(contact.to_list()) for contact in dict_book))
+            mmap_book = PhoneBook(search_key_cache=True)
+            mmap_book.open(file_path, mode='mmap')
+            try:
+                self.assertEqual(list(mmap_book.find_contacts("Ел")), [1, 3])
+                self.assertEqual(list(mmap_book.find_contacts_many(["straße"])["straße"]), [2])
+                self.assertEqual(mmap_book._search_keys, {})
+            finally:
+                mmap_book.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
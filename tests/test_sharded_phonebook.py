@@ -0,0 +1,121 @@
+import unittest
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.sharded_phonebook import ShardedPhoneBook
+from exceptions import ContactNotFoundError, FileOperationError, ReadOnlyError
+
+
+class TestShardedPhoneBook(unittest.TestCase):
+    """Тесты телефонной книги, разделенной между процессами"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'book.txt')
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n"
+                    "Мария Петрова;+79987654321;Подруга\n"
+                    "\n"
+                    "Алексей Сидоров;+79555555555;Друг\n"
+                    "Ольга Иванова;+79111111111;Сестра\n")
+        self.phonebook = ShardedPhoneBook(shards=3, ngram_index=True)
+        self.phonebook.open(self.file_path)
+
+    def tearDown(self):
+        self.phonebook.close()
+        self.temp_dir.cleanup()
+
+    def test_same_results_as_phonebook(self):
+        """ID и результаты поиска совпадают с обычной книгой"""
+        reference = PhoneBook()
+        reference.open(self.file_path)
+        self.assertEqual(len(self.phonebook), len(reference))
+        for term in ("иванов", "+79", "друг", "", "нет такого"):
+            with self.subTest(term=term):
+                self.assertEqual(self.phonebook.find_contacts(term), reference.find_contacts(term))
+                self.assertEqual(list(self.phonebook.find_contacts(term)), list(reference.find_contacts(term)))
+
+    def test_add_update_delete(self):
+        """Новые ID продолжают нумерацию файла, изменения доходят до шардов"""
+        ids = self.phonebook.add_contacts([Contact("Петр Петров", "+70000000001", ""),
+                                           Contact("Анна Смирнова", "+70000000002", "Соседка")])
+        self.assertEqual(ids, [6, 7])
+        self.assertEqual(self.phonebook.add_contact(Contact("Олег", "", "")), 8)
+        self.assertEqual(self.phonebook.get_contact(7).name, "Анна Смирнова")
+
+        updated = self.phonebook.update_contact(7, comment="Коллега")
+        self.assertEqual(updated.comment, "Коллега")
+        self.assertEqual(list(self.phonebook.find_contacts("коллега")), [1, 7])
+
+        self.assertEqual(self.phonebook.delete_contact(1).name, "Иван Иванов")
+        with self.assertRaises(ContactNotFoundError) as context:
+            self.phonebook.get_contact(1)
+        self.assertEqual(context.exception.contact_id, 1)
+        self.assertEqual(len(self.phonebook), 6)
+
+    def test_save_and_reopen(self):
+        """Сохранение сливает шарды по ID в текст и снимок"""
+        self.phonebook.add_contact(Contact("Петр Петров", "+70000000001", ""))
+        self.phonebook.delete_contact(2)
+        text_path = os.path.join(self.temp_dir.name, 'saved.txt')
+        snapshot_path = os.path.join(self.temp_dir.name, 'saved.pbs')
+        self.phonebook.save(text_path)
+        self.phonebook.save(snapshot_path, format='snapshot')
+
+        reference = PhoneBook()
+        reference.open(text_path)
+        self.assertEqual([c.name for c in reference],
+                         ["Иван Иванов", "Алексей Сидоров", "Ольга Иванова", "Петр Петров"])
+        with ShardedPhoneBook(shards=2) as reopened:
+            reopened.open(snapshot_path)
+            self.assertEqual(reopened.get_contact(6).name, "Петр Петров")
+            self.assertEqual(len(reopened), 4)
+
+    def test_save_and_reopen_sqlite(self):
+        """Книга сохраняется в базу SQLite и открывается из нее"""
+        self.phonebook.delete_contact(2)
+        db_path = os.path.join(self.temp_dir.name, 'saved.db')
+        self.phonebook.save(db_path, format='sqlite')
+
+        reference = PhoneBook()
+        reference.open(db_path, mode='sqlite')
+        self.assertEqual([c.name for c in reference], ["Иван Иванов", "Алексей Сидоров", "Ольга Иванова"])
+        reference.close()
+        with ShardedPhoneBook(shards=2) as reopened:
+            reopened.open(db_path)
+            self.assertEqual(list(reopened.find_contacts("иванов")), [1, 5])
+            reopened.add_contact(Contact("Петр Петров", "+70000000001", ""))
+            reopened.save()
+        reference = PhoneBook()
+        reference.open(db_path)
+        self.assertEqual(reference.get_contact(6).name, "Петр Петров")
+        reference.close()
+
+    def test_errors(self):
+        """Ошибки шардов доходят до вызывающего, протокол не сбивается"""
+        with self.assertRaises(FileOperationError):
+            self.phonebook.open(os.path.join(self.temp_dir.name, 'missing.txt'))
+        with self.assertRaises(ValueError):
+            self.phonebook.save(format='xml')
+        with self.assertRaises(ValueError):
+            ShardedPhoneBook(shards=2, journal=True)
+        self.assertEqual(len(self.phonebook.find_contacts("иванов")), 2)
+
+    def test_exceptions_pickle(self):
+        """Исключения книги переживают передачу между процессами"""
+        for error in (ContactNotFoundError(contact_id=5), FileOperationError("Файл не найден", "a.txt"),
+                      ReadOnlyError()):
+            with self.subTest(error=type(error).__name__):
+                restored = pickle.loads(pickle.dumps(error))
+                self.assertIs(type(restored), type(error))
+                self.assertEqual(str(restored), str(error))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.contact import Contact
+from model.phonebook import PhoneBook
+from model.file_handler import FileHandler
+from model.snapshot import MAGIC, read_snapshot
+from exceptions import FileOperationError
+
+
+class TestSnapshot(unittest.TestCase):
+    """Тесты бинарного снимка телефонной книги"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.text_path = os.path.join(self.temp_dir.name, "book.txt")
+        self.snapshot_path = os.path.join(self.temp_dir.name, "book.snap")
+        with open(self.text_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n\n"
+                    "Мария Петрова;+79987654321;Подруга\n"
+                    "Алексей Сидоров;+79555555555;\n")
+        self.file_handler = FileHandler()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_roundtrip_keeps_ids(self):
+        """Снимок сохраняет ID и поля контактов"""
+        for storage in ('dict', 'columnar'):
+            with self.subTest(storage=storage):
+                phonebook = PhoneBook(storage=storage)
+                phonebook.open(self.text_path)
+                phonebook.save(self.snapshot_path, format='snapshot')
+
+                reopened = PhoneBook(storage=storage)
+                reopened.open(self.snapshot_path)
+                self.assertEqual({c.id: c.to_list() for c in reopened},
+                                 {c.id: c.to_list() for c in phonebook})
+                self.assertEqual(reopened.add_contact(Contact("Новый", "1", "")), 5)
+
+    def test_detect_format_and_load(self):
+        """Формат определяется по заголовку, load читает оба формата"""
+        self.file_handler.convert(self.text_path, self.snapshot_path)
+
+        self.assertEqual(self.file_handler.detect_format(self.text_path), 'text')
+        self.assertEqual(self.file_handler.detect_format(self.snapshot_path), 'snapshot')
+        self.assertEqual(self.file_handler.load(self.snapshot_path),
+                         self.file_handler.load(self.text_path))
+
+    def test_convert_back_to_text(self):
+        """Обратное преобразование снимка в текст сохраняет номера строк"""
+        text_copy = os.path.join(self.temp_dir.name, "copy.txt")
+        self.assertEqual(self.file_handler.convert(self.text_path, self.snapshot_path), 'snapshot')
+        self.assertEqual(self.file_handler.convert(self.snapshot_path, text_copy), 'text')
+        self.assertEqual(self.file_handler.load(text_copy), self.file_handler.load(self.text_path))
+
+    def test_ngram_index_restored(self):
+        """Индекс n-грамм сохраняется в снимке и восстанавливается"""
+        phonebook = PhoneBook(ngram_index=True)
+        phonebook.open(self.text_path)
+        phonebook.save(self.snapshot_path, format='snapshot')
+        self.assertIsNotNone(read_snapshot(self.snapshot_path).ngram_postings)
+
+        reopened = PhoneBook(ngram_index=True)
+        reopened.open(self.snapshot_path)
+        self.assertEqual(reopened._ngram_index.postings, phonebook._ngram_index.postings)
+        self.assertEqual(list(reopened.find_contacts("петров")), [3])
+
+    def test_unknown_version(self):
+        """Снимок другой версии формата не читается"""
+        self.file_handler.convert(self.text_path, self.snapshot_path)
+        with open(self.snapshot_path, 'r+b') as f:
+            f.seek(len(MAGIC))
+            f.write((2).to_bytes(2, 'little'))
+
+        with self.assertRaises(FileOperationError):
+            read_snapshot(self.snapshot_path)
+
+    def test_mmap_read(self):
+        """Чтение снимка через отображение в память"""
+        self.file_handler.convert(self.text_path, self.snapshot_path)
+        self.assertEqual(read_snapshot(self.snapshot_path, use_mmap=True),
+                         read_snapshot(self.snapshot_path))
+
+        phonebook = PhoneBook()
+        phonebook.open(self.snapshot_path, mode='mmap')
+        self.assertTrue(phonebook.read_only)
+        self.assertEqual(phonebook.get_contact(3).name, "Мария Петрова")
+
+    def test_save_keeps_snapshot_format(self):
+        """Сохранение открытого снимка по умолчанию остается снимком"""
+        self.file_handler.convert(self.text_path, self.snapshot_path)
+        phonebook = PhoneBook()
+        phonebook.open(self.snapshot_path)
+        phonebook.delete_contact(1)
+        phonebook.save()
+
+        self.assertEqual(self.file_handler.detect_format(self.snapshot_path), 'snapshot')
+        self.assertEqual(sorted(self.file_handler.load(self.snapshot_path)), [3, 4])
+
+    def test_corrupted_snapshot(self):
+        """Обрезанный снимок вызывает ошибку"""
+        self.file_handler.convert(self.text_path, self.snapshot_path)
+        with open(self.snapshot_path, 'r+b') as f:
+            f.truncate(30)
+
+        with self.assertRaises(FileOperationError):
+            PhoneBook().open(self.snapshot_path)
+
+    def test_nul_in_field(self):
+        """Символ \\0 в поле нельзя сохранить в снимок"""
+        phonebook = PhoneBook()
+        phonebook.open(self.text_path)
+        phonebook.update_contact(1, name="Имя\x00с нулем")
+
+        with self.assertRaises(FileOperationError):
+            phonebook.save(self.snapshot_path, format='snapshot')
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+    def test_unknown_format(self):
+        """Неизвестный формат сохранения"""
+        phonebook = PhoneBook()
+        phonebook.open(self.text_path)
+        with self.assertRaises(ValueError):
+            phonebook.save(self.snapshot_path, format='xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ThreadPoolExecutor
+from model.concurrent_phonebook import ConcurrentPhoneBook
+from model.contact import Contact
+from model.file_handler import FileHandler, FORMAT_SQLITE
+from model.phonebook import PhoneBook
+from model.sqlite_store import SQLiteContactStore
+from exceptions import FileOperationError
+
+
+class TestSQLiteContactStore(unittest.TestCase):
+    """Тесты хранилища контактов в базе SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'book.db')
+        self.store = SQLiteContactStore(self.db_path, batch_size=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_mapping(self):
+        """Хранилище ведет себя как словарь ID -> контакт"""
+        self.store[3] = Contact("Иван Иванов", "+79123456789", "Коллега")
+        self.store[1] = Contact("Мария Петрова", "+79987654321", "")
+        self.store[3] = Contact("Иван Иванов", "+79123456789", "Друг")
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(list(self.store), [1, 3])
+        self.assertEqual(self.store[3], Contact("Иван Иванов", "+79123456789", "Друг", 3))
+        self.assertIn(1, self.store)
+        del self.store[1]
+        self.assertNotIn(1, self.store)
+        with self.assertRaises(KeyError):
+            del self.store[1]
+        with self.assertRaises(KeyError):
+            self.store[1]
+        self.assertEqual(self.store.max_id(), 3)
+
+    def test_search_index_follows_changes(self):
+        """Полнотекстовый индекс обновляется при изменении и удалении"""
+        self.store[1] = Contact("Фёдор Ёлкин", "+79123456789", "Сосед")
+        self.assertEqual(list(dict(self.store.search("елкин"))), [1])
+        self.assertEqual(list(dict(self.store.search("ё"))), [])
+        self.assertEqual(list(dict(self.store.search("е"))), [1])
+        self.store[1] = Contact("Фёдор Ёлкин", "+79123456789", "Коллега")
+        self.assertEqual(dict(self.store.search("сосед")), {})
+        self.assertEqual(list(dict(self.store.search("колл"))), [1])
+        del self.store[1]
+        self.assertEqual(dict(self.store.search("елкин")), {})
+
+    def test_batched_commits(self):
+        """Изменения фиксируются пакетами и переживают переоткрытие"""
+        self.store[1] = Contact("Иван", "", "")
+        self.assertTrue(self.store._conn.in_transaction)
+        self.store[2] = Contact("Мария", "", "")
+        self.assertFalse(self.store._conn.in_transaction)
+        self.store[3] = Contact("Олег", "", "")
+        self.store.close()
+        self.store = SQLiteContactStore(self.db_path)
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store._conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+
+class TestPhoneBookSQLite(unittest.TestCase):
+    """Тесты телефонной книги поверх базы SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.text_path = os.path.join(self.temp_dir.name, 'book.txt')
+        self.db_path = os.path.join(self.temp_dir.name, 'book.db')
+        with open(self.text_path, 'w', encoding='utf-8') as f:
+            f.write("Иван Иванов;+79123456789;Коллега\n"
+                    "Мария Петрова;8 (998) 765-43-21;Подруга\n"
+                    "\n"
+                    "Алексей Сидоров;+79555555555;Друг\n"
+                    "Ольга Иванова;+79111111111;Сестра\n")
+        self.reference = PhoneBook()
+        self.reference.open(self.text_path)
+        self.reference.save(self.db_path, format='sqlite')
+        self.phonebook = PhoneBook()
+        self.phonebook.open(self.db_path)
+
+    def tearDown(self):
+        self.phonebook.close()
+        self.temp_dir.cleanup()
+
+    def test_detect_and_load(self):
+        """База определяется по заголовку и читается FileHandler.load"""
+        handler = FileHandler()
+        self.assertEqual(handler.detect_format(self.db_path), FORMAT_SQLITE)
+        self.assertEqual(handler.load(self.db_path), handler.load(self.text_path))
+
+    def test_same_results_as_memory(self):
+        """Поиск, сортировка и поиск по номеру совпадают с книгой в памяти"""
+        self.assertEqual(len(self.phonebook), 4)
+        for term in ("иванов", "ов", "+79", "", "друг", "нет такого", 'кавычка"'):
+            with self.subTest(term=term):
+                self.assertEqual(self.phonebook.find_contacts(term), self.reference.find_contacts(term))
+        self.assertEqual(self.phonebook.find_contacts_many(["иван", "петр"]),
+                         self.reference.find_contacts_many(["иван", "петр"]))
+        self.assertEqual(self.phonebook.find_by_phone("89987654321"), self.reference.find_by_phone("89987654321"))
+        for prefix in ("7912", "8912", "+7 998", "8 (998) 765"):
+            with self.subTest(prefix=prefix):
+                self.assertEqual(self.phonebook.find_by_phone_prefix(prefix),
+                                 self.reference.find_by_phone_prefix(prefix))
+        self.assertEqual(list(self.phonebook.find_by_phone_prefix("8 (912)")), [1])
+        self.assertEqual(list(self.phonebook.find_by_phone_prefix("+7 998")), [2])
+        self.assertEqual(self.phonebook.list_sorted('name', 'и', 'о'), self.reference.list_sorted('name', 'и', 'о'))
+
+    def test_get_page_queries_by_primary_key(self):
+        """Страница после массового удаления строится без запроса на каждый пропущенный ID"""
+        self.phonebook.add_contacts(Contact(f"Контакт {i}", str(i), "") for i in range(500))
+        for contact_id in list(self.phonebook.iter_ids(2))[:-2]:
+            self.phonebook.delete_contact(contact_id)
+        store = self.phonebook._contacts
+        with patch.object(store, '_fetchone', wraps=store._fetchone) as fetchone:
+            page = self.phonebook.get_page(size=3)
+            reverse_page = self.phonebook.get_page(600, 2, reverse=True)
+        self.assertEqual([cid for cid, _ in page], [1, 504, 505])
+        self.assertEqual([cid for cid, _ in reverse_page], [504, 505])
+        self.assertLess(fetchone.call_count, 10)
+
+    def test_changes_saved_to_database(self):
+        """Изменения пишутся в базу, новые ID продолжают нумерацию"""
+        self.assertEqual(self.phonebook.add_contact(Contact("Петр Петров", "+70000000001", "")), 6)
+        self.phonebook.update_contact(1, comment="Сосед")
+        self.phonebook.delete_contact(2)
+        self.phonebook.save()
+        self.phonebook.close()
+
+        reopened = PhoneBook()
+        reopened.open(self.db_path, mode='sqlite')
+        self.assertEqual(list(reopened.find_contacts("сосед")), [1])
+        self.assertEqual(sorted(c.id for c in reopened), [1, 4, 5, 6])
+        reopened.close()
+
+    def test_new_database_and_errors(self):
+        """mode='sqlite' создает базу; журнал и индексы в памяти не поддерживаются"""
+        new_path = os.path.join(self.temp_dir.name, 'new.db')
+        phonebook = PhoneBook()
+        phonebook.open(new_path, mode='sqlite')
+        self.assertEqual(len(phonebook), 0)
+        phonebook.close()
+        with self.assertRaises(ValueError):
+            PhoneBook(journal=True).open(self.db_path)
+        with self.assertRaises(ValueError):
+            PhoneBook(ngram_index=True).open(self.db_path)
+        with self.assertRaises(ValueError):
+            self.phonebook.save(format='text')
+
+    def test_save_to_same_file_by_other_path(self):
+        """Сохранение по другой записи пути к открытой базе фиксирует изменения, а не заменяет файл"""
+        self.phonebook.add_contact(Contact("Петр Петров", "+70000000001", ""))
+        self.phonebook.save(os.path.join(self.temp_dir.name, '.', 'book.db'), format='sqlite')
+        self.phonebook.add_contact(Contact("Анна Смирнова", "+70000000002", ""))
+        self.phonebook.save()
+        self.phonebook.close()
+
+        reopened = PhoneBook()
+        reopened.open(self.db_path)
+        self.assertEqual(len(reopened), 6)
+        with self.assertRaises(FileOperationError):
+            SQLiteContactStore.write_rows(self.db_path, [])
+        reopened.close()
+        SQLiteContactStore.write_rows(self.db_path, [])
+
+    def test_aopen_in_executor(self):
+        """База, открытая aopen в пуле потоков, доступна из потока цикла событий"""
+        phonebook = PhoneBook()
+        asyncio.run(phonebook.aopen(self.db_path))
+        try:
+            self.assertEqual(phonebook.find_contacts("иванов"), self.reference.find_contacts("иванов"))
+            self.assertEqual(phonebook.add_contact(Contact("Петр Петров", "+70000000001", "")), 6)
+            asyncio.run(phonebook.asave())
+        finally:
+            phonebook.close()
+
+    def test_concurrent_phonebook_threads(self):
+        """ConcurrentPhoneBook над базой читается и изменяется из пула потоков"""
+        phonebook = ConcurrentPhoneBook()
+        phonebook.open(self.db_path)
+        terms = ["иван", "петр", "друг", "+79"] * 25
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                found = list(pool.map(phonebook.find_contacts, terms))
+                added = list(pool.map(phonebook.add_contact,
+                                      [Contact(f"Контакт {n}", f"+7000000{n:04d}", "") for n in range(20)]))
+            self.assertEqual(found, [self.reference.find_contacts(term) for term in terms])
+            self.assertEqual(sorted(added), list(range(6, 26)))
+            self.assertEqual(len(phonebook), 24)
+        finally:
+            phonebook.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджет времени импорта по -X importtime, мс (минимум из нескольких запусков).
+# Замер при введении бюджета: около 31 мс для каждого модуля; прежняя
+# загрузка asyncio, multiprocessing и sqlite3 добавляла к нему больше 35 мс.
+# controller.batch_controller - путь командного режима (main.py find ... из cron)
+IMPORT_BUDGET_MS = {
+    'model.phonebook': 60,
+    'controller.phonebook_controller': 60,
+    'controller.batch_controller': 60,
+}
+IMPORT_RUNS = 3
+
+# Тяжелые модули, которые должны загружаться только при использовании
+LAZY_MODULES = ('asyncio', 'sqlite3', 'multiprocessing', 'concurrent.futures', 'logging', 'tempfile', 'random',
+                'model.parallel_loader', 'model.dedup')
+
+
+def run_python(*args: str, write_bytecode: bool = False) -> subprocess.CompletedProcess:
+    """Запуск интерпретатора в корне проекта без пользовательских настроек окружения"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.pop('PYTHONPATH', None)
+    if write_bytecode:
+        del env['PYTHONDONTWRITEBYTECODE']
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def loaded_modules(statement: str) -> set:
+    """Модули, загруженные после выполнения statement в чистом интерпретаторе"""
+    result = run_python('-c', f"import sys; {statement}; print('\\n'.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+def import_time_ms(module: str) -> float:
+    """Суммарное время импорта модуля по -X importtime, мс"""
+    result = run_python('-X', 'importtime', '-c', f"import {module}")
+    for line in reversed(result.stderr.splitlines()):
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise AssertionError(f"Нет строки importtime для {module}")
+
+
+class TestStartup(unittest.TestCase):
+    """Тесты времени запуска и ленивой загрузки подсистем"""
+
+    def test_main_imports_nothing(self):
+        """Импорт main не загружает контроллер и модель"""
+        modules = loaded_modules("import main")
+        self.assertNotIn('controller.phonebook_controller', modules)
+        self.assertNotIn('model.phonebook', modules)
+
+    def test_batch_mode_skips_console_view(self):
+        """Командный режим не загружает интерактивный контроллер и консольный вид"""
+        modules = loaded_modules("import controller.batch_controller")
+        self.assertNotIn('controller.phonebook_controller', modules)
+        self.assertNotIn('view.console_view', modules)
+
+    def test_heavy_modules_are_lazy(self):
+        """Модель и контроллеры не загружают тяжелые модули при импорте"""
+        for module in ('controller.phonebook_controller', 'controller.batch_controller'):
+            with self.subTest(module=module):
+                modules = loaded_modules(f"import {module}")
+                self.assertEqual(sorted(modules.intersection(LAZY_MODULES)), [])
+
+    def test_lazy_modules_load_on_use(self):
+        """Подсистемы подгружаются при первом использовании"""
+        modules = loaded_modules("from model.phonebook import PhoneBook; PhoneBook().find_duplicates(); "
+                                 "import metrics; metrics.LoggingSink()")
+        self.assertIn('model.dedup', modules)
+        self.assertIn('logging', modules)
+
+    def test_import_time_budget(self):
+        """Время импорта укладывается в бюджет"""
+        for module, budget in IMPORT_BUDGET_MS.items():
+            with self.subTest(module=module):
+                # Прогрев: в свежей копии __pycache__ пуст, и без него замер
+                # включал бы компиляцию исходников, а не время запуска
+                run_python('-c', f"import {module}", write_bytecode=True)
+                elapsed = min(import_time_ms(module) for _ in range(IMPORT_RUNS))
+                self.assertLess(elapsed, budget, f"импорт {module}: {elapsed:.1f} мс при бюджете {budget} мс")
+
+
+if __name__ == '__main__':
+    unittest.main()
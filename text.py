@@ -7,11 +7,12 @@ main_menu_items = [
     'Найти контакт',
     'Изменить контакт',
     'Удалить контакт',
+    'Статистика',
     'Выход'
 ]
 
 user_menu_choice = 'Выберите пункт меню: '
-user_menu_choice_error = 'Введите число от 1 до 8'
+user_menu_choice_error = 'Введите число от 1 до 9'
 
 input_path_message = 'Введите имя файла: '
 phone_book_load_successful = 'Телефонная книга успешно загружена!'
@@ -27,6 +28,13 @@ input_new_contact = [
 ]
 new_contact_saved_successful = 'Контакт {name} успешно сохранен!'
 
+page_size = 20
+page_info = 'Контакты с ID {first}-{last}, всего контактов: {total}'
+page_empty = 'На этой странице нет контактов'
+page_navigation = 'Enter/n - следующая страница, p - предыдущая, номер - перейти к ID, q - выход: '
+page_last = 'Это последняя страница'
+page_first = 'Это первая страница'
+
 input_word_to_find = 'Введите слово для поиска: '
 no_result_to_find = 'Контакты содержащие "{word}" не найдены!'
 
@@ -41,5 +49,9 @@ contact_edited_successful = 'Контакт {name} успешно изменен
 input_contact_id_to_delete = 'Введите ID контакта для удаления: '
 contact_deleted_successful = 'Контакт {name} успешно удален!'
 
+stats_empty = 'Статистика пока не собрана'
+stats_started = 'Сбор статистики включен: выполните операции и выберите этот пункт снова'
+stats_counters = 'Счетчики:'
+
 phone_book_save_message = 'Сохранить изменения перед выходом? '
 end_of_program = 'До свидания!'
\ No newline at end of file
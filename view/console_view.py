@@ -1,5 +1,5 @@
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from model.contact import Contact
 import text
 
@@ -53,20 +53,70 @@ class ConsoleView:
         print(f"{message}")
 
     @staticmethod
-    def show_contacts(contacts: Dict[int, Contact], empty_message: str = "Телефонная книга пуста") -> None:
-        """Отображение списка контактов"""
-        if not contacts:
+    def show_contacts(contacts: Union[Mapping[int, Contact], Iterable[Tuple[int, Contact]]],
+                      empty_message: str = "Телефонная книга пуста") -> int:
+        """Отображение списка контактов, возвращает число показанных контактов
+
+        Словарь выводится по возрастанию ID, итератор пар (ID, контакт) -
+        в порядке выдачи, без промежуточной копии результатов.
+        """
+        if isinstance(contacts, Mapping):
+            contacts = sorted(contacts.items())
+        rows = ConsoleView._format_rows(contacts)
+        if not rows:
             ConsoleView.show_message(empty_message)
+            return 0
+
+        print(ConsoleView._format_table(rows))
+        return len(rows)
+
+    @staticmethod
+    def show_contacts_page(contacts: List[Tuple[int, Contact]], total: int) -> None:
+        """Отображение одной страницы контактов одной записью в консоль"""
+        if not contacts:
+            ConsoleView.show_message(text.page_empty)
             return
 
-        print("\n" + "=" * 80)
-        print(f"{'ID':>3} {'Имя':<25} {'Телефон':<25} {'Комментарий':<25}")
-        print("-" * 80)
+        page_info = text.page_info.format(first=contacts[0][0], last=contacts[-1][0], total=total)
+        print(ConsoleView._format_table(ConsoleView._format_rows(contacts), page_info))
 
-        for contact_id, contact in sorted(contacts.items()):
-            print(f"{contact_id:>3}. {contact.name:<25} {contact.phone:<25} {contact.comment:<25}")
+    @staticmethod
+    def _format_rows(contacts: Iterable[Tuple[int, Contact]]) -> List[str]:
+        """Строки таблицы для пар (ID, контакт)"""
+        return [f"{contact_id:>3}. {contact.name:<25} {contact.phone:<25} {contact.comment:<25}"
+                for contact_id, contact in contacts]
+
+    @staticmethod
+    def _format_table(rows: List[str], footer: Optional[str] = None) -> str:
+        """Таблица из строк контактов в виде одной строки для вывода"""
+        lines = ["\n" + "=" * 80,
+                 f"{'ID':>3} {'Имя':<25} {'Телефон':<25} {'Комментарий':<25}",
+                 "-" * 80]
+        lines.extend(rows)
+        if footer:
+            lines.append("-" * 80)
+            lines.append(footer)
+        lines.append("=" * 80 + "\n")
+        return "\n".join(lines)
+
+    @staticmethod
+    def show_stats(summary: Dict[str, Dict[str, float]], counters: Dict[str, int]) -> None:
+        """Отображение сводки времени операций и счетчиков одной записью в консоль"""
+        if not summary and not counters:
+            ConsoleView.show_message(text.stats_empty)
+            return
 
-        print("=" * 80 + "\n")
+        lines = ["\n" + "=" * 80,
+                 f"{'Операция':<32} {'Вызовы':>7} {'Всего мс':>10} {'p50 мс':>9} {'p95 мс':>9} {'Макс мс':>9}",
+                 "-" * 80]
+        for name, stats in summary.items():
+            lines.append(f"{name:<32} {stats['count']:>7} {stats['total_ms']:>10.2f} {stats['p50_ms']:>9.3f} "
+                         f"{stats['p95_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+        if counters:
+            lines.append(text.stats_counters)
+            lines.extend(f"  {name}: {value}" for name, value in counters.items())
+        lines.append("=" * 80 + "\n")
+        print("\n".join(lines))
 
     @staticmethod
     def confirm_action(message: str) -> bool: